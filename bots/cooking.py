@@ -3,7 +3,6 @@ from bots.core.cfg_types import RangeParam, BreakCfgParam, ItemParam, RGBParam
 from core.bot import Bot
 import random
 import time
-import keyboard
 
 class BotConfig(BotConfigMixin):
     # Configuration parameters
@@ -85,7 +84,7 @@ class BotExecutor(Bot):
             if self.terminate: return
             time.sleep(0.1)
             
-        keyboard.press('space')
+        self.client.input.press('space')
         
         time.sleep(random.uniform(3, 7))
         self.client.move_off_window()
@@ -8,7 +8,6 @@ from core.osrs_client import ToolplaneTab
 
 import random
 import time
-import pyautogui
 from core.logger import get_logger
 
 class BotConfig(BotConfigMixin):
@@ -181,7 +180,7 @@ class BotExecutor(Bot):
         """Press spacebar to confirm crafting"""
         time.sleep(random.normalvariate(.8, .2))
         try:
-            pyautogui.press('space')
+            self.client.input.press_and_release('space')
             self.log.info("Pressed spacebar")
             time.sleep(0.5)  # Small delay after spacebar
         except Exception as e:
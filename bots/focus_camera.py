@@ -6,8 +6,7 @@ from core.control import ScriptControl
 
 import time
 import random
-import pyautogui
-import keyboard
+from core.input.backend import InputFailSafe
 
 
 control = ScriptControl()
@@ -81,7 +80,7 @@ class BotExecutor(Bot):
             try:
                 self._focus_and_jiggle()
                 failures = 0
-            except (RuntimeError, OSError, pyautogui.FailSafeException) as e:
+            except (RuntimeError, OSError, InputFailSafe) as e:
                 failures += 1
                 self.log.warning("Focus/jiggle step failed (%d): %s", failures, e)
                 if failures >= self.cfg.max_failures:
@@ -105,7 +104,7 @@ class BotExecutor(Bot):
                     # small settle to let focus fully apply
                     time.sleep(0.15)
                     return True
-            except (RuntimeError, OSError, pyautogui.FailSafeException) as e:
+            except (RuntimeError, OSError, InputFailSafe) as e:
                 self.log.debug("Focus attempt %d failed: %s", attempt, e)
             time.sleep(0.25 + random.uniform(0.0, 0.25))
         return False
@@ -122,8 +121,8 @@ class BotExecutor(Bot):
         try:
             cx = self.client.window.left + self.client.window.width // 2
             cy = self.client.window.top + self.client.window.height // 2
-            pyautogui.moveTo(cx, cy, _pause=0)
-        except (pyautogui.FailSafeException, OSError, RuntimeError):
+            self.client.input.move_to(cx, cy)
+        except (InputFailSafe, OSError, RuntimeError):
             pass
 
         # randomly decide which method to prefer per jiggle window
@@ -144,8 +143,8 @@ class BotExecutor(Bot):
                 if dz == 0:
                     dz = 1
                 try:
-                    pyautogui.scroll(dz)
-                except (pyautogui.FailSafeException, OSError, RuntimeError):
+                    self.client.input.scroll(dz)
+                except (InputFailSafe, OSError, RuntimeError):
                     pass
 
             # small rest between actions
@@ -166,14 +165,14 @@ class BotExecutor(Bot):
 
         # ensure cursor is within window before dragging
         try:
-            pyautogui.moveTo(cx, cy, _pause=0)
-        except (pyautogui.FailSafeException, OSError, RuntimeError):
+            self.client.input.move_to(cx, cy)
+        except (InputFailSafe, OSError, RuntimeError):
             return
 
         start = time.time()
         pressed = False
         try:
-            pyautogui.mouseDown(button="right")
+            self.client.input.mouse_down("right")
             pressed = True
             while (time.time() - start) < max_time:
                 # random small radius motions produce gentle camera swings
@@ -187,8 +186,8 @@ class BotExecutor(Bot):
         finally:
             if pressed:
                 try:
-                    pyautogui.mouseUp(button="right")
-                except (pyautogui.FailSafeException, OSError, RuntimeError):
+                    self.client.input.mouse_up("right")
+                except (InputFailSafe, OSError, RuntimeError):
                     pass
 
     @control.guard
@@ -201,11 +200,11 @@ class BotExecutor(Bot):
             key = random.choice(keys)
             hold = random.uniform(0.12, min(0.7, deadline - time.time()))
             try:
-                keyboard.press(key)
+                self.client.input.press(key)
                 time.sleep(hold)
             finally:
                 try:
-                    keyboard.release(key)
+                    self.client.input.release(key)
                 except (OSError, RuntimeError, ValueError):
                     pass
             # quick pause between key presses
@@ -8,7 +8,6 @@ from core.osrs_client import ToolplaneTab
 from PIL import Image
 import random
 import time
-import pyautogui
 
 class BotConfig(BotConfigMixin):
     # Configuration parameters
@@ -112,14 +111,14 @@ class BotExecutor(Bot):
             self.client.click_toolplane(ToolplaneTab.INVENTORY)
             try:
                 self.client.move_to(item_match)
-                pyautogui.mouseDown(button='left')
+                self.client.input.mouse_down('left')
                 self.client.move_to(
                     alch_match.get_center(),
                     rand_move_chance=0,
                 )
             finally:
                 time.sleep(0.25)
-                pyautogui.mouseUp(button='left')
+                self.client.input.mouse_up('left')
             # risk for endless loop but idc rn
             self.find_overlap(identifier) 
 
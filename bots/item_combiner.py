@@ -186,8 +186,7 @@ class BotExecutor(Bot):
     def _confirm_action(self):
         time.sleep(random.uniform(0.5, 1.0))
         try:
-            import keyboard
-            keyboard.press_and_release(self.cfg.combine_confirm_key)
+            self.client.input.press_and_release(self.cfg.combine_confirm_key)
         except (RuntimeError, ValueError, OSError) as e:
             self.log.warning("Unable to send keypress '%s': %s", self.cfg.combine_confirm_key, e)
 
@@ -12,7 +12,6 @@ from core.logger import get_logger
 from PIL import Image
 import random
 import time
-import pyautogui
 
 class BotConfig(BotConfigMixin):
     # Configuration parameters
@@ -8,7 +8,6 @@ from core.control import ScriptTerminationException
 
 import random
 import time
-import keyboard
 from core.logger import get_logger
 import sys
 
@@ -245,7 +244,7 @@ class BotExecutor(Bot):
                 
                 # Hold shift while clicking each gem
                 try:
-                    keyboard.press('shift')
+                    self.client.input.press('shift')
                     time.sleep(0.2)
                     
                     for gem in gems:
@@ -253,7 +252,7 @@ class BotExecutor(Bot):
                         time.sleep(random.uniform(0.1, 0.3))
                     
                 finally:
-                    keyboard.release('shift')
+                    self.client.input.release('shift')
                 
                 return True
             else:
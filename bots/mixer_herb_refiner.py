@@ -11,7 +11,6 @@ from core.control import ScriptControl
 from PIL import Image
 import random
 import time
-import pyautogui
 from core.logger import get_logger
 import sys
 
@@ -4,17 +4,15 @@ from core.bot import Bot
 from core.bank import BankInterface
 
 from core import tools
+from core.assets import assets
 from core.region_match import MatchResult
 from core.osrs_client import ToolplaneTab
 from core.control import ScriptControl, ScriptTerminationException
 
-from PIL import Image
 import random
 import time
-import pyautogui
 from core.logger import get_logger
 import sys
-import keyboard
 
 control = ScriptControl()
 
@@ -207,7 +205,7 @@ class BotExecutor(Bot):
                 
                 # Hold shift while clicking each gem
                 try:
-                    keyboard.press('shift')
+                    self.client.input.press('shift')
                     time.sleep(0.2)
                     
                     for gem in gems:
@@ -215,7 +213,7 @@ class BotExecutor(Bot):
                         time.sleep(random.uniform(0.1, 0.3))
                     
                 finally:
-                    keyboard.release('shift')
+                    self.client.input.release('shift')
                 
                 return True
             else:
@@ -439,11 +437,11 @@ class BotExecutor(Bot):
                     
                 try:
                     deposit = self.client.find_in_window(
-                        Image.open('data/ui/bank-deposit-inv.png'), 
+                        assets().image('bank-deposit-inv'), 
                         min_confidence=0.9
                     )
                     exit = self.client.find_in_window(
-                        Image.open('data/ui/close-ui-element.png'), 
+                        assets().image('close-ui-element'), 
                         min_confidence=0.9
                     )
                 except Exception as e:
@@ -503,4 +501,7 @@ class BotExecutor(Bot):
 if __name__ == "__main__":
     config = BotConfig()
     bot = BotExecutor(config)
-    bot.start()
+    try:
+        bot.start()
+    finally:
+        bot.close()
@@ -381,4 +381,7 @@ class BotExecutor(Bot):
 if __name__ == "__main__":
     config = BotConfig()
     bot = BotExecutor(config)
-    bot.start()
+    try:
+        bot.start()
+    finally:
+        bot.close()
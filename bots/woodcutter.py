@@ -11,10 +11,8 @@ from core.control import ScriptControl
 from PIL import Image
 import random
 import time
-import pyautogui
 from core.logger import get_logger
 import sys
-import keyboard
 
 class BotConfig(BotConfigMixin): 
     # Configuration parameters
@@ -229,13 +227,13 @@ class BotExecutor(Bot):
             self.log.info(f"Dropping {len(logs)} logs")
             
             try:
-                keyboard.press('shift')
+                self.client.input.press('shift')
                 # Drop each log
                 for log_match in logs:
                     self.client.click(log_match, rand_move_chance=0, after_click_settle_chance=0)
                     time.sleep(random.uniform(0.1, 0.3))
             finally:
-                keyboard.release('shift')
+                self.client.input.release('shift')
             self.log.info("All logs dropped")
             
         except Exception as e:
@@ -287,4 +285,7 @@ if __name__ == "__main__":
     # config.log_type.value = "Oak logs"
     
     bot = BotExecutor(config)
-    bot.start()
+    try:
+        bot.start()
+    finally:
+        bot.close()
@@ -0,0 +1,198 @@
+"""
+Registry of the UI template images under data/ui.
+
+Templates used to be opened from disk inside the methods that match them,
+once per call. `AssetRegistry` loads each file once and hands out `Asset`
+handles: the decoded image plus its prepared matching arrays (BGR, alpha
+mask, grayscale), pinned in the template cache so find_subimage & co. never
+rebuild them. The same `Image` object is returned on every call, so the
+matching layer's per-object digest shortcut always hits. Treat asset
+images as read-only.
+
+Assets are named by their path under the root without the extension:
+`assets().image('right-click-header')`,
+`assets().image('mastering_mixology/actions/agitator_raw')`.
+
+`python -m core.assets` writes an atlas (one .npz holding every template
+as raw pixels), which `preload()` reads instead of decoding each PNG / WebP.
+Atlas entries whose source file changed since are decoded from disk again.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from core.logger import get_logger
+from core.template_cache import PreparedTemplate, template_cache
+
+log = get_logger('Assets')
+
+ASSET_ROOT = 'data/ui'
+ATLAS_PATH = 'data/ui/.atlas.npz'
+EXTENSIONS = ('.png', '.webp')
+# modes stored as-is in the atlas; anything else is stored as RGBA
+ATLAS_MODES = {'L': 1, 'RGB': 3, 'RGBA': 4}
+
+
+@dataclass(frozen=True)
+class Asset:
+    """Immutable handle to one loaded template."""
+    name: str
+    image: Image.Image
+    template: PreparedTemplate
+
+    @property
+    def size(self):
+        return self.image.size
+
+    @property
+    def bgr(self) -> np.ndarray:
+        return self.template.bgr
+
+    @property
+    def mask(self) -> np.ndarray:
+        return self.template.mask
+
+    @property
+    def gray(self) -> np.ndarray:
+        return self.template.gray
+
+
+def _fingerprint(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+class AssetRegistry:
+    """Loads the templates under `root` once and keeps them for the process."""
+
+    def __init__(self, root: str = ASSET_ROOT, atlas: Optional[str] = ATLAS_PATH):
+        self.root = Path(root)
+        self.atlas = atlas
+        self._paths: Optional[Dict[str, Path]] = None
+        self._assets: Dict[str, Asset] = {}
+        self._lock = threading.RLock()
+
+    # ---- lookup ---------------------------------------------------------
+    @property
+    def paths(self) -> Dict[str, Path]:
+        """{name: file} of every template under the root."""
+        if self._paths is None:
+            paths = {}
+            for path in sorted(self.root.rglob('*')):
+                if path.suffix.lower() in EXTENSIONS and not path.name.startswith('.'):
+                    paths[path.relative_to(self.root).with_suffix('').as_posix()] = path
+            self._paths = paths
+        return self._paths
+
+    def names(self, prefix: str = '') -> List[str]:
+        return [name for name in self.paths if name.startswith(prefix)]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.paths
+
+    def get(self, name: str) -> Asset:
+        asset = self._assets.get(name)
+        if asset is not None:
+            return asset
+        with self._lock:
+            asset = self._assets.get(name)
+            if asset is None:
+                path = self.paths.get(name)
+                if path is None:
+                    raise KeyError(f'No UI asset named {name!r} under {self.root}')
+                asset = self._register(name, Image.open(path))
+        return asset
+
+    def image(self, name: str) -> Image.Image:
+        """The (shared, read-only) image of an asset."""
+        return self.get(name).image
+
+    def _register(self, name: str, image: Image.Image) -> Asset:
+        image.load()
+        if image.mode not in ATLAS_MODES:
+            # palette & co.: same pixels whether read from disk or the atlas
+            image = image.convert('RGBA')
+        asset = Asset(name, image, template_cache().pin(image))
+        self._assets[name] = asset
+        return asset
+
+    # ---- bulk loading ---------------------------------------------------
+    def preload(self, names: Iterable[str] = None) -> int:
+        """Load `names` (default: every asset), from the atlas where it is current."""
+        names = list(self.paths if names is None else names)
+        with self._lock:
+            missing = [n for n in names if n not in self._assets]
+            if missing and self.atlas and os.path.exists(self.atlas):
+                try:
+                    self._load_atlas(missing)
+                except Exception as e:
+                    log.warning(f'Ignoring unreadable asset atlas {self.atlas}: {e}')
+            for name in missing:
+                self.get(name)
+        return len(names)
+
+    def _load_atlas(self, names: List[str]):
+        with np.load(self.atlas) as data:
+            meta = json.loads(data['meta'].tobytes())
+            blob = data['blob']
+        wanted = set(names)
+        loaded = 0
+        for name, entry in meta.items():
+            path = self.paths.get(name)
+            if name not in wanted or path is None or entry['source'] != _fingerprint(path):
+                continue
+            h, w = entry['shape']
+            channels = ATLAS_MODES[entry['mode']]
+            raw = blob[entry['offset']:entry['offset'] + h * w * channels]
+            arr = raw.reshape((h, w) if channels == 1 else (h, w, channels))
+            self._register(name, Image.fromarray(arr))
+            loaded += 1
+        log.debug(f'Loaded {loaded}/{len(names)} assets from atlas {self.atlas}')
+
+    def save_atlas(self, path: str = None) -> str:
+        """Write every asset as raw pixels to one .npz file."""
+        path = path or self.atlas or ATLAS_PATH
+        meta = {}
+        chunks = []
+        offset = 0
+        for name, source in self.paths.items():
+            img = Image.open(source)
+            if img.mode not in ATLAS_MODES:
+                img = img.convert('RGBA')
+            arr = np.ascontiguousarray(np.asarray(img, dtype=np.uint8))
+            meta[name] = {
+                'mode': img.mode,
+                'shape': list(arr.shape[:2]),
+                'offset': offset,
+                'source': _fingerprint(source),
+            }
+            chunks.append(arr.ravel())
+            offset += arr.size
+        blob = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.uint8)
+        with open(path, 'wb') as f:
+            np.savez(f, meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8), blob=blob)
+        log.info(f'Wrote asset atlas {path} ({len(meta)} templates, {offset / 1024:.0f} KiB)')
+        return path
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+
+_registry = AssetRegistry()
+
+
+def assets() -> AssetRegistry:
+    """The shared registry over data/ui."""
+    return _registry
+
+
+if __name__ == '__main__':
+    assets().save_atlas()
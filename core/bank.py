@@ -1,25 +1,28 @@
 from core.osrs_client import RuneLiteClient
+from core.control import ScriptTerminationException
+from core.capture import CapturedFrame
 from core.item_db import ItemLookup
 from core import tools
+from core.assets import assets
+from core.layout_cache import verify_anchor
 from core import ocr
 from core.logger import get_logger
 from PIL import Image
-import keyboard
 from core.input.mouse_control import ClickType
 import time
 import random
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 
 
 # load into memory now for faster loads
-BANK_BR = Image.open('data/ui/bank-bottom-right.png')
-BANK_TL = Image.open('data/ui/bank-top-left.png')
-BANK_DEPO_INV = Image.open('data/ui/bank-deposit-inv.png')
-BANK_SEARCH = Image.open('data/ui/bank-search.png')
-BANK_CLOSE = Image.open('data/ui/close-ui-element.png')
-BANK_TAB = Image.open('data/ui/bank-tab.png')
-BANK_ARROW_UP = Image.open('data/ui/bank-scroll-up.png')
+BANK_BR = assets().image('bank-bottom-right')
+BANK_TL = assets().image('bank-top-left')
+BANK_DEPO_INV = assets().image('bank-deposit-inv')
+BANK_SEARCH = assets().image('bank-search')
+BANK_CLOSE = assets().image('close-ui-element')
+BANK_TAB = assets().image('bank-tab')
+BANK_ARROW_UP = assets().image('bank-scroll-up')
 BANK_ARROW_DOWN = BANK_ARROW_UP.rotate(180)
 
 
@@ -148,66 +151,191 @@ class BankSettings:
         raise ValueError(f'Invalid category/option: {category}/{option}')
 
 
+class BankSession:
+    """
+    What is known about the bank interface from one check to the next.
+
+    The bank is located with two full-window corner matches only when it
+    (re)opens somewhere new. After that, a check re-matches the two corners
+    in a few pixels around their last known spot, and a frame that was
+    already checked is answered from memory. `bank_match`, the
+    `BankSettings` built on it and the last settings read are kept while
+    the bank stays open at the same place.
+    """
+    def __init__(self, client: RuneLiteClient, min_confidence: float = .96, pad: int = 4):
+        self.client = client
+        self.min_confidence = min_confidence
+        self.pad = pad
+        self.bank_match: tools.MatchResult = None
+        self.settings: BankSettings = None
+        self.frame: CapturedFrame = None
+        self.is_open = False
+        self._corners: Optional[Tuple[tools.MatchResult, tools.MatchResult]] = None
+        self._setting_values: Optional[Dict[str, str]] = None
+        self.roi_checks = 0
+        self.full_checks = 0
+
+    def refresh(self, max_age_ms: float = 0) -> bool:
+        """
+        Whether the bank is open in the current frame.
+
+        Args:
+            max_age_ms (float, optional): Reuse a buffered frame at most this
+                old; 0 always captures a new one.
+        """
+        frame = self.client.get_frame(max_age_ms=max_age_ms)
+        if frame is self.frame:
+            return self.is_open
+        self.frame = frame
+        is_open = self._corners_in_place(frame) or self.locate(frame)
+        if not is_open and self.is_open:
+            # settings may be changed before the bank is opened again
+            self._setting_values = None
+        self.is_open = is_open
+        return is_open
+
+    def _corners_in_place(self, frame: CapturedFrame) -> bool:
+        if self._corners is None:
+            return False
+        self.roi_checks += 1
+        tl, br = self._corners
+        return all(
+            verify_anchor(frame.frame, tpl, match, pad=self.pad, min_confidence=self.min_confidence)
+            for tpl, match in ((BANK_TL, tl), (BANK_BR, br))
+        )
+
+    def locate(self, frame: CapturedFrame) -> bool:
+        """Full-window search for the bank corners in `frame`."""
+        self.full_checks += 1
+        corners = []
+        for tpl in (BANK_TL, BANK_BR):
+            try:
+                corners.append(self.client.find_in_window(
+                    tpl, frame.frame, min_scale=1, max_scale=1,
+                    min_confidence=self.min_confidence, use_prior=False
+                ))
+            except ValueError:
+                return False
+        tl, br = corners
+        bank_match = tools.MatchResult(
+            start_x=tl.start_x,
+            start_y=tl.start_y,
+            end_x=br.end_x,
+            end_y=br.end_y
+        )
+        if self.bank_match is None or bank_match.bounding_box != self.bank_match.bounding_box:
+            self.bank_match = bank_match
+            self.settings = BankSettings(bank_match)
+            self._setting_values = None
+        self._corners = (tl, br)
+        return True
+
+    def read_settings(self) -> Dict[str, str]:
+        """Rearrange / Withdraw / Quantity settings, read together from one frame."""
+        if self._setting_values is None:
+            sc = self.frame.image
+            self._setting_values = {
+                'Rearrange': self.settings.get_rearrange_setting(sc),
+                'Withdraw': self.settings.get_withdraw_setting(sc),
+                'Quantity': self.settings.get_quantity_setting(sc)
+            }
+        return dict(self._setting_values)
+
+    def invalidate_settings(self):
+        """Forget the settings read (call after clicking a setting button)."""
+        self._setting_values = None
+
+
 class BankInterface:
     def __init__(self,client:RuneLiteClient,itemdb:ItemLookup):
         self.itemdb = itemdb
         self.client = client
-        self.bank_match: tools.MatchResult = None
-        self.bs: BankSettings = None
+        self.session = BankSession(client)
         self.last_custom_quantity = 0
         self.log = get_logger('Bank')
         self._scrollbar_match: tools.MatchResult = None
         self.default_quantity: int = -1
+        # frames at most this old are reused by the checks inside bank methods
+        self.recent_frame_ms: float = 100
+
+    @property
+    def bank_match(self) -> tools.MatchResult:
+        return self.session.bank_match
+
+    @property
+    def bs(self) -> BankSettings:
+        return self.session.settings
 
     @property
     def is_open(self):
         try:
-            self.get_match()
-            return True
-        except:
+            return self.session.refresh()
+        except ScriptTerminationException:
+            raise
+        except Exception as e:
+            # window closed, capture / matching failed: polled in loops, never raise
+            self.log.warning(f'Bank open check failed: {e}')
             return False
+
+    def _require_open(self):
+        if not self.session.refresh(max_age_ms=self.recent_frame_ms):
+            raise ValueError('Bank is not open')
         
     @property
     def bank_sc(self) -> Image.Image:
-        if not self.is_open: raise ValueError('Bank is not open')
-        return self.bank_match.crop_in(self.client.get_screenshot())
+        self._require_open()
+        return self.bank_match.crop_in(self.session.frame.image)
     
     def transform_to_client(self, match:tools.MatchResult) -> tools.MatchResult:
-        if not self.is_open: raise ValueError('Bank is not open')
+        self._require_open()
         return match.transform(
             -self.bank_match.start_x,
             -self.bank_match.start_y
         )
 
     def deposit_inv(self):
-        if not self.is_open: raise ValueError('Bank is not open')
+        self._require_open()
         btn = self.client.find_in_window(
-            BANK_DEPO_INV, min_scale=1,max_scale=1
+            BANK_DEPO_INV, self.session.frame.frame, min_scale=1,max_scale=1,
+            use_prior=True
         )
         if btn.confidence > .9:
             self.client.click(btn)
 
     def search(self, item_name:str):
-        if not self.is_open: raise ValueError('Bank is not open')
+        self._require_open()
         search_box = self.client.find_in_window(
-            BANK_SEARCH, min_scale=1,max_scale=1
+            BANK_SEARCH, self.session.frame.frame, min_scale=1,max_scale=1,
+            use_prior=True
         )
         if search_box.confidence > .9:
             time.sleep(random.uniform(1,1.3))
             self.client.click(search_box)
-            keyboard.write(item_name,delay=.2)
+            self.client.input.write(item_name,delay=.2)
             return True
 
-    def close(self):
+    def close(self, max_clicks: int = 3, timeout: float = 1.5):
+        """
+        Closes the bank, clicking the close button at most `max_clicks`
+        times and waiting up to `timeout` seconds after each click.
+        """
         if not self.is_open: return
         close_btn = self.client.find_in_window(
-            BANK_CLOSE, min_scale=1,max_scale=1
+            BANK_CLOSE, self.session.frame.frame, min_scale=1,max_scale=1,
+            use_prior=True
         )
         if close_btn.confidence > .9:
-            while self.is_open:
-                # potentially problematic
+            for _ in range(max_clicks):
                 self.client.click(close_btn)
-            return True
+                deadline = time.time() + timeout
+                while self.is_open:
+                    if time.time() > deadline:
+                        break
+                    time.sleep(.1)
+                else:
+                    return True
+            self.log.warning(f'Bank still open after {max_clicks} close clicks')
+            return False
     
     def get_item_count(
         self, 
@@ -216,9 +344,9 @@ class BankInterface:
         hover_verify:bool=True
         
         ) -> int:
-        if not self.is_open: raise ValueError('Bank is not open')
+        self._require_open()
 
-        sc = self.client.get_screenshot()
+        sc = self.session.frame.image
         
         item = self.itemdb.get_item(item_id) # verify it exists
         
@@ -265,16 +393,16 @@ class BankInterface:
                     self.log.info(f'Withdrawing custom amount: {amount}')
                     self.client.choose_right_click_opt(f'{action}-X')
                     time.sleep(random.uniform(1,1.3))
-                    keyboard.write(str(amount),delay=.2)
-                    keyboard.press('enter')
+                    self.client.input.write(str(amount),delay=.2)
+                    self.client.input.press('enter')
                     self.last_custom_quantity = amount
 
                 
     def get_bank_tabs(self) -> List[tools.MatchResult]:
-        if not self.is_open: raise ValueError('Bank is not open')
+        self._require_open()
         
         matches = tools.find_subimages(
-            self.bank_match.crop_in(self.client.get_screenshot()),
+            self.bank_match.crop_in(self.session.frame.frame),
             BANK_TAB,
             min_scale=1,max_scale=1,
             min_confidence=.99
@@ -292,21 +420,12 @@ class BankInterface:
         return final
 
     def get_settings(self):
-        if not self.is_open: raise ValueError('Bank is not open')
-        settings = BankSettings(self.bank_match)
-        sc = self.client.get_screenshot()
-        rearrange = settings.get_rearrange_setting(sc)
-        withdraw = settings.get_withdraw_setting(sc)
-        quantity = settings.get_quantity_setting(sc)
-        return {
-            'Rearrange': rearrange,
-            'Withdraw': withdraw,
-            'Quantity': quantity
-        }
+        self._require_open()
+        return self.session.read_settings()
         
     def set_withdraw_setting(self, option:str):
-        if not self.is_open: raise ValueError('Bank is not open')
-        current = self.bs.get_withdraw_setting(self.client.get_screenshot())
+        self._require_open()
+        current = self.session.read_settings()['Withdraw']
         if current == option:
             return
         btn_match = self.bs.get_button_match('Withdraw', option)
@@ -315,12 +434,13 @@ class BankInterface:
             after_click_settle_chance=0.5,
             rand_move_chance=0.3
         )
+        self.session.invalidate_settings()
         
     
         
     def set_rearrange_setting(self, option:str):
-        if not self.is_open: raise ValueError('Bank is not open')
-        current = self.bs.get_rearrange_setting(self.client.get_screenshot())
+        self._require_open()
+        current = self.session.read_settings()['Rearrange']
         if current == option:
             return
         btn_match = self.bs.get_button_match('Rearrange', option)
@@ -329,10 +449,11 @@ class BankInterface:
             after_click_settle_chance=0.5,
             rand_move_chance=0.3
         )
+        self.session.invalidate_settings()
     
     def set_quantity_setting(self, option:str):
-        if not self.is_open: raise ValueError('Bank is not open')
-        current = self.bs.get_quantity_setting(self.client.get_screenshot())
+        self._require_open()
+        current = self.session.read_settings()['Quantity']
         if current == option:
             return
         btn_match = self.bs.get_button_match('Quantity', option)
@@ -341,9 +462,10 @@ class BankInterface:
             after_click_settle_chance=0.5,
             rand_move_chance=0.3
         )
+        self.session.invalidate_settings()
         
     def set_default_quantity(self, option:int):
-        if not self.is_open: raise ValueError('Bank is not open')
+        self._require_open()
         
         if self.default_quantity == option:
             return
@@ -362,8 +484,8 @@ class BankInterface:
                 
                 time.sleep(random.uniform(.6,1))
                 
-                keyboard.write(str(option),delay=.2)
-                keyboard.press('enter')
+                self.client.input.write(str(option),delay=.2)
+                self.client.input.press('enter')
                 self.last_custom_quantity = option
         self.default_quantity = option
 
@@ -375,6 +497,7 @@ class BankInterface:
         item = self.itemdb.get_item(item_id)
 
         if not item: raise ValueError(f'Item {item_id} not found in itemdb')
+        self._require_open()
 
         item_ico = item.icon.crop((0,13,item.icon.width,item.icon.height))
 
@@ -383,7 +506,8 @@ class BankInterface:
             min_scale=.9,
             max_scale=1.1,
             min_confidence=.1,
-            sub_match=self.bank_match
+            sub_match=self.bank_match,
+            screenshot=self.session.frame.frame
         )
         self.client.move_to(
             item_match
@@ -407,20 +531,11 @@ class BankInterface:
 
     @tools.timeit()
     def get_match(self) -> tools.MatchResult:
-        sc = self.client.get_screenshot()
-        tl = self.client.find_in_window(BANK_TL, sc, min_scale=1,max_scale=1)
-        br = self.client.find_in_window(BANK_BR, sc, min_scale=1,max_scale=1)
-
-        for m in [tl,br]:
-            if m.confidence < .96:
-                raise ValueError('Bank is probably not open')
-            
-        self.bank_match = tools.MatchResult(
-            start_x=tl.start_x,
-            start_y=tl.start_y,
-            end_x=br.end_x,
-            end_y=br.end_y
-        )
-        self.bs = BankSettings(self.bank_match)
+        """Locates the bank with a full search of a new frame."""
+        session = self.session
+        session.frame = self.client.get_frame()
+        session.is_open = session.locate(session.frame)
+        if not session.is_open:
+            raise ValueError('Bank is probably not open')
         return self.bank_match
 
@@ -36,6 +36,11 @@ class Bot:
         self.api.start(port=5432)
         
         
+    def close(self):
+        """Release background workers once the bot has finished."""
+        self.mover.close()
+        self.client.close()
+
     @property
     def terminate(self) -> bool:
         return self.control.terminate
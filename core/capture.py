@@ -0,0 +1,175 @@
+"""
+Long-lived screen capture for a single window.
+
+`CaptureSession` keeps its mss handles open between grabs and remembers the
+last few frames in a small ring buffer, so callers that only need "a recent
+frame" can reuse one instead of grabbing the whole window again.
+"""
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Deque, List, Optional, Tuple
+
+import mss
+import numpy as np
+from PIL import Image
+
+from core.frame import Frame
+from core.logger import get_logger
+
+BBox = Tuple[int, int, int, int]  # left, top, right, bottom (screen coords)
+
+
+@dataclass(frozen=True)
+class CapturedFrame:
+    """A single grab of a screen region.
+
+    Attributes:
+        seq: Monotonically increasing sequence number within its session.
+        timestamp: `time.monotonic()` at the moment the grab finished.
+        bbox: Screen region that was captured (left, top, right, bottom).
+        raw: The captured pixels as an (H, W, 4) BGRA array.
+    """
+    seq: int
+    timestamp: float
+    bbox: BBox
+    raw: np.ndarray
+
+    @property
+    def age_ms(self) -> float:
+        """Milliseconds elapsed since this frame was captured."""
+        return (time.monotonic() - self.timestamp) * 1000.0
+
+    @cached_property
+    def image(self) -> Image.Image:
+        """The frame as an RGB PIL image (decoded on first access)."""
+        h, w = self.raw.shape[:2]
+        return Image.frombuffer('RGB', (w, h), self.raw, 'raw', 'BGRX', 0, 1)
+
+    @cached_property
+    def frame(self) -> Frame:
+        """The frame as a NumPy `Frame`; never goes through PIL."""
+        return Frame.from_bgra(self.raw)
+
+
+class _ThreadHandle:
+    """One thread's mss handle; dropped with the thread's locals when it ends."""
+
+    def __init__(self, sct: 'mss.base.MSSBase'):
+        self.sct = sct
+
+
+def _release(session_ref: 'weakref.ref[CaptureSession]', sct: 'mss.base.MSSBase'):
+    session = session_ref()
+    if session is not None:
+        session._release(sct)
+
+
+class CaptureSession:
+    """Owns the mss handles for one window and a ring buffer of recent frames.
+
+    mss handles are not safe to share between threads, so one handle is opened
+    lazily per calling thread and reused for every later grab on that thread.
+    A thread's handle is closed when the thread finishes, so short-lived
+    worker threads don't pile up open handles (GDI device contexts on
+    Windows); `close()` releases the rest.
+    """
+
+    def __init__(self, buffer_size: int = 4, with_cursor: bool = True):
+        self.log = get_logger('CaptureSession')
+        self.with_cursor = with_cursor
+        self._frames: Deque[CapturedFrame] = deque(maxlen=max(1, buffer_size))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._handles: List[mss.base.MSSBase] = []
+        self._seq = 0
+
+    def _handle(self):
+        held = getattr(self._local, 'held', None)
+        if held is None:
+            held = _ThreadHandle(mss.mss(with_cursor=self.with_cursor))
+            self._local.held = held
+            with self._lock:
+                self._handles.append(held.sct)
+            weakref.finalize(held, _release, weakref.ref(self), held.sct)
+        return held.sct
+
+    def _release(self, sct):
+        with self._lock:
+            if sct not in self._handles:
+                # already closed by close()
+                return
+            self._handles.remove(sct)
+        try:
+            sct.close()
+        except Exception as e:
+            self.log.debug(f'Failed to close capture handle: {e}')
+
+    @property
+    def open_handles(self) -> int:
+        """Number of mss handles currently open (one per live grabbing thread)."""
+        with self._lock:
+            return len(self._handles)
+
+    def grab(self, bbox: BBox) -> CapturedFrame:
+        """Capture `bbox` now and push the result into the ring buffer."""
+        sct_img = self._handle().grab(bbox)
+        # Keep the BGRA buffer as-is; PIL / ndarray views are derived lazily
+        # so nobody pays for the `sct_img.rgb` copy mss builds in Python.
+        raw = np.frombuffer(sct_img.bgra, dtype=np.uint8).reshape(sct_img.height, sct_img.width, 4)
+        with self._lock:
+            self._seq += 1
+            frame = CapturedFrame(self._seq, time.monotonic(), tuple(bbox), raw)
+            self._frames.append(frame)
+        return frame
+
+    def latest(self, max_age_ms: float | None = None, bbox: BBox | None = None) -> Optional[CapturedFrame]:
+        """
+        Return the newest buffered frame, or None if there isn't a suitable one.
+
+        Args:
+            max_age_ms: Reject frames older than this many milliseconds.
+            bbox: Only consider frames captured with exactly this region.
+        """
+        with self._lock:
+            frames = list(self._frames)
+        for frame in reversed(frames):
+            if bbox is not None and frame.bbox != tuple(bbox):
+                continue
+            if max_age_ms is not None and frame.age_ms > max_age_ms:
+                return None
+            return frame
+        return None
+
+    def get(self, bbox: BBox, max_age_ms: float = 0) -> CapturedFrame:
+        """Reuse a buffered frame of `bbox` no older than `max_age_ms`, else grab a new one."""
+        if max_age_ms > 0:
+            frame = self.latest(max_age_ms=max_age_ms, bbox=bbox)
+            if frame is not None:
+                return frame
+        return self.grab(bbox)
+
+    def frames(self) -> List[CapturedFrame]:
+        """Snapshot of the ring buffer, oldest first."""
+        with self._lock:
+            return list(self._frames)
+
+    def clear(self):
+        """Drop all buffered frames (e.g. after the window moved)."""
+        with self._lock:
+            self._frames.clear()
+
+    def close(self):
+        """Release every mss handle opened by this session."""
+        with self._lock:
+            handles, self._handles = self._handles, []
+            self._frames.clear()
+        for sct in handles:
+            try:
+                sct.close()
+            except Exception as e:
+                self.log.debug(f'Failed to close capture handle: {e}')
+        self._local = threading.local()
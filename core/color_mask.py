@@ -0,0 +1,98 @@
+"""
+Vectorised colour masks.
+
+Every target colour ± tolerance is an axis-aligned box in RGB space. For each
+channel we precompute a 256-entry lookup table whose entry `v` has bit `k` set
+when value `v` lies inside colour `k`'s range on that channel. A pixel belongs
+to the mask when the three lookups share at least one bit, so any number of
+colours is tested in a single pass over the image:
+
+    mask = (lut_r[R] & lut_g[G] & lut_b[B]) != 0
+
+The results are plain uint8 arrays (0 / 255) which `core.ocr` accepts
+directly, so callers don't have to round-trip through PIL.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from core.frame import Frame, as_frame
+
+Color = Tuple[int, int, int]
+
+_LUT_DTYPES = ((8, np.uint8), (16, np.uint16), (32, np.uint32), (64, np.uint64))
+
+
+def _rgb_array(img: Image.Image | Frame | np.ndarray) -> np.ndarray:
+    """(H, W, 3) RGB view of `img`; 2-D arrays are treated as gray."""
+    if isinstance(img, np.ndarray):
+        if img.ndim == 2:
+            return np.repeat(img[:, :, None], 3, axis=2)
+        return img[:, :, :3]
+    return as_frame(img).rgb
+
+
+class ColorMask:
+    """Precompiled lookup tables for a fixed set of colours and tolerance."""
+
+    def __init__(self, colors: Sequence[Color], tolerance: int = 30):
+        self.colors = tuple(tuple(int(c) for c in color) for color in colors)
+        self.tolerance = int(tolerance)
+        # One table set per block of 64 colours (the widest bit field we have)
+        self._tables = [
+            self._build(self.colors[i:i + 64]) for i in range(0, len(self.colors), 64)
+        ]
+
+    def _build(self, colors: Sequence[Color]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        dtype = next(dt for bits, dt in _LUT_DTYPES if len(colors) <= bits)
+        values = np.arange(256)
+        luts = []
+        for channel in range(3):
+            lut = np.zeros(256, dtype=dtype)
+            for bit, color in enumerate(colors):
+                lo = max(0, color[channel] - self.tolerance)
+                hi = min(255, color[channel] + self.tolerance)
+                lut[(values >= lo) & (values <= hi)] |= dtype(1 << bit)
+            luts.append(lut)
+        return luts[0], luts[1], luts[2]
+
+    def apply(self, img: Image.Image | Frame | np.ndarray) -> np.ndarray:
+        """Return a uint8 mask (255 where any colour matches, else 0)."""
+        rgb = _rgb_array(img)
+        hit = np.zeros(rgb.shape[:2], dtype=bool)
+        for lut_r, lut_g, lut_b in self._tables:
+            hit |= (lut_r[rgb[:, :, 0]] & lut_g[rgb[:, :, 1]] & lut_b[rgb[:, :, 2]]) != 0
+        return hit.view(np.uint8) * np.uint8(255)
+
+
+@lru_cache(maxsize=64)
+def _compiled(colors: Tuple[Color, ...], tolerance: int) -> ColorMask:
+    return ColorMask(colors, tolerance)
+
+
+def get_color_mask(colors: Iterable[Color], tolerance: int = 30) -> ColorMask:
+    """Shared, memoised ColorMask for `colors` / `tolerance`."""
+    key = tuple(tuple(int(c) for c in color) for color in colors)
+    return _compiled(key, int(tolerance))
+
+
+def mask_colors_array(
+        img: Image.Image | Frame | np.ndarray,
+        colors: Iterable[Color],
+        tolerance: int = 30
+    ) -> np.ndarray:
+    """Vectorised `tools.mask_colors`: uint8 mask, 255 where any colour matches."""
+    return get_color_mask(colors, tolerance).apply(img)
+
+
+def mask_above_array(
+        img: Image.Image | Frame | np.ndarray,
+        threshold: int = 200
+    ) -> np.ndarray:
+    """Vectorised `tools.mask_above_color_value`: 255 where any channel > threshold."""
+    rgb = _rgb_array(img)
+    return (rgb.max(axis=2) > threshold).view(np.uint8) * np.uint8(255)
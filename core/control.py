@@ -16,10 +16,22 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 class ScriptControl(metaclass=SingletonMeta):
+    """
+    Pause / break / terminate state shared by the script and its controls.
+
+    State changes notify a condition variable, so callers blocked in `guard`
+    wake up the moment the script is resumed or terminated instead of on the
+    next poll. While nothing is blocking, `guard` costs one attribute check.
+    """
     def __init__(self):
         self._terminate = False
         self._pause = False
-        self.break_until: float = 0
+        self._break_until: float = 0
+        self._break_timer: threading.Timer = None
+        # True while pause, a break or termination is in effect (fast path for guard)
+        self._blocked = False
+        self._state = threading.Condition()
+        self._terminated = threading.Event()
         self.break_config: BreakCfgParam = None
         self.log = get_logger("ScriptControl")
         self._listener: threading.Thread = None
@@ -100,10 +112,13 @@ class ScriptControl(metaclass=SingletonMeta):
             except Exception as ex:  # Never let hook raise
                 self.log.debug(f"Control hook error: {ex}")
 
-        hook = keyboard.hook(handler)
+        try:
+            hook = keyboard.hook(handler)
+        except Exception as ex:  # e.g. no input devices on a headless box
+            self.log.error(f"Unable to hook keyboard; control hotkeys disabled: {ex}")
+            return
         # Keep thread alive until termination requested
-        while not self.terminate:
-            time.sleep(0.25)
+        self._terminated.wait()
         keyboard.unhook(hook)
         self.log.info("Control listener thread exiting.")
 
@@ -115,7 +130,13 @@ class ScriptControl(metaclass=SingletonMeta):
     def terminate(self, value: bool):
         if self._terminate != value:
             self.log.info(f"Terminate set to {value}")
-        self._terminate = value
+        with self._state:
+            self._terminate = value
+            if value:
+                self._terminated.set()
+            else:
+                self._terminated.clear()
+            self._update()
 
     @property
     def pause(self):
@@ -124,9 +145,12 @@ class ScriptControl(metaclass=SingletonMeta):
     def reset(self):
         """Reset control flags to default states."""
         self.log.info("Resetting ScriptControl state.")
-        self._terminate = False
-        self._pause = False
-        self.break_until = 0
+        with self._state:
+            self._terminate = False
+            self._terminated.clear()
+            self._pause = False
+            self._cancel_break()
+            self._update()
         
         # Ensure listener thread calls are responsive
         self.start_listener()
@@ -135,26 +159,83 @@ class ScriptControl(metaclass=SingletonMeta):
     def pause(self, value: bool):
         if self._pause != value:
             self.log.info(f"Pause {'enabled' if value else 'disabled'}")
-        self._pause = value
+        with self._state:
+            self._pause = value
+            self._update()
+
+    @property
+    def break_until(self) -> float:
+        return self._break_until
+
+    @break_until.setter
+    def break_until(self, value: float):
+        self.initialize_break(value - time.time())
+
+    @property
+    def on_break(self) -> bool:
+        return time.time() < self._break_until
 
     def initialize_break(self, seconds: int):
         """Set the break duration without causing the caller to sleep."""
-        self.break_until = time.time() + int(seconds)
+        with self._state:
+            self._cancel_break()
+            seconds = max(0, int(seconds))
+            if seconds:
+                self._break_until = time.time() + seconds
+                self._break_timer = threading.Timer(seconds, self._end_break)
+                self._break_timer.daemon = True
+                self._break_timer.start()
+            self._update()
+
+    def _end_break(self):
+        with self._state:
+            self._update()
+
+    def _cancel_break(self):
+        if self._break_timer is not None:
+            self._break_timer.cancel()
+            self._break_timer = None
+        self._break_until = 0
+
+    def _update(self):
+        """Recompute the fast-path flag and wake waiters. Hold `_state`."""
+        self._blocked = self._terminate or self._pause or self.on_break
+        self._state.notify_all()
+
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        """
+        Block while paused or on a break.
+        Raises ScriptTerminationException as soon as termination is requested.
+        Returns False if still blocked after `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._state:
+            while True:
+                if self._terminate:
+                    raise ScriptTerminationException()
+                remaining = self._break_until - time.time()
+                if not self._pause and remaining <= 0:
+                    self._blocked = False
+                    return True
+                # a break ends on its own: don't rely on the timer alone
+                wait = remaining if not self._pause else None
+                if deadline is not None:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        return False
+                    wait = left if wait is None else min(wait, left)
+                self._state.wait(wait)
 
     def guard(self, func):
         """
         Decorator to enforce termination and break logic.
-        Raises RuntimeError if termination is requested.
-        Waits if a break is active.
+        Raises ScriptTerminationException if termination is requested.
+        Waits if a break is active or the script is paused.
         """
         @wraps(func)
         def wrapper(*args, **kwargs):
-            while time.time() < self.break_until or self.pause:
-                if self.terminate:
-                    raise ScriptTerminationException()
-                time.sleep(1)
-            if self.terminate:
-                raise ScriptTerminationException()
+            if self._blocked:
+                self.wait_until_ready()
             return func(*args, **kwargs)
         return wrapper
 
@@ -307,6 +307,9 @@ def enqueue_match(parent: Image.Image, template: Image.Image | tuple[int, int, i
     if not _enabled:
         return
     try:
+        # Frames carry a cached PIL view; the worker only draws on PIL images
+        if not isinstance(parent, Image.Image):
+            parent = parent.image
         # Cheap shallow copies to decouple from caller
         p = parent.copy()
         if (isinstance(template, tuple) or isinstance(template, list)) and len(template) == 3:
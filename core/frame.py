@@ -0,0 +1,152 @@
+"""
+NumPy-native screenshot type for the CV pipeline.
+
+A `Frame` holds the pixels of a screenshot once, as an ndarray, and derives
+the BGR / RGB / grayscale / HSV views lazily on first use. `crop` returns a
+view into the same memory, so cropping a region and matching or thresholding
+inside it never copies the parent frame. Frames mimic the small part of the
+PIL API the codebase relies on (`width`, `height`, `size`, `crop`), so
+`MatchResult.crop_in` and friends accept them unchanged.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+
+class Frame:
+    """Screenshot pixels as an ndarray with lazily cached colour-space views."""
+
+    def __init__(self, rgb: Optional[np.ndarray] = None, *, bgr: Optional[np.ndarray] = None):
+        if rgb is None and bgr is None:
+            raise ValueError('Frame needs rgb or bgr pixels')
+        self._rgb = rgb
+        self._bgr = bgr
+        self._gray: Optional[np.ndarray] = None
+        self._hsv: Optional[np.ndarray] = None
+        self._image: Optional[Image.Image] = None
+        self._pyramid: Dict[int, np.ndarray] = {}
+
+    # ---- construction -------------------------------------------------
+    @classmethod
+    def from_image(cls, img: Image.Image) -> 'Frame':
+        """Wrap a PIL image (any mode; alpha is dropped)."""
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        frame = cls(np.asarray(img))
+        frame._image = img
+        return frame
+
+    @classmethod
+    def from_bgra(cls, bgra: np.ndarray) -> 'Frame':
+        """Wrap an (H, W, 4) BGRA buffer as produced by mss."""
+        return cls(bgr=bgra[:, :, :3])
+
+    # ---- geometry (PIL compatible) -------------------------------------
+    @property
+    def shape(self) -> Tuple[int, int]:
+        arr = self._rgb if self._rgb is not None else self._bgr
+        return arr.shape[0], arr.shape[1]
+
+    @property
+    def width(self) -> int:
+        return self.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.shape[0]
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    # ---- lazily derived views -------------------------------------------
+    @property
+    def bgr(self) -> np.ndarray:
+        if self._bgr is None:
+            self._bgr = cv2.cvtColor(self._rgb, cv2.COLOR_RGB2BGR)
+        elif not self._bgr.flags.c_contiguous:
+            self._bgr = np.ascontiguousarray(self._bgr)
+        return self._bgr
+
+    @property
+    def rgb(self) -> np.ndarray:
+        if self._rgb is None:
+            self._rgb = cv2.cvtColor(self._bgr, cv2.COLOR_BGR2RGB)
+        return self._rgb
+
+    @property
+    def gray(self) -> np.ndarray:
+        if self._gray is None:
+            if self._bgr is not None:
+                self._gray = cv2.cvtColor(self._bgr, cv2.COLOR_BGR2GRAY)
+            else:
+                self._gray = cv2.cvtColor(self._rgb, cv2.COLOR_RGB2GRAY)
+        return self._gray
+
+    @property
+    def hsv(self) -> np.ndarray:
+        if self._hsv is None:
+            if self._bgr is not None:
+                self._hsv = cv2.cvtColor(self._bgr, cv2.COLOR_BGR2HSV)
+            else:
+                self._hsv = cv2.cvtColor(self._rgb, cv2.COLOR_RGB2HSV)
+        return self._hsv
+
+    @property
+    def image(self) -> Image.Image:
+        """PIL view of the frame (built once, then cached)."""
+        if self._image is None:
+            self._image = Image.fromarray(np.ascontiguousarray(self.rgb))
+        return self._image
+
+    def downscaled(self, factor: int) -> np.ndarray:
+        """BGR view shrunk by an integer `factor` (INTER_AREA), cached per factor."""
+        level = self._pyramid.get(factor)
+        if level is None:
+            h, w = self.shape
+            level = cv2.resize(self.bgr, (max(1, w // factor), max(1, h // factor)),
+                               interpolation=cv2.INTER_AREA)
+            self._pyramid[factor] = level
+        return level
+
+    # ---- regions ------------------------------------------------------
+    def crop(self, box: Tuple[int, int, int, int]) -> 'Frame':
+        """
+        Zero-copy crop to (start_x, start_y, end_x, end_y).
+        The box is clamped to the frame; every view that is already cached
+        on this frame is sliced into the child as well.
+        """
+        h, w = self.shape
+        sx, sy, ex, ey = (int(v) for v in box)
+        sx, ex = max(0, min(sx, w)), max(0, min(ex, w))
+        sy, ey = max(0, min(sy, h)), max(0, min(ey, h))
+        ex, ey = max(ex, sx), max(ey, sy)
+
+        def _slice(arr):
+            return None if arr is None else arr[sy:ey, sx:ex]
+
+        child = Frame(_slice(self._rgb), bgr=_slice(self._bgr))
+        child._gray = _slice(self._gray)
+        child._hsv = _slice(self._hsv)
+        return child
+
+    def copy(self) -> 'Frame':
+        """Deep copy (use before painting into the pixels)."""
+        return Frame(
+            None if self._rgb is None else self._rgb.copy(),
+            bgr=None if self._bgr is None else self._bgr.copy()
+        )
+
+    def __repr__(self) -> str:
+        return f'Frame({self.width}x{self.height})'
+
+
+def as_frame(img: Image.Image | Frame) -> Frame:
+    """Return `img` as a Frame, converting a PIL image once if needed."""
+    if isinstance(img, Frame):
+        return img
+    return Frame.from_image(img)
@@ -0,0 +1,174 @@
+"""
+Cursor-anchored reader for the action hover box.
+
+The action hover box (data/ui/action-hover.png) is drawn just below and to
+the right of the cursor, so it can be read from a small capture around the
+cursor instead of a full-window screenshot:
+
+  * the start / end slices of the box template are cut once and prepared
+    through the template cache;
+  * only the rectangle the box can occupy is grabbed;
+  * the text is cached per (cursor cell, pixels of the grabbed rectangle),
+    so hovering the same thing again skips the search and the OCR;
+  * every read is timed (`stats()`).
+
+Smart clicks verify the hover text before every click, so this sits on the
+critical path of most interactions.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from core import ocr
+from core.color_mask import mask_above_array
+from core.frame import Frame, as_frame
+from core.region_match import MatchResult
+from core.tools import find_subimage
+
+Box = Tuple[int, int, int, int]
+
+_MISS = object()
+
+
+class HoverReader:
+    """Reads the action hover box next to the cursor."""
+
+    # where the box's top-left corner can be, relative to the cursor
+    START_SEARCH = (-45, -20, 20, 45)
+    MAX_WIDTH = 350
+    MAX_HEIGHT = 25
+    SLICE_WIDTH = 10
+    MIN_CONFIDENCE = 0.95
+
+    def __init__(
+            self,
+            template: Image.Image,
+            grab: Callable[[Box], Image.Image | Frame],
+            cell: int = 8,
+            max_entries: int = 256,
+            backend: ocr.OcrBackend = ocr.OcrBackend.TESSERACT
+        ):
+        """
+        Args:
+            template: The hover box template.
+            grab: Returns the pixels of a (x1, y1, x2, y2) box in window
+                coordinates.
+            cell: Cursor positions within the same `cell`-pixel square share
+                cache entries.
+            backend: OCR backend used for the text.
+        """
+        self.start = template.crop((0, 0, self.SLICE_WIDTH, template.height))
+        self.end = template.crop((template.width - self.SLICE_WIDTH, 0, template.width, template.height))
+        self._grab = grab
+        self.cell = cell
+        self.max_entries = max_entries
+        self.backend = backend
+        self._cache: OrderedDict[tuple, Optional[str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hits = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+
+    def region(self, cursor: Tuple[int, int], bounds: Tuple[int, int]) -> MatchResult:
+        """
+        The rectangle the hover box can occupy for any cursor in the cursor's
+        cell, clamped to `bounds` (w, h). Anchoring it to the cell keeps the
+        capture identical while the cursor jitters inside the cell.
+        """
+        cx, cy = cursor[0] // self.cell * self.cell, cursor[1] // self.cell * self.cell
+        x1, y1, x2, y2 = self.START_SEARCH
+        return MatchResult(
+            max(0, cx + x1),
+            max(0, cy + y1),
+            min(bounds[0], cx + self.cell + x2 + self.MAX_WIDTH),
+            min(bounds[1], cy + self.cell + y2 + self.MAX_HEIGHT)
+        )
+
+    def read(self, cursor: Tuple[int, int], bounds: Tuple[int, int]) -> Optional[str]:
+        """Hover text at `cursor` (window coordinates); None when no box is shown."""
+        t0 = time.perf_counter()
+        region = self.region(cursor, bounds)
+        frame = as_frame(self._grab(region.bounding_box))
+        key = (
+            cursor[0] // self.cell,
+            cursor[1] // self.cell,
+            hashlib.blake2b(np.ascontiguousarray(frame.bgr).tobytes(), digest_size=16).digest()
+        )
+        with self._lock:
+            text = self._cache.get(key, _MISS)
+            if text is not _MISS:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if text is _MISS:
+            text = self._read_frame(frame, (cursor[0] - region.start_x, cursor[1] - region.start_y))
+            with self._lock:
+                self._cache[key] = text
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        self._record((time.perf_counter() - t0) * 1000.0)
+        return text
+
+    def _find(self, frame: Frame, template: Image.Image, box: Box) -> Optional[MatchResult]:
+        area = MatchResult(*box)
+        patch = area.crop_in(frame)
+        if patch.shape[0] < template.height or patch.shape[1] < template.width:
+            return None
+        match = find_subimage(patch, template, min_scale=1, max_scale=1)
+        if match.confidence < self.MIN_CONFIDENCE:
+            return None
+        return match.transform(area.start_x, area.start_y)
+
+    def _read_frame(self, frame: Frame, cursor: Tuple[int, int]) -> Optional[str]:
+        cx, cy = cursor
+        x1, y1, x2, y2 = self.START_SEARCH
+        start = self._find(frame, self.start, (cx + x1, cy + y1, cx + x2, cy + y2))
+        if start is None:
+            return None
+        end = self._find(frame, self.end, (
+            start.start_x, start.start_y,
+            start.start_x + self.MAX_WIDTH, start.start_y + self.MAX_HEIGHT
+        ))
+        if end is None:
+            return None
+
+        action = MatchResult(start.start_x, start.start_y, end.end_x, end.end_y)
+        action_txt = mask_above_array(action.crop_in(frame), threshold=150)
+        return ocr.execute(
+            action_txt,
+            font=ocr.FontChoice.RUNESCAPE_PLAIN_11,
+            psm=ocr.TessPsm.SINGLE_LINE,
+            raise_on_blank=False,
+            preprocess=False,
+            backend=self.backend
+        )
+
+    # ---- metrics --------------------------------------------------------
+    def _record(self, ms: float):
+        with self._lock:
+            self.reads += 1
+            self.total_ms += ms
+            self.last_ms = ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'reads': self.reads,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.reads if self.reads else 0.0,
+            'mean_ms': self.total_ms / self.reads if self.reads else 0.0,
+            'last_ms': self.last_ms,
+            'max_ms': self.max_ms,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,302 @@
+"""
+Input backends.
+
+Every mouse / keyboard event the bots send goes through an `InputBackend`:
+
+  * `PyAutoGuiBackend` drives the real cursor and keyboard (pyautogui and
+    keyboard are imported on first use, so importing this module does not
+    need a desktop);
+  * `NullBackend` only tracks a virtual cursor;
+  * `RecordingBackend` wraps another backend and logs every call with its
+    start time and how long the wrapped call took, for benchmarks and
+    regression tests of the movement / click code on a headless box.
+
+`input_backend()` returns the process default; clients can be given their
+own. Backends raise `InputFailSafe` when the user aborts input (pyautogui's
+corner fail-safe), so callers never need to import pyautogui themselves.
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from core.logger import get_logger
+
+log = get_logger('InputBackend')
+
+
+class InputFailSafe(RuntimeError):
+    """The user took over the mouse (e.g. pyautogui's screen-corner fail-safe)."""
+
+
+class InputBackend:
+    """Mouse and keyboard primitives used by core.input.mouse_control and the clients."""
+
+    name = 'base'
+
+    def position(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def move_to(self, x: int, y: int):
+        raise NotImplementedError
+
+    def click(self, button: str = 'left', duration: float = 0.0):
+        raise NotImplementedError
+
+    def mouse_down(self, button: str = 'left'):
+        raise NotImplementedError
+
+    def mouse_up(self, button: str = 'left'):
+        raise NotImplementedError
+
+    def scroll(self, amount: int, x: int = None, y: int = None):
+        raise NotImplementedError
+
+    def write(self, text: str, delay: float = 0.0):
+        raise NotImplementedError
+
+    def press(self, key: str):
+        raise NotImplementedError
+
+    def release(self, key: str):
+        raise NotImplementedError
+
+    def press_and_release(self, key: str):
+        self.press(key)
+        self.release(key)
+
+
+class PyAutoGuiBackend(InputBackend):
+    """The real desktop, through pyautogui (mouse) and keyboard."""
+
+    name = 'pyautogui'
+
+    def __init__(self):
+        self._pyautogui = None
+        self._keyboard = None
+
+    @property
+    def pyautogui(self):
+        if self._pyautogui is None:
+            import pyautogui
+            self._pyautogui = pyautogui
+        return self._pyautogui
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            import keyboard
+            self._keyboard = keyboard
+        return self._keyboard
+
+    def _mouse(self, fn, *args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except self.pyautogui.FailSafeException as e:
+            raise InputFailSafe(str(e)) from e
+
+    def position(self) -> Tuple[int, int]:
+        x, y = self.pyautogui.position()
+        return int(x), int(y)
+
+    def move_to(self, x: int, y: int):
+        self._mouse(self.pyautogui.moveTo, x, y, _pause=0)
+
+    def click(self, button: str = 'left', duration: float = 0.0):
+        self._mouse(self.pyautogui.click, button=button, duration=duration)
+
+    def mouse_down(self, button: str = 'left'):
+        self._mouse(self.pyautogui.mouseDown, button=button)
+
+    def mouse_up(self, button: str = 'left'):
+        self._mouse(self.pyautogui.mouseUp, button=button)
+
+    def scroll(self, amount: int, x: int = None, y: int = None):
+        self._mouse(self.pyautogui.scroll, amount, x, y)
+
+    def write(self, text: str, delay: float = 0.0):
+        self.keyboard.write(text, delay=delay)
+
+    def press(self, key: str):
+        self.keyboard.press(key)
+
+    def release(self, key: str):
+        self.keyboard.release(key)
+
+    def press_and_release(self, key: str):
+        self.keyboard.press_and_release(key)
+
+
+class NullBackend(InputBackend):
+    """Sends nothing; keeps a virtual cursor so movement code behaves normally."""
+
+    name = 'null'
+
+    def __init__(self, position: Tuple[int, int] = (0, 0)):
+        self._pos = (int(position[0]), int(position[1]))
+
+    def position(self) -> Tuple[int, int]:
+        return self._pos
+
+    def move_to(self, x: int, y: int):
+        self._pos = (int(x), int(y))
+
+    def click(self, button: str = 'left', duration: float = 0.0):
+        pass
+
+    def mouse_down(self, button: str = 'left'):
+        pass
+
+    def mouse_up(self, button: str = 'left'):
+        pass
+
+    def scroll(self, amount: int, x: int = None, y: int = None):
+        if x is not None and y is not None:
+            self._pos = (int(x), int(y))
+
+    def write(self, text: str, delay: float = 0.0):
+        pass
+
+    def press(self, key: str):
+        pass
+
+    def release(self, key: str):
+        pass
+
+
+class InputEvent(NamedTuple):
+    """One backend call: start time (s since the recording started), call duration (s), kind, args."""
+    t: float
+    dt: float
+    kind: str
+    args: tuple
+
+
+class RecordingBackend(InputBackend):
+    """
+    Logs every call made through it, then forwards it to `inner`
+    (a NullBackend by default).
+    """
+
+    name = 'recording'
+
+    def __init__(
+            self,
+            inner: InputBackend = None,
+            clock: Callable[[], float] = time.perf_counter,
+            record_position: bool = True
+        ):
+        """
+        Args:
+            inner: Backend the calls are forwarded to.
+            record_position: Also log `position()` reads (they are OS round
+                trips with the real backend).
+        """
+        self.inner = inner or NullBackend()
+        self._clock = clock
+        self.record_position = record_position
+        self.events: List[InputEvent] = []
+        self._t0 = clock()
+
+    def _call(self, kind: str, args: tuple, fn, record: bool = True):
+        start = self._clock()
+        result = fn(*args)
+        if record:
+            self.events.append(InputEvent(start - self._t0, self._clock() - start, kind, args))
+        return result
+
+    def position(self) -> Tuple[int, int]:
+        return self._call('position', (), self.inner.position, self.record_position)
+
+    def move_to(self, x: int, y: int):
+        self._call('move', (int(x), int(y)), self.inner.move_to)
+
+    def click(self, button: str = 'left', duration: float = 0.0):
+        self._call('click', (button, duration), self.inner.click)
+
+    def mouse_down(self, button: str = 'left'):
+        self._call('mouse_down', (button,), self.inner.mouse_down)
+
+    def mouse_up(self, button: str = 'left'):
+        self._call('mouse_up', (button,), self.inner.mouse_up)
+
+    def scroll(self, amount: int, x: int = None, y: int = None):
+        self._call('scroll', (amount, x, y), self.inner.scroll)
+
+    def write(self, text: str, delay: float = 0.0):
+        self._call('write', (text, delay), self.inner.write)
+
+    def press(self, key: str):
+        self._call('press', (key,), self.inner.press)
+
+    def release(self, key: str):
+        self._call('release', (key,), self.inner.release)
+
+    def press_and_release(self, key: str):
+        self._call('press_and_release', (key,), self.inner.press_and_release)
+
+    # ---- inspection -----------------------------------------------------
+    def of_kind(self, kind: str) -> List[InputEvent]:
+        return [e for e in self.events if e.kind == kind]
+
+    def path(self) -> List[Tuple[int, int]]:
+        """Every cursor position moved to, in order."""
+        return [e.args for e in self.events if e.kind == 'move']
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{kind: {'count', 'mean_ms', 'max_ms'}} of the time spent inside the backend."""
+        stats: Dict[str, Dict[str, float]] = {}
+        for e in self.events:
+            s = stats.setdefault(e.kind, {'count': 0, 'mean_ms': 0.0, 'max_ms': 0.0})
+            s['count'] += 1
+            s['mean_ms'] += e.dt * 1000.0
+            s['max_ms'] = max(s['max_ms'], e.dt * 1000.0)
+        for s in stats.values():
+            s['mean_ms'] /= s['count']
+        return stats
+
+    def clear(self):
+        self.events.clear()
+        self._t0 = self._clock()
+
+    # ---- log file -------------------------------------------------------
+    def dumps(self) -> str:
+        """The events as tab separated lines: t, dt, kind, args (comma separated)."""
+        return '\n'.join(
+            f'{e.t:.6f}\t{e.dt:.6f}\t{e.kind}\t' + ','.join('' if a is None else str(a) for a in e.args)
+            for e in self.events
+        )
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.dumps())
+
+    @staticmethod
+    def loads(text: str) -> List[InputEvent]:
+        """Parse `dumps()` output; args come back as strings."""
+        events = []
+        for line in text.splitlines():
+            if not line:
+                continue
+            t, dt, kind, args = line.split('\t', 3)
+            events.append(InputEvent(float(t), float(dt), kind, tuple(args.split(',')) if args else ()))
+        return events
+
+
+_default: Optional[InputBackend] = None
+
+
+def input_backend() -> InputBackend:
+    """Process-wide default backend (the real desktop unless replaced)."""
+    global _default
+    if _default is None:
+        _default = PyAutoGuiBackend()
+    return _default
+
+
+def set_input_backend(backend: InputBackend) -> InputBackend:
+    """Replace the default backend; returns the previous one."""
+    global _default
+    previous, _default = _default, backend
+    log.info(f'Input backend set to {backend.name}')
+    return previous
@@ -0,0 +1,247 @@
+"""
+Precomputed human-like mouse trajectories.
+
+`plan_trajectory` builds a whole cursor path up front as NumPy arrays: the
+curve / overshoot waypoints, a quadratic Bezier per leg, the distance
+weighted wobble, the direction cone, the eased timestamps and the
+occasional micro-pause. Everything random is drawn from one
+`numpy.random.Generator`, so a seed reproduces a path exactly.
+
+`replay` then plays the path back against a high-resolution clock, issuing
+one move per point at its timestamp. Nothing reads the cursor position
+while moving; callers verify the end point once afterwards.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+Point = Tuple[int, int]
+
+# pixels / second of the default speed model (before `multiplier`)
+BASE_SPEED = 700
+# never move a leg faster than this
+MIN_LEG_DURATION = 0.1
+# at most one cursor event every 10 ms
+MIN_STEP_TIME = 0.01
+# longest single step in pixels
+MAX_STEP_PX = 30
+# sleep until this close to a timestamp, then spin
+SPIN_S = 0.0015
+
+
+@dataclass(frozen=True)
+class Trajectory:
+    """Cursor path: integer points and their offsets (seconds) from the start."""
+    points: np.ndarray  # (N, 2) int
+    times: np.ndarray   # (N,) float, non-decreasing
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @property
+    def duration(self) -> float:
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    @property
+    def end(self) -> Optional[Point]:
+        return tuple(int(v) for v in self.points[-1]) if len(self.points) else None
+
+
+def _rng(seed: int | np.random.Generator | None) -> np.random.Generator:
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def _waypoints(
+        start: np.ndarray,
+        target: np.ndarray,
+        rng: np.random.Generator,
+        curve_prob: float,
+        curve_ratio: Tuple[float, float],
+        overshoot_prob: float,
+        overshoot_ratio: Tuple[float, float]
+    ) -> List[np.ndarray]:
+    dist = float(np.hypot(*(target - start)))
+    waypoints = []
+    if rng.random() < curve_prob and dist > 40:
+        lo, hi = int(curve_ratio[0] * dist), int(curve_ratio[1] * dist)
+        change = rng.integers(lo, hi, size=2, endpoint=True) * rng.choice([-1, 1], size=2)
+        waypoints.append(np.trunc((start + target) / 2 + change))
+    if rng.random() < overshoot_prob and dist > 40:
+        unit = (target - start) / dist
+        waypoints.append(np.trunc(target + unit * dist * rng.uniform(*overshoot_ratio)))
+    waypoints.append(target)
+    return waypoints
+
+
+def _leg_duration(seg: float, rng: np.random.Generator, speed: float | None, multiplier: float) -> float:
+    if speed is not None:
+        duration = seg / speed
+    else:
+        duration = min(max(seg / BASE_SPEED * multiplier, 0.05), 0.5)
+    return max(MIN_LEG_DURATION, duration) * rng.uniform(0.97, 1.03)
+
+
+def _leg_steps(seg: float, duration: float, realtime: bool) -> int:
+    steps = max(8, int(seg / 8), int(duration * 20), int(np.ceil(seg / MAX_STEP_PX)))
+    if realtime and duration / steps < MIN_STEP_TIME:
+        steps = max(8, int(duration / MIN_STEP_TIME), int(np.ceil(seg / MAX_STEP_PX)))
+    return steps
+
+
+def _constrain(base: np.ndarray, pts: np.ndarray, wp: np.ndarray, max_deg: float) -> np.ndarray:
+    """Rotate each step base[i]→pts[i] into the ±max_deg cone around base[i]→wp."""
+    step = pts - base
+    length = np.hypot(step[:, 0], step[:, 1])
+    heading = np.arctan2(step[:, 1], step[:, 0])
+    to_wp = np.arctan2(wp[1] - base[:, 1], wp[0] - base[:, 0])
+    delta = (heading - to_wp + np.pi) % (2 * np.pi) - np.pi
+    limit = np.radians(max_deg)
+    outside = (np.abs(delta) > limit) & (length > 0)
+    if not outside.any():
+        return pts
+    clamped = to_wp + np.clip(delta, -limit, limit)
+    out = pts.copy()
+    out[outside, 0] = base[outside, 0] + length[outside] * np.cos(clamped[outside])
+    out[outside, 1] = base[outside, 1] + length[outside] * np.sin(clamped[outside])
+    return out
+
+
+def plan_trajectory(
+        start: Point,
+        target: Point,
+        seed: int | np.random.Generator | None = None,
+        overshoot_prob: float = .40,
+        wobble_prob: float = .8,
+        pause_prob: float = .18,
+        curve_prob: float = .6,
+        overshoot_ratio: Tuple[float, float] = (.04, .1),
+        wobble_px: Tuple[int, int] = (-1, -1),
+        curve_ratio: Tuple[float, float] = (.01, .25),
+        pause_max_ms: float = 250,
+        speed: float | None = None,
+        max_direction_change: float = 30,
+        multiplier: float = 0.45,
+        realtime: bool = True
+    ) -> Trajectory:
+    """
+    Plan a cursor path from `start` to `target`.
+
+    Args:
+        seed: Seed or generator for every random choice of the path.
+        wobble_px: (min, max) wobble in pixels; (-1, -1) picks a random pair.
+        speed: Pixels per second; None uses the distance based default.
+        max_direction_change: Largest angle (degrees) a step may deviate
+            from the heading towards its waypoint.
+        multiplier: Scales the default duration (lower = faster).
+        realtime: Keep at least MIN_STEP_TIME between points. Off for
+            simulation.
+    """
+    rng = _rng(seed)
+    start_pt = np.asarray(start, dtype=np.float64)
+    target_pt = np.asarray(target, dtype=np.float64)
+    if np.hypot(*(target_pt - start_pt)) < 1:
+        return Trajectory(np.empty((0, 2), dtype=int), np.empty(0))
+
+    if tuple(wobble_px) == (-1, -1):
+        lo = int(rng.integers(2, 8, endpoint=True))
+        wobble_px = (lo, lo + int(rng.integers(2, 8, endpoint=True)))
+
+    waypoints = _waypoints(start_pt, target_pt, rng, curve_prob, curve_ratio, overshoot_prob, overshoot_ratio)
+    last_leg = len(waypoints) - 1
+
+    points, times = [], []
+    prev, offset = start_pt, 0.0
+    for leg, wp in enumerate(waypoints):
+        seg = float(np.hypot(*(wp - prev)))
+        if seg < 1:
+            prev = wp
+            continue
+        duration = _leg_duration(seg, rng, speed, multiplier)
+        steps = _leg_steps(seg, duration, realtime)
+        frac = np.arange(1, steps + 1) / steps
+
+        # quadratic Bezier through a control point a third of the way along
+        ctrl_range = min(15.0, seg * 0.2)
+        ctrl = prev + (wp - prev) * .33 + rng.uniform(-ctrl_range, ctrl_range, size=2)
+        f = frac[:, None]
+        curve = (1 - f) ** 2 * prev + 2 * (1 - f) * f * ctrl + f ** 2 * wp
+
+        # wobble perpendicular to the leg, likelier far from the waypoint
+        remaining = np.hypot(*(wp - curve).T) / seg
+        wobble = rng.random(steps) < wobble_prob * remaining ** 1.7
+        if leg == last_leg:
+            wobble &= rng.random(steps) < .15
+            wob_lo, wob_hi = 1, 4
+        else:
+            wob_lo, wob_hi = wobble_px
+        perp = np.array([-(wp - prev)[1], (wp - prev)[0]]) / seg
+        signs = rng.choice([-1.0, 1.0], size=(steps, 2))
+        mag = rng.integers(wob_lo, wob_hi, size=steps, endpoint=True) * (1 - frac)
+        pts = curve + wobble[:, None] * signs * perp * mag[:, None]
+
+        base = np.vstack([prev, curve[:-1]])
+        pts = _constrain(base, pts, wp, max_direction_change)
+
+        # cubic ease-in-out timestamps
+        stamps = duration * (3 * frac ** 2 - 2 * frac ** 3)
+        if realtime and leg == 0 and pause_prob > 0:
+            window = (frac > .45) & (frac < .55)
+            pauses = window & (rng.random(steps) < .10)
+            if pauses.any():
+                extra = np.where(pauses, rng.uniform(.03, max(.03, pause_max_ms / 1000), size=steps), 0.0)
+                stamps = stamps + np.cumsum(extra)
+
+        points.append(pts)
+        times.append(offset + stamps)
+        offset += float(stamps[-1])
+        prev = wp
+
+    if not points:
+        return Trajectory(np.empty((0, 2), dtype=int), np.empty(0))
+    pts = np.maximum(1, np.concatenate(points).astype(int))
+    return Trajectory(pts, np.concatenate(times))
+
+
+def replay(
+        trajectory: Trajectory,
+        move: Callable[[int, int], None],
+        realtime: bool = True,
+        should_stop: Callable[[], bool] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> int:
+    """
+    Issue `move(x, y)` for each point at its timestamp.
+
+    Points whose successor is already due are skipped (the final point never
+    is), so a late start catches up instead of drifting. Returns the number
+    of moves issued.
+    """
+    points, times = trajectory.points, trajectory.times
+    n = len(points)
+    moves = 0
+    last = None
+    t0 = clock()
+    for i in range(n):
+        if should_stop is not None and should_stop():
+            break
+        if realtime:
+            due = t0 + times[i]
+            now = clock()
+            if i + 1 < n and now >= t0 + times[i + 1]:
+                continue
+            while now < due:
+                if due - now > SPIN_S:
+                    sleep(due - now - SPIN_S)
+                now = clock()
+        point = (int(points[i][0]), int(points[i][1]))
+        if point == last:
+            continue
+        move(*point)
+        last = point
+        moves += 1
+    return moves
@@ -0,0 +1,200 @@
+"""
+Slot-grid model of the inventory.
+
+The inventory is a fixed 4x7 grid inside the toolplane, so instead of sweeping
+every item icon over the whole toolplane we cut the 28 slots out once and
+classify each small patch against the icons we care about. Matching a
+cropped icon inside a slot-sized patch is a handful of tiny `matchTemplate`
+calls, regardless of how many copies of an item there are.
+
+Geometry (OSRS side panel, in pixels at 100% scale):
+    * the panel interior is 190x261; the inventory widget sits at (16, 8)
+      inside it (the fixed-mode widget at 563,213 in a panel at 547,205);
+    * slots are 36x32 with a 42x36 pitch.
+The interior offsets come from the toolplane templates themselves (the 7 px
+frame of `toolplane-modern`, the inner edge of the left pillar of
+`toolplane-classic`); tests/test_inventory.py checks them against those
+templates and against the real side panel in `data/ui/ui_inventory.png`.
+Fixed mode is located with the classic template (see
+`UISectors.TOOLPLANES`), so it shares the classic offsets.
+Each slot patch is cut with a small margin so a pixel or two of layout
+drift doesn't break classification.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from core.frame import Frame, as_frame
+from core.region_match import MatchResult
+from core.template_cache import get_template
+
+
+@dataclass(frozen=True)
+class InventoryGrid:
+    """Position of the 4x7 slot grid relative to the toolplane match."""
+    origin: Tuple[int, int]
+    slot_size: Tuple[int, int] = (36, 32)
+    pitch: Tuple[int, int] = (42, 36)
+    cols: int = 4
+    rows: int = 7
+    margin: int = 3
+
+    # panel interior offset inside each toolplane template + widget offset
+    _ORIGINS = {
+        'modern': (7 + 16, 7 + 8),
+        'classic': (23 + 16, 0 + 8),
+        'fixed': (23 + 16, 0 + 8),  # matched with the classic template
+    }
+
+    @classmethod
+    def for_ui(cls, ui_type) -> 'InventoryGrid':
+        """Grid for a `UIType` (or its string value)."""
+        return cls(origin=cls._ORIGINS[getattr(ui_type, 'value', ui_type)])
+
+    def slot_boxes(self, toolplane: MatchResult) -> List[MatchResult]:
+        """The 28 slot rectangles in the same coordinates as `toolplane`."""
+        ox = toolplane.start_x + self.origin[0]
+        oy = toolplane.start_y + self.origin[1]
+        w, h = self.slot_size
+        px, py = self.pitch
+        return [
+            MatchResult(ox + c * px, oy + r * py, ox + c * px + w, oy + r * py + h)
+            for r in range(self.rows) for c in range(self.cols)
+        ]
+
+
+class InventorySnapshot:
+    """
+    Classification of every inventory slot in one frame.
+
+    `slots[i]` is the key of the item found in slot i (row-major, as the game
+    numbers them), or None when the slot is empty or holds something that is
+    not among the icons the snapshot was built with. `matches[i]` is where
+    that icon sits (with its confidence), in the coordinates of `boxes`.
+    """
+
+    # An item sprite always carries a near-black outline; the panel
+    # background doesn't, so a slot with too few dark pixels is empty.
+    OUTLINE_LEVEL = 12
+    OUTLINE_MIN_PIXELS = 10
+
+    def __init__(
+            self,
+            slots: List[Optional[Hashable]],
+            boxes: List[MatchResult],
+            confidences: List[float],
+            empty: np.ndarray,
+            matches: Optional[List[Optional[MatchResult]]] = None
+        ):
+        self.slots = slots
+        self.boxes = boxes
+        self.confidences = confidences
+        self.empty = empty
+        self.matches = matches if matches is not None else [None] * len(slots)
+
+    @classmethod
+    def capture(
+            cls,
+            sc: Image.Image | Frame,
+            toolplane: MatchResult,
+            icons: Dict[Hashable, Image.Image],
+            grid: InventoryGrid,
+            min_confidence: float = 0.97
+        ) -> 'InventorySnapshot':
+        """
+        Classify the 28 slots of `sc` against `icons` ({key: icon}).
+        `toolplane` is the toolplane match in `sc` coordinates.
+        """
+        frame = as_frame(sc)
+        _ = frame.bgr  # convert once so every slot crop shares the view
+        boxes = grid.slot_boxes(toolplane)
+        prepared = {key: get_template(icon) for key, icon in icons.items()}
+
+        slots: List[Optional[Hashable]] = []
+        confidences: List[float] = []
+        matches: List[Optional[MatchResult]] = []
+        empty = np.zeros(len(boxes), dtype=bool)
+        m = grid.margin
+        for i, box in enumerate(boxes):
+            x0, y0 = box.start_x - m, box.start_y - m
+            patch = frame.crop((x0, y0, box.end_x + m, box.end_y + m))
+            empty[i] = cls._looks_empty(patch.bgr)
+            best_key, best_conf, match = None, -1.0, None
+            if not empty[i]:
+                best_key, best_conf, match = cls._classify(patch.bgr, prepared)
+            if best_conf < min_confidence:
+                best_key, match = None, None
+            slots.append(best_key)
+            confidences.append(best_conf)
+            matches.append(match.transform(x0, y0) if match else None)
+        return cls(slots, boxes, confidences, empty, matches)
+
+    @classmethod
+    def _looks_empty(cls, patch: np.ndarray) -> bool:
+        if patch.size == 0:
+            return True
+        dark = int(np.count_nonzero(patch.max(axis=2) <= cls.OUTLINE_LEVEL))
+        return dark < cls.OUTLINE_MIN_PIXELS
+
+    @staticmethod
+    def _classify(patch: np.ndarray, prepared) -> Tuple[Optional[Hashable], float, Optional[MatchResult]]:
+        """Best icon for `patch`: (key, confidence, its box inside the patch)."""
+        patch = np.ascontiguousarray(patch)
+        ph, pw = patch.shape[:2]
+        best_key, best_conf, best_match = None, -1.0, None
+        for key, tpl in prepared.items():
+            if tpl.width > pw or tpl.height > ph:
+                continue
+            if tpl.opaque:
+                result = cv2.matchTemplate(patch, tpl.bgr, cv2.TM_CCORR_NORMED)
+            else:
+                result = cv2.matchTemplate(patch, tpl.bgr, cv2.TM_CCORR_NORMED, mask=tpl.mask)
+            result = np.nan_to_num(result, nan=-1.0, posinf=-1.0, neginf=-1.0)
+            _, conf, _, (x, y) = cv2.minMaxLoc(result)
+            if conf > best_conf:
+                best_key, best_conf = key, conf
+                best_match = MatchResult(x, y, x + tpl.width, y + tpl.height, confidence=conf)
+        return best_key, best_conf, best_match
+
+    # ---- queries --------------------------------------------------------
+    @property
+    def counts(self) -> Counter:
+        """Number of slots holding each known item."""
+        return Counter(key for key in self.slots if key is not None)
+
+    @property
+    def empty_count(self) -> int:
+        return int(self.empty.sum())
+
+    @property
+    def is_full(self) -> bool:
+        return not self.empty.any()
+
+    def slots_of(self, key: Hashable) -> List[int]:
+        """Slot indices (row-major) holding `key`."""
+        return [i for i, k in enumerate(self.slots) if k == key]
+
+    def boxes_of(self, key: Hashable) -> List[MatchResult]:
+        """Slot rectangles holding `key`, in slot order."""
+        return [self.boxes[i] for i in self.slots_of(key)]
+
+    def matches_of(self, key: Hashable) -> List[MatchResult]:
+        """Icon matches of `key`, in slot order."""
+        return [self.matches[i] for i in self.slots_of(key)]
+
+    def diff(self, other: 'InventorySnapshot') -> Dict[int, Tuple[Optional[Hashable], Optional[Hashable]]]:
+        """{slot: (before, after)} for every slot that changed since `other`."""
+        return {
+            i: (old, new)
+            for i, (old, new) in enumerate(zip(other.slots, self.slots))
+            if old != new or other.empty[i] != self.empty[i]
+        }
+
+    def __repr__(self) -> str:
+        return f'InventorySnapshot({dict(self.counts)}, empty={self.empty_count})'
@@ -1,12 +1,17 @@
 import json
-from dataclasses import dataclass
-from typing import Dict, Optional, Any, List
+from dataclasses import dataclass, field, fields
+from functools import partial
+from typing import Callable, Dict, Iterator, Optional, Any, List
 from core.logger import get_logger
 from PIL import Image
 from io import BytesIO
 import base64
 from core import tools
 from core import ocr
+import numpy as np
+from core import item_index
+from core.item_search import ItemSearchIndex
+from core.color_mask import mask_colors_array
 from core.logger import get_logger
 
 @dataclass
@@ -27,13 +32,18 @@ class Item:
     lowalch: int
     highalch: int
     icon_b64: Optional[str] = None
+    # set for items from the compiled index: returns the cached, decoded icon
+    _icon_loader: Optional[Callable[[], Image.Image]] = field(default=None, init=False, repr=False, compare=False)
     log = get_logger('Item')
 
     @property
     def icon(self) -> Image.Image:
         """
         Returns the icon image of the item.
+        Icons from the compiled index are shared; don't modify them.
         """
+        if self._icon_loader is not None:
+            return self._icon_loader()
         if self.icon_b64:
             return Image.open(BytesIO(base64.b64decode(self.icon_b64)))
         return None
@@ -53,7 +63,7 @@ class Item:
         #match.debug_draw(sc).show()
         
         scc = match.crop_in(sc)
-        num_img = tools.mask_colors(scc, [
+        num_img = mask_colors_array(scc, [
             (255, 255, 0), # < 100k
             # TODO: actually handle these
             # (255,255,255), # > 100k
@@ -70,9 +80,51 @@ class Item:
             match.debug_draw(sc).show()
             return 0
 
+
+class IndexedItem(Item):
+    """
+    An Item read from a row of the compiled index. The icon stays in the
+    index until asked for: `icon` decodes it (cached by the index) and
+    `icon_b64` encodes the stored PNG on each access.
+    """
+
+    def __init__(self, index: item_index.ItemIndex, row: int):
+        self._index = index
+        self._row = row
+        self._icon_b64 = None
+        super().__init__(**index.fields(row))
+        self._icon_loader = partial(index.icon, row)
+
+    @property
+    def icon_png(self) -> Optional[bytes]:
+        """The stored PNG bytes of the icon, or None."""
+        return self._index.icon_png(self._row)
+
+    @property
+    def icon_b64(self) -> Optional[str]:
+        if self._icon_b64 is not None:
+            return self._icon_b64
+        png = self.icon_png
+        return base64.b64encode(png).decode('ascii') if png else None
+
+    @icon_b64.setter
+    def icon_b64(self, value: Optional[str]):
+        self._icon_b64 = value
+
+    def __eq__(self, other):
+        # equal to the Item loaded from JSON with the same values
+        if not isinstance(other, Item):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(Item) if f.compare)
+
 class ItemLookup:
     """
     Singleton class for looking up items in the OSRS database.
+
+    Items come from the compiled index (see core.item_index) when it is
+    up to date with the JSON dumps. Otherwise the JSON files are loaded and
+    the index is rebuilt for the next start. Item objects are created on
+    first lookup.
     """
     _instance = None
 
@@ -81,24 +133,67 @@ class ItemLookup:
             cls._instance = super(ItemLookup, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        if not hasattr(self, "_items_by_id"):
+    def __init__(
+            self,
+            items_path: str = item_index.ITEMS_JSON,
+            icons_path: str = item_index.ICONS_JSON,
+            index_path: Optional[str] = item_index.ITEMS_INDEX
+        ):
+        if not hasattr(self, "_rows"):
             self.log = get_logger('ItemLookup')
             self.log.info("Initializing ItemLookup...")
-            self._items_by_id: Dict[int, Item] = {}
-            self._items_by_name: Dict[str, Item] = {}
+            self.items_path = items_path
+            self.icons_path = icons_path
+            self.index_path = index_path
+            self._index: Optional[item_index.ItemIndex] = None
+            # row -> Item (None until first requested when using the index)
+            self._rows: List[Optional[Item]] = []
+            self._ids: List[int] = []
+            self._names: List[str] = []
+            self._lower: List[str] = []
+            self._row_by_id: Dict[int, int] = {}
+            self._row_by_name: Dict[str, int] = {}
+            self._search: Optional[ItemSearchIndex] = None
             self._load_data()
-            self.log.info(f"Loaded {len(self._items_by_id)} items into cache.")
+            self.log.info(f"Loaded {len(self._row_by_id)} items into cache.")
 
     def _load_data(self):
+        """
+        Opens the compiled index, or loads the JSON files (and compiles them)
+        when the index is missing or stale.
+        """
+        sources = item_index.source_fingerprint([self.items_path, self.icons_path])
+        if self.index_path:
+            index = item_index.open_index(self.index_path, sources)
+            if index is not None:
+                self._use_index(index)
+                return
+
+        self._load_json()
+        if self.index_path:
+            try:
+                self.compile_index(self.index_path, sources)
+            except Exception as e:
+                self.log.warning(f"Could not write item index {self.index_path}: {e}")
+
+    def _use_index(self, index: 'item_index.ItemIndex'):
+        self._index = index
+        self._ids = index.ids.tolist()
+        self._names = index.names
+        self._lower = [n.lower() for n in self._names]
+        self._rows = [None] * len(index)
+        self._row_by_id = dict(zip(self._ids, range(len(self._ids))))
+        self._row_by_name = dict(zip(self._lower, range(len(self._lower))))
+
+    def _load_json(self):
         """
         Loads data from JSON files, filters out duplicates, and populates the item cache.
         """
         try:
-            with open("data/items/items-cache-data.json", "r") as f:
+            with open(self.items_path, "r") as f:
                 items_data = json.load(f)
 
-            with open("data/items/icons-items-complete.json", "r") as f:
+            with open(self.icons_path, "r") as f:
                 icons_data = json.load(f)
 
             # Import here to avoid circulars at module import time
@@ -106,7 +201,7 @@ class ItemLookup:
 
             for item in items_data.values():
                 # Filter out duplicates: only include items with linked_id_item=None and linked_id_placeholder!=None
-                if (item["linked_id_item"] is None and item["linked_id_placeholder"] is not None) or item["id"] not in self._items_by_id.keys():
+                if (item["linked_id_item"] is None and item["linked_id_placeholder"] is not None) or item["id"] not in self._row_by_id.keys():
                     icon_b64 = icons_data.get(str(item["id"]))
 
                     # Crop transparent borders if icon exists
@@ -136,24 +231,59 @@ class ItemLookup:
                         icon_b64=icon_b64
                     )
 
-                    # Populate lookup dictionaries
-                    self._items_by_id[item_obj.id] = item_obj
-                    self._items_by_name[item_obj.name.lower()] = item_obj
+                    # Populate lookup tables
+                    row = self._row_by_id.get(item_obj.id)
+                    if row is None:
+                        row = len(self._rows)
+                        self._rows.append(item_obj)
+                        self._ids.append(item_obj.id)
+                        self._names.append(item_obj.name)
+                        self._lower.append(item_obj.name.lower())
+                    else:
+                        self._rows[row] = item_obj
+                        self._names[row] = item_obj.name
+                        self._lower[row] = item_obj.name.lower()
+                    self._row_by_id[item_obj.id] = row
+                    self._row_by_name[item_obj.name.lower()] = row
 
         except Exception as e:
             raise RuntimeError(f"Failed to load item data: {e}")
 
+    def compile_index(self, path: str = item_index.ITEMS_INDEX, sources: item_index.Fingerprint = None):
+        """Write the loaded items to a compiled index at `path`."""
+        if sources is None:
+            sources = item_index.source_fingerprint([self.items_path, self.icons_path])
+
+        def rows():
+            for row in range(len(self._rows)):
+                item = self._item(row)
+                if isinstance(item, IndexedItem) and item._icon_b64 is None:
+                    png = item.icon_png
+                else:
+                    png = base64.b64decode(item.icon_b64) if item.icon_b64 else None
+                yield {f.name: getattr(item, f.name) for f in fields(Item)}, png
+        item_index.build_index(path, rows(), sources)
+
+    def _item(self, row: int) -> Item:
+        item = self._rows[row]
+        if item is None:
+            item = IndexedItem(self._index, row)
+            self._rows[row] = item
+        return item
+
     def get_item_by_id(self, item_id: int) -> Optional[Item]:
         """
         Retrieves an item by its ID.
         """
-        return self._items_by_id.get(item_id)
+        row = self._row_by_id.get(item_id)
+        return None if row is None else self._item(row)
 
     def get_item_by_name(self, name: str) -> Optional[Item]:
         """
         Retrieves an item by its name (case-insensitive).
         """
-        return self._items_by_name.get(name.lower())
+        row = self._row_by_name.get(name.lower())
+        return None if row is None else self._item(row)
     
     def get_item(self, item: Any) -> Optional[Item]:
         """
@@ -168,48 +298,28 @@ class ItemLookup:
             return self.get_item_by_name(item)
         return None
 
-    def search_items(self, query: str, limit: int = 50) -> Dict[int, Item]:
+    def all_items(self) -> Iterator[Item]:
+        """Every item, in database order (creates all Item objects)."""
+        for row in range(len(self._rows)):
+            yield self._item(row)
+
+    def search_items(self, query: str, limit: int = 50, fuzzy: bool = False) -> Dict[int, Item]:
         """
         Searches for items whose names contain the query string (case-insensitive).
+        Exact names come first, then names starting with the query, then the rest;
+        `fuzzy` appends near matches after those.
         
         Returns a dictionary of item IDs and their corresponding items, limited by the limit parameter.
         """
         if not query or not query.strip():
             return {}
             
-        query = query.lower().strip()
-        results = {}
-        count = 0
-        
-        # First pass: exact matches get priority
-        for item_id, item in self._items_by_id.items():
-            if item.name.lower() == query:
-                results[item_id] = item
-                count += 1
-                if count >= limit:
-                    break
-        
-        # Second pass: starts with query
-        if count < limit:
-            for item_id, item in self._items_by_id.items():
-                if item_id not in results and item.name.lower().startswith(query):
-                    results[item_id] = item
-                    count += 1
-                    if count >= limit:
-                        break
-        
-        # Third pass: contains query
-        if count < limit:
-            for item_id, item in self._items_by_id.items():
-                if item_id not in results and query in item.name.lower():
-                    results[item_id] = item
-                    count += 1
-                    if count >= limit:
-                        break
-        
-        return results
+        rows = self.search_index.search(query, limit, fuzzy=fuzzy)
+        return {self._ids[row]: self._item(row) for row in rows.tolist()}
     
-    def search_items_advanced(self, query: str, filters: Dict[str, Any] = None, limit: int = 50) -> List[Item]:
+    def search_items_advanced(
+            self, query: str, filters: Dict[str, Any] = None, limit: int = 50,
+            fuzzy: bool = False) -> List[Item]:
         """
         Advanced search with filters and sorting.
         
@@ -217,51 +327,48 @@ class ItemLookup:
             query: Search term for item name
             filters: Dictionary of filters (tradeable_on_ge, members, stackable, etc.)
             limit: Maximum number of results to return
+            fuzzy: Append near matches (shared trigrams) after the substring matches
             
         Returns:
             List of Item objects sorted by relevance
         """
         if not query or not query.strip():
             return []
-            
-        # Get basic search results
-        search_results = self.search_items(query, limit * 2)  # Get more for filtering
-        results = list(search_results.values())
-        
-        # Apply filters if provided
-        if filters:
-            filtered_results = []
-            for item in results:
-                include = True
-                for filter_key, filter_value in filters.items():
-                    if hasattr(item, filter_key):
-                        if getattr(item, filter_key) != filter_value:
-                            include = False
-                            break
-                if include:
-                    filtered_results.append(item)
-            results = filtered_results
-        
-        # Sort by relevance (exact match first, then starts with, then contains)
-        query_lower = query.lower()
-        
-        def relevance_score(item):
-            name_lower = item.name.lower()
-            if name_lower == query_lower:
-                return 0  # Exact match - highest priority
-            elif name_lower.startswith(query_lower):
-                return 1  # Starts with - second priority
+
+        # boolean flags are indexed; anything else is checked per result
+        filters = {k: v for k, v in (filters or {}).items() if hasattr(Item, k) or k in Item.__dataclass_fields__}
+        indexed = {k: v for k, v in filters.items() if k in item_index.FLAG_FIELDS and isinstance(v, bool)}
+        rest = {k: v for k, v in filters.items() if k not in indexed}
+
+        rows = self.search_index.search(query, None if rest else limit, filters=indexed, fuzzy=fuzzy)
+        results = []
+        for row in rows.tolist():
+            item = self._item(row)
+            if all(getattr(item, k) == v for k, v in rest.items()):
+                results.append(item)
+                if len(results) >= limit:
+                    break
+        return results
+
+    @property
+    def search_index(self) -> ItemSearchIndex:
+        """Name / flag search index, built on first use."""
+        if self._search is None:
+            if self._index is not None:
+                flags = self._index.records['flags']
+                columns = {name: (flags >> bit & 1).astype(bool) for bit, name in enumerate(item_index.FLAG_FIELDS)}
             else:
-                return 2  # Contains - lowest priority
-        
-        results.sort(key=relevance_score)
-        
-        return results[:limit]
+                columns = {
+                    name: np.fromiter((bool(getattr(item, name)) for item in self._rows), dtype=bool, count=len(self._rows))
+                    for name in item_index.FLAG_FIELDS
+                }
+            self._search = ItemSearchIndex(self._names, columns)
+        return self._search
 
     def list_all_items(self) -> Dict[int, str]:
         """
         Returns a dictionary of all items with their IDs and names.
         """
-        return {item.id: item.name for item in self._items_by_id.values()}
+        return dict(zip(self._ids, self._names))
 
 
@@ -0,0 +1,268 @@
+"""
+Compiled on-disk item index.
+
+`ItemLookup` used to `json.load` the item and icon dumps and re-crop every
+icon at startup. The index is the result of that work written out once:
+
+    header   MAGIC, version, record count, metadata length
+    metadata JSON: fingerprint of the source files, blob lengths
+    records  fixed-size rows (numpy structured dtype RECORD), JSON order
+    names    UTF-8 names joined by newlines
+    icons    cropped PNGs back to back; rows hold (offset, length)
+
+The file is memory-mapped. Opening it only parses the header and the
+names, and icons are decoded on first use into a small LRU of RGBA
+images. Those images are shared, so treat them as immutable like any
+other template.
+
+Build (or rebuild) it with:
+
+    python -m core.item_index
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from core.logger import get_logger
+
+log = get_logger('ItemIndex')
+
+MAGIC = b'OSRSITEM'
+VERSION = 1
+HEADER = struct.Struct('<8sIII')
+
+ITEMS_JSON = 'data/items/items-cache-data.json'
+ICONS_JSON = 'data/items/icons-items-complete.json'
+ITEMS_INDEX = 'data/items/items.idx'
+
+FLAG_FIELDS = ('tradeable_on_ge', 'members', 'noted', 'noteable', 'placeholder', 'stackable', 'equipable')
+RECORD = np.dtype([
+    ('id', '<i4'),
+    ('flags', '<u2'),
+    ('cost', '<i4'),
+    ('lowalch', '<i4'),
+    ('highalch', '<i4'),
+    ('icon_off', '<u8'),
+    ('icon_len', '<u4'),
+])
+
+Fingerprint = Dict[str, Optional[List[int]]]
+
+
+def source_fingerprint(paths: Sequence[str]) -> Fingerprint:
+    """{path: [size, mtime_ns]} of each source file (None when missing)."""
+    fp: Fingerprint = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            fp[os.path.basename(path)] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            fp[os.path.basename(path)] = None
+    return fp
+
+
+def _align(n: int, to: int = 8) -> int:
+    return (n + to - 1) // to * to
+
+
+class IconCache:
+    """LRU of decoded icons keyed by row."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, row: int, load) -> Image.Image:
+        with self._lock:
+            img = self._entries.get(row)
+            if img is not None:
+                self._entries.move_to_end(row)
+                self.hits += 1
+                return img
+            self.misses += 1
+        img = load()
+        with self._lock:
+            self._entries[row] = img
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return img
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ItemIndex:
+    """Read-only view of a compiled index file."""
+
+    def __init__(self, path: str, icon_cache_size: int = 512):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count, meta_len = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'not an item index (v{VERSION}): {path}')
+            meta = json.loads(bytes(self._mm[HEADER.size:HEADER.size + meta_len]))
+            table = _align(HEADER.size + meta_len)
+            names = table + count * RECORD.itemsize
+            self._icons = names + meta['names_len']
+            if self._icons + meta['icons_len'] > len(self._mm):
+                raise ValueError(f'truncated item index: {path}')
+        except Exception:
+            self._mm.close()
+            raise
+        self.fingerprint: Fingerprint = meta['sources']
+        self.records = np.frombuffer(self._mm, dtype=RECORD, count=count, offset=table)
+        blob = bytes(self._mm[names:self._icons]).decode('utf-8')
+        self.names: List[str] = blob.split('\n') if count else []
+        self.icons = IconCache(icon_cache_size)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def is_fresh(self, sources: Fingerprint) -> bool:
+        """
+        True unless a source file exists and differs from the one the index
+        was built from (missing sources don't invalidate a shipped index).
+        """
+        return all(
+            fp is None or self.fingerprint.get(name) == fp
+            for name, fp in sources.items()
+        )
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.records['id']
+
+    def fields(self, row: int) -> Dict[str, object]:
+        """Item fields of a row (everything but the icon)."""
+        rec = self.records[row]
+        flags = int(rec['flags'])
+        fields = {
+            'id': int(rec['id']),
+            'name': self.names[row],
+            'cost': int(rec['cost']),
+            'lowalch': int(rec['lowalch']),
+            'highalch': int(rec['highalch']),
+        }
+        for bit, name in enumerate(FLAG_FIELDS):
+            fields[name] = bool(flags >> bit & 1)
+        return fields
+
+    def icon_png(self, row: int) -> Optional[bytes]:
+        """The stored (cropped) PNG of a row, or None."""
+        rec = self.records[row]
+        length = int(rec['icon_len'])
+        if not length:
+            return None
+        start = self._icons + int(rec['icon_off'])
+        return self._mm[start:start + length]
+
+    def icon(self, row: int) -> Optional[Image.Image]:
+        """Decoded RGBA icon of a row (cached)."""
+        png = self.icon_png(row)
+        if png is None:
+            return None
+
+        def load():
+            img = Image.open(BytesIO(png)).convert('RGBA')
+            img.load()
+            return img
+        return self.icons.get(row, load)
+
+    def close(self):
+        self.records = None
+        self.icons.clear()
+        self._mm.close()
+
+
+def open_index(path: str, sources: Fingerprint, icon_cache_size: int = 512) -> Optional[ItemIndex]:
+    """The index at `path` if it exists, is valid and matches `sources`; else None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        index = ItemIndex(path, icon_cache_size)
+    except Exception as e:
+        log.warning(f'Ignoring unreadable item index {path}: {e}')
+        return None
+    if not index.is_fresh(sources):
+        log.info(f'Item index {path} is stale, rebuilding from JSON')
+        index.close()
+        return None
+    return index
+
+
+def build_index(path: str, items: Iterable[Tuple[Dict[str, object], Optional[bytes]]], sources: Fingerprint):
+    """
+    Write an index from (fields, cropped PNG bytes or None) pairs, in order.
+    `fields` needs the Item attributes (id, name, flags, prices). The file
+    is written next to `path` and moved into place.
+    """
+    rows = []
+    names = []
+    icons = []
+    offset = 0
+    for fields, png in items:
+        flags = 0
+        for bit, name in enumerate(FLAG_FIELDS):
+            if fields[name]:
+                flags |= 1 << bit
+        length = len(png) if png else 0
+        rows.append((
+            fields['id'], flags, fields['cost'] or 0, fields['lowalch'] or 0, fields['highalch'] or 0,
+            offset if length else 0, length
+        ))
+        names.append(str(fields['name']).replace('\n', ' '))
+        if length:
+            icons.append(png)
+            offset += length
+
+    records = np.array(rows, dtype=RECORD)
+    names_blob = '\n'.join(names).encode('utf-8')
+    meta = json.dumps({
+        'sources': sources,
+        'names_len': len(names_blob),
+        'icons_len': offset,
+    }).encode('utf-8')
+    head = HEADER.pack(MAGIC, VERSION, len(records), len(meta)) + meta
+    head += b'\0' * (_align(len(head)) - len(head))
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.tmp{os.getpid()}'
+    with open(tmp, 'wb') as f:
+        f.write(head)
+        f.write(records.tobytes())
+        f.write(names_blob)
+        for png in icons:
+            f.write(png)
+    os.replace(tmp, path)
+    log.info(f'Wrote item index {path} ({len(records)} items, {offset / 1024:.0f} KiB of icons)')
+
+
+def main():
+    from core.item_db import ItemLookup
+    # a fresh instance, so the JSON files are read (and the index rewritten)
+    lookup = object.__new__(ItemLookup)
+    lookup.__init__(index_path=None)
+    lookup.compile_index(ITEMS_INDEX)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Search index over item names.
+
+`ItemLookup.search_items` ranks matches in three tiers (exact name, name
+starts with the query, name contains the query) and keeps database order
+inside a tier. `ItemSearchIndex` answers the same question without
+scanning every name:
+
+  * exact: a dict from normalised name to rows;
+  * prefix: the normalised names sorted once, bisected per query;
+  * contains: an inverted index from every 1-, 2- and 3-gram to the
+    sorted rows containing it. Longer queries intersect the postings of
+    their trigrams, starting with the shortest, and only the surviving
+    candidates are checked with `in`;
+  * fuzzy (optional fourth tier): rows sharing query trigrams, ranked by
+    trigram Jaccard similarity;
+  * filters: one boolean column per flag (members, stackable, ...), ANDed
+    into a row mask that is cached per filter combination.
+
+Everything works on sorted row arrays, so a query costs time in the
+number of matches, not in the number of items.
+"""
+from __future__ import annotations
+
+import bisect
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+GRAM = 3
+EMPTY = np.empty(0, dtype=np.int32)
+
+
+def normalize(text: str) -> str:
+    return text.lower()
+
+
+def _grams(text: str, n: int) -> Iterable[str]:
+    return (text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def _code(gram: str) -> int:
+    """Posting key of a gram: its codepoints packed in 21 bits each."""
+    code = 0
+    for ch in gram:
+        code = code << 21 | ord(ch)
+    return code
+
+
+class ItemSearchIndex:
+    """Tiered name search with boolean filters; results are row numbers."""
+
+    def __init__(self, names: Sequence[str], flags: Mapping[str, np.ndarray] = None):
+        """
+        Args:
+            names: Item names in row order.
+            flags: {field: bool array per row} usable as filters.
+        """
+        self.names = [normalize(n) for n in names]
+        n = len(self.names)
+
+        self._exact: Dict[str, List[int]] = {}
+        for row, name in enumerate(self.names):
+            self._exact.setdefault(name, []).append(row)
+
+        order = sorted(range(n), key=self.names.__getitem__)
+        self._sorted_names = [self.names[row] for row in order]
+        self._sorted_rows = np.array(order, dtype=np.int32)
+
+        # n-gram postings per gram size, built on codepoint arrays: gram -> sorted rows
+        self._postings: Dict[int, Dict[int, np.ndarray]] = {}
+        lengths = np.fromiter((len(name) for name in self.names), dtype=np.int64, count=n)
+        codes = np.frombuffer(''.join(self.names).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        row_of = np.repeat(np.arange(n, dtype=np.int32), lengths)
+        pos = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        trigrams = EMPTY
+        for size in range(1, GRAM + 1):
+            starts = np.flatnonzero(pos + size <= lengths[row_of]) if len(codes) else EMPTY
+            gram = np.zeros(len(starts), dtype=np.uint64)
+            for j in range(size):
+                gram = (gram << np.uint64(21)) | codes[starts + j]
+            rows = row_of[starts]
+            # rows are ascending already: a stable sort keeps them so per gram
+            order = np.argsort(gram, kind='stable')
+            gram, rows = gram[order], rows[order]
+            # one entry per (gram, row)
+            keep = np.ones(len(gram), dtype=bool)
+            keep[1:] = (gram[1:] != gram[:-1]) | (rows[1:] != rows[:-1])
+            gram, rows = gram[keep], rows[keep]
+            if size == GRAM:
+                trigrams = rows
+            bounds = np.flatnonzero(np.diff(gram)) + 1
+            keys = gram[np.concatenate(([0], bounds))].tolist() if len(gram) else []
+            self._postings[size] = dict(zip(keys, np.split(rows, bounds)))
+        self._trigram_counts = np.maximum(1, np.bincount(trigrams, minlength=n)).astype(np.float32)
+
+        self.flags = {k: np.asarray(v, dtype=bool) for k, v in (flags or {}).items()}
+        self._masks: Dict[tuple, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ---- tiers ----------------------------------------------------------
+    def exact(self, query: str) -> np.ndarray:
+        return np.array(self._exact.get(normalize(query), ()), dtype=np.int32)
+
+    def prefix(self, query: str) -> np.ndarray:
+        """Rows whose name starts with `query`, ascending."""
+        query = normalize(query)
+        lo = bisect.bisect_left(self._sorted_names, query)
+        hi = bisect.bisect_left(self._sorted_names, query + '\U0010ffff', lo)
+        return np.sort(self._sorted_rows[lo:hi])
+
+    def contains(self, query: str) -> np.ndarray:
+        """Rows whose name contains `query`, ascending."""
+        query = normalize(query)
+        if not query:
+            return np.arange(len(self.names), dtype=np.int32)
+        if len(query) <= GRAM:
+            return self._postings[len(query)].get(_code(query), EMPTY)
+        lists = []
+        for gram in set(_grams(query, GRAM)):
+            rows = self._postings[GRAM].get(_code(gram))
+            if rows is None:
+                return EMPTY
+            lists.append(rows)
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+            if not len(rows):
+                return EMPTY
+        names = self.names
+        return rows[np.fromiter((query in names[r] for r in rows.tolist()), dtype=bool, count=len(rows))]
+
+    def fuzzy(self, query: str, min_similarity: float = 0.3) -> np.ndarray:
+        """Rows sharing trigrams with `query`, most similar first (trigram Jaccard)."""
+        query_grams = {_code(g) for g in _grams(normalize(query), GRAM)}
+        postings = self._postings[GRAM]
+        grams = [g for g in query_grams if g in postings]
+        if not grams:
+            return EMPTY
+        hits = np.concatenate([postings[g] for g in grams])
+        rows, shared = np.unique(hits, return_counts=True)
+        total = len(query_grams)
+        similarity = shared / (total + self._trigram_counts[rows] - shared)
+        keep = similarity >= min_similarity
+        rows, similarity = rows[keep], similarity[keep]
+        return rows[np.lexsort((rows, -similarity))]
+
+    # ---- filters --------------------------------------------------------
+    def mask(self, filters: Mapping[str, bool] = None) -> Optional[np.ndarray]:
+        """Row mask of the flag filters (None when there are none)."""
+        key = tuple(sorted((k, bool(v)) for k, v in (filters or {}).items() if k in self.flags))
+        if not key:
+            return None
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = np.ones(len(self.names), dtype=bool)
+            for name, value in key:
+                mask &= self.flags[name] if value else ~self.flags[name]
+            if len(self._masks) > 64:
+                self._masks.clear()
+            self._masks[key] = mask
+        return mask
+
+    # ---- combined -------------------------------------------------------
+    def search(
+            self,
+            query: str,
+            limit: Optional[int] = 50,
+            filters: Mapping[str, bool] = None,
+            fuzzy: bool = False
+        ) -> np.ndarray:
+        """
+        Rows matching `query`: exact names, then prefixes, then substrings
+        (each in row order), then fuzzy matches if asked for. Flag filters
+        are applied before the limit.
+        """
+        query = normalize(query.strip())
+        if not query:
+            return EMPTY
+        mask = self.mask(filters)
+        tiers = (self.exact, self.prefix, self.contains) + ((self.fuzzy,) if fuzzy else ())
+
+        found: List[np.ndarray] = []
+        seen = np.zeros(len(self.names), dtype=bool)
+        count = 0
+        for tier in tiers:
+            rows = tier(query)
+            if mask is not None:
+                rows = rows[mask[rows]]
+            rows = rows[~seen[rows]]
+            if limit is not None:
+                rows = rows[:limit - count]
+            seen[rows] = True
+            found.append(rows)
+            count += len(rows)
+            if limit is not None and count >= limit:
+                break
+        return np.concatenate(found) if found else EMPTY
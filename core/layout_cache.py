@@ -0,0 +1,227 @@
+"""
+Persisted UI layout of the RuneLite window.
+
+Calibrating the client (UI type detection, then full-window matches for
+the minimap, every toolplane tab at 0.9-1.1 scale, the toolplane and the
+chat corners) takes seconds, yet its result only depends on the window
+size, the UI type and the templates used. `LayoutCache` stores the raw
+anchor matches of each UI context under
+
+    (window size, UI type, fingerprint of the anchor templates)
+
+in a small JSON file. A stored layout is never trusted blindly:
+`verify_layout` re-matches anchors inside a few pixels around their
+recorded spot, at their recorded scale, and only accepts the layout when
+each one is found at the same place above an absolute confidence. Only
+anchors that look the same in every UI state are checked (toolplane tabs
+change when selected or hovered); the others move with them. Anything
+else (moved panels, a different skin, plugins drawing over the UI) means
+a full recalibration, whose result replaces the entry.
+
+Layouts are nested dicts: {context: {asset name: MatchResult}}.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from PIL import Image
+
+from core.frame import Frame
+from core.logger import get_logger
+from core.region_match import MatchResult
+from core.template_cache import template_cache
+from core.tools import find_subimage
+
+log = get_logger('LayoutCache')
+
+LAYOUT_CACHE_PATH = 'data/layout_cache.json'
+# bump when the meaning of stored anchors changes
+LAYOUT_VERSION = 1
+
+Layout = Dict[str, Dict[str, MatchResult]]
+
+
+def layout_fingerprint(templates: Iterable[Image.Image]) -> str:
+    """Digest over the anchor templates (and the cache format)."""
+    h = hashlib.blake2b(str(LAYOUT_VERSION).encode('ascii'), digest_size=12)
+    for template in templates:
+        h.update(template_cache().get(template).digest.encode('ascii'))
+    return h.hexdigest()
+
+
+def _dump(match: MatchResult) -> list:
+    return [
+        int(match.start_x), int(match.start_y), int(match.end_x), int(match.end_y),
+        float(match.confidence), float(match.scale), int(match.shape)
+    ]
+
+
+def _load(values: list) -> MatchResult:
+    sx, sy, ex, ey, confidence, scale, shape = values
+    return MatchResult(sx, sy, ex, ey, confidence=confidence, scale=scale, shape=shape)
+
+
+def verify_anchor(
+        frame: Image.Image | Frame,
+        template: Image.Image,
+        match: MatchResult,
+        pad: int = 4,
+        min_confidence: float = 0.8,
+        max_shift: int = 1,
+        tolerance: Optional[float] = None
+    ) -> bool:
+    """
+    True when `template` is still at `match` in `frame`: searched in the
+    match box grown by `pad` px, at the recorded scale, it has to land
+    within `max_shift` px of the recorded spot with at least
+    `min_confidence`. With `tolerance`, it also may not score more than
+    that below the recorded confidence (for anchors whose look is fixed).
+    """
+    w, h = frame.size
+    roi = MatchResult(
+        max(0, match.start_x - pad), max(0, match.start_y - pad),
+        min(w, match.end_x + pad), min(h, match.end_y + pad)
+    )
+    try:
+        found = find_subimage(
+            roi.crop_in(frame), template,
+            min_scale=match.scale, max_scale=match.scale
+        )
+    except ValueError:
+        # window shrank below the recorded spot
+        return False
+    found = found.transform(roi.start_x, roi.start_y)
+    if tolerance is not None:
+        min_confidence = max(min_confidence, match.confidence - tolerance)
+    return (
+        abs(found.start_x - match.start_x) <= max_shift
+        and abs(found.start_y - match.start_y) <= max_shift
+        and found.confidence >= min_confidence
+    )
+
+
+def verify_layout(
+        frame: Image.Image | Frame,
+        layout: Layout,
+        template_for: Callable[[str], Image.Image],
+        contexts: Optional[Iterable[str]] = None,
+        **kw
+    ) -> bool:
+    """
+    `verify_anchor` over the anchors of `layout` (only those of `contexts`
+    when given); stops at the first miss.
+    """
+    for context, anchors in layout.items():
+        if contexts is not None and context not in contexts:
+            continue
+        for name, match in anchors.items():
+            if not verify_anchor(frame, template_for(name), match, **kw):
+                log.debug(f'Layout anchor {context}/{name} moved, recalibrating')
+                return False
+    return True
+
+
+class LayoutCache:
+    """Anchor matches per (window size, UI type, fingerprint), kept on disk."""
+
+    def __init__(self, path: Optional[str] = LAYOUT_CACHE_PATH, max_entries: int = 32):
+        """
+        Args:
+            path: JSON file the layouts live in (None keeps them in memory).
+            max_entries: Layouts kept; the least recently stored go first.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(size: Tuple[int, int], ui_type: str, fingerprint: str) -> str:
+        return f'{size[0]}x{size[1]}/{ui_type}/{fingerprint}'
+
+    def _load_entries(self) -> Dict[str, dict]:
+        if self._entries is None:
+            entries = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        entries = json.load(f)
+                except (OSError, ValueError) as e:
+                    log.warning(f'Ignoring unreadable layout cache {self.path}: {e}')
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def get(self, size: Tuple[int, int], ui_type: str, fingerprint: str) -> Optional[Layout]:
+        """The stored (unverified) layout, or None."""
+        with self._lock:
+            entry = self._load_entries().get(self.key(size, ui_type, fingerprint))
+        if entry is None:
+            self.misses += 1
+            return None
+        try:
+            layout = {
+                context: {name: _load(values) for name, values in anchors.items()}
+                for context, anchors in entry.items()
+            }
+        except (TypeError, ValueError) as e:
+            log.warning(f'Dropping malformed layout entry: {e}')
+            self.forget(size, ui_type, fingerprint)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return layout
+
+    def put(self, size: Tuple[int, int], ui_type: str, fingerprint: str, layout: Layout):
+        """Store `layout` and write the cache file."""
+        entry = {
+            context: {name: _dump(match) for name, match in anchors.items()}
+            for context, anchors in layout.items()
+        }
+        with self._lock:
+            entries = self._load_entries()
+            key = self.key(size, ui_type, fingerprint)
+            entries.pop(key, None)
+            entries[key] = entry
+            while len(entries) > self.max_entries:
+                entries.pop(next(iter(entries)))
+            self._save()
+
+    def forget(self, size: Tuple[int, int], ui_type: str, fingerprint: str):
+        with self._lock:
+            if self._load_entries().pop(self.key(size, ui_type, fingerprint), None) is not None:
+                self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp = f'{self.path}.tmp{os.getpid()}'
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log.warning(f'Could not write layout cache {self.path}: {e}')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_entries())
+
+
+_default_cache = LayoutCache()
+
+
+def layout_cache() -> LayoutCache:
+    """The shared layout cache (data/layout_cache.json)."""
+    return _default_cache
@@ -2,7 +2,6 @@ from PIL import Image
 from core.bot import Bot
 from bots.core.cfg_types import RGBParam
 from core.logger import get_logger
-from pathlib import Path
 from enum import Enum
 from core import tools
 from typing import List, Tuple
@@ -11,20 +10,19 @@ import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 from core.region_match import MatchResult, MatchShape
+from core.assets import assets
 import cv2
 import numpy as np
-import pyautogui
 
 MOX = (3, 169, 244)
 AGA = (0, 230, 118)
 LYE = (233, 30, 99)
 
-IMG_PATH = "data/ui/mastering_mixology"
-HEADER = Image.open(f"{IMG_PATH}/orders_header.png")
-AGITATOR = Image.open(f"{IMG_PATH}/actions/agitator_raw.png")
-ALEMBIC = Image.open(f"{IMG_PATH}/actions/alembic_raw.png")
-RETORT = Image.open(f"{IMG_PATH}/actions/retort_raw.png")
-ORDER_DONE = Image.open(f"{IMG_PATH}/order_done.png")
+HEADER = assets().image('mastering_mixology/orders_header')
+AGITATOR = assets().image('mastering_mixology/actions/agitator_raw')
+ALEMBIC = assets().image('mastering_mixology/actions/alembic_raw')
+RETORT = assets().image('mastering_mixology/actions/retort_raw')
+ORDER_DONE = assets().image('mastering_mixology/order_done')
 
 POTS_UNFISHISHED = {
     'aaa': 30014,  # Aerial ale
@@ -129,12 +127,9 @@ class MasteringMixology():
     
     
     def get_potions(self):
-        pot_path = Path(f"{IMG_PATH}/pots")
         potions = {}
-        for pot_file in pot_path.glob("*.png"):
-            pot_name = pot_file.stem
-            potion_image = Image.open(pot_file)
-            potions[pot_name] = potion_image
+        for name in assets().names('mastering_mixology/pots/'):
+            potions[name.rsplit('/', 1)[-1]] = assets().image(name)
         return potions
     
     def fill_potion(self, potion_name: str, _retry: int = 4):
@@ -524,9 +519,9 @@ class MasteringMixology():
                         click_cnt = 2 if order.action == Action.AGITATOR else 1
 
                         for _ in range(click_cnt):
-                            # using pyautogui to go as fast as possible
+                            # straight to the backend to go as fast as possible
                             duration = random.uniform(0.03, 0.1)
-                            pyautogui.click(duration=duration)
+                            self.bot.client.input.click(duration=duration)
                             time.sleep(random.uniform(0.3, 0.6))
                         time.sleep(1)
 
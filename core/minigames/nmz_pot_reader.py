@@ -14,6 +14,7 @@ import numpy as np
 from PIL import Image, ImageOps
 
 from core import tools
+from core.assets import assets
 
 import core.ocr.custom as ocr
 
@@ -68,7 +69,7 @@ def absorption_value(sc: Image.Image) -> str:
     Raises a ValueError if *nothing* is read.
     """
 
-    abs_img = Image.open('data/ui/nmz_abs.png')
+    abs_img = assets().image('nmz_abs')
 
     match = tools.find_subimage(
         sc, abs_img, min_scale=0.9, max_scale=1.1
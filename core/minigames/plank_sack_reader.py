@@ -13,6 +13,7 @@ from typing  import Union
 from PIL import Image
 
 from core import tools
+from core.assets import assets
 
 import core.ocr.custom as ocr
 
@@ -34,7 +35,7 @@ def read_stack(path_or_img: Union[str, Path, Image.Image]) -> str:
 
 
 def get_sack_img(sc: Image.Image) -> Image.Image:
-    abs_img = Image.open('data/ui/plank-sack-state.png')
+    abs_img = assets().image('plank-sack-state')
 
     match = tools.find_subimage(
         sc, abs_img, min_scale=0.9, max_scale=1.1
@@ -0,0 +1,102 @@
+"""
+Movement detection from consecutive frames.
+
+While the player walks the minimap scrolls under the fixed player arrow, so
+comparing the minimap region of two recent frames tells whether we are
+moving without reading the position overlay at all:
+
+  * a cheap pixel delta rejects identical regions right away;
+  * otherwise `cv2.phaseCorrelate` measures how far the terrain shifted,
+    which ignores the few pixels of NPC / player dots moving on their own.
+
+`MotionDetector.poll` samples the region until it either sees the terrain
+move (moving) or it has stayed put for a whole settle window (stopped).
+Camera rotation also changes the minimap and reads as movement.
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class MotionDetector:
+    """Moving / stopped verdicts from samples of one screen region."""
+
+    def __init__(
+            self,
+            settle_ms: float = 600,
+            interval_ms: float = 40,
+            pixel_delta: int = 24,
+            min_changed: float = 0.002,
+            min_shift: float = 0.5,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep
+        ):
+        """
+        Args:
+            settle_ms: How long the region must stay still to count as stopped
+                (one game tick by default).
+            interval_ms: Delay between samples while polling.
+            pixel_delta: Per-pixel gray difference that counts as a change.
+            min_changed: Fraction of changed pixels below which two samples
+                are considered identical.
+            min_shift: Terrain shift in pixels that counts as movement.
+        """
+        self.settle_ms = settle_ms
+        self.interval_ms = interval_ms
+        self.pixel_delta = pixel_delta
+        self.min_changed = min_changed
+        self.min_shift = min_shift
+        self._clock = clock
+        self._sleep = sleep
+        self._window: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _gray(region: np.ndarray) -> np.ndarray:
+        if region.ndim == 3:
+            region = cv2.cvtColor(np.ascontiguousarray(region[:, :, :3]), cv2.COLOR_BGR2GRAY)
+        return region
+
+    def shift(self, a: np.ndarray, b: np.ndarray) -> Tuple[float, float]:
+        """Translation (dx, dy) in pixels from `a` to `b`."""
+        a = self._gray(a).astype(np.float32)
+        b = self._gray(b).astype(np.float32)
+        if self._window is None or self._window.shape != a.shape[::-1]:
+            self._window = cv2.createHanningWindow(a.shape[::-1], cv2.CV_32F)
+        (dx, dy), _ = cv2.phaseCorrelate(a, b, self._window)
+        return dx, dy
+
+    def moved(self, a: np.ndarray, b: np.ndarray) -> bool:
+        """True when the content of `b` is shifted relative to `a`."""
+        if a.shape != b.shape:
+            return True
+        diff = cv2.absdiff(self._gray(a), self._gray(b))
+        if np.count_nonzero(diff > self.pixel_delta) < self.min_changed * diff.size:
+            return False
+        dx, dy = self.shift(a, b)
+        return float(np.hypot(dx, dy)) >= self.min_shift
+
+    def poll(self, sample: Callable[[], np.ndarray], settle_ms: float = None) -> bool:
+        """
+        Sample the region until a verdict: True as soon as it moves relative
+        to the first sample, False once it stayed still for `settle_ms`.
+        """
+        settle = (self.settle_ms if settle_ms is None else settle_ms) / 1000.0
+        ref = sample()
+        start = self._clock()
+        while self._clock() - start < settle:
+            self._sleep(self.interval_ms / 1000.0)
+            if self.moved(ref, sample()):
+                return True
+        return False
+
+    def wait_until_stopped(self, sample: Callable[[], np.ndarray], timeout: float = 30.0) -> bool:
+        """Poll until the region settles; False if it still moves after `timeout` seconds."""
+        deadline = self._clock() + timeout
+        while self._clock() < deadline:
+            if not self.poll(sample):
+                return True
+        return False
@@ -3,7 +3,6 @@ from bots.core.cfg_types import WaypointParam, RouteParam, RGBParam
 from core.region_match import MatchResult, MatchShape
 from core.logger import get_logger
 import random
-import pyautogui
 import time
 from core import tools
 import math
@@ -11,6 +10,10 @@ import json
 import pyperclip
 from typing import List, Dict, Set
 import itertools
+from core.position_tracker import GAME_TICK_S, PositionTracker
+
+# A tracked position at most this old (seconds) is used without reading the overlay
+POSITION_MAX_AGE = GAME_TICK_S + 0.1
 
 GOOD_TILE_COLORS = [
     RGBParam(200, 67, 0),
@@ -39,6 +42,18 @@ class MovementOrchestrator:
         self.get_minimap_sectors()
         self._zoom_level = 0
 
+    @property
+    def tracker(self) -> PositionTracker[PlayerPosition]:
+        """
+        The client's position tracker, started on the first position read so
+        bots that never move don't sample the overlay in the background.
+        """
+        return self.client.start_position_tracker()
+
+    def close(self):
+        """Stop the position tracker, if a position read started it."""
+        self.client.stop_position_tracker()
+
     def get_minimap_sectors(self):
         m = self.minimap
         self.north = MatchResult(
@@ -111,8 +126,8 @@ class MovementOrchestrator:
                 raise ValueError("Player position is not stable, retrying...")
             return p1
             
-
-        return self.client.get_position()
+        position = self.tracker.position(max_age=POSITION_MAX_AGE)
+        return position if position is not None else self.client.get_position()
 
     def debug_minimap_sectors(self):
         """
@@ -137,7 +152,7 @@ class MovementOrchestrator:
         def do_zoom(i):
             amount = -(i * 600)
             
-            pyautogui.scroll(amount, x,y)
+            self.client.input.scroll(amount, x, y)
 
         if not self._zoom_level:
             do_zoom(-5) # reset zoom to minimum
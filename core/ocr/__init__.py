@@ -1,2 +1,3 @@
 from .tess import get_number, execute, OcrError,find_string_bounds
-from .enums import FontChoice, TessPsm, TessOem
\ No newline at end of file
+from .enums import FontChoice, TessPsm, TessOem, OcrBackend
+from .cache import ocr_cache, OcrCache
@@ -0,0 +1,107 @@
+"""
+Content-addressed cache of OCR results.
+
+The same pixels get read over and over: minimap orbs rarely change, the
+position overlay repeats while the player stands still and the hover text
+of a tree is identical every loop. `OcrCache` maps a digest of the image
+handed to the OCR (already colour-masked / binarised by the caller) plus the
+reader settings to the text that was read, so a repeat read never reaches
+Tesseract.
+
+Reads are deterministic for identical input, so entries never go stale;
+the cache is only bounded (LRU).
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+OcrKey = Tuple[str, Hashable]
+
+
+class OcrCache:
+    """Bounded LRU of OCR results, keyed by image content and read settings."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[OcrKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(img: Image.Image | np.ndarray) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        if isinstance(img, Image.Image):
+            h.update(f"{img.mode}:{img.size}".encode())
+            h.update(img.tobytes())
+        else:
+            arr = np.ascontiguousarray(img)
+            h.update(f"{arr.dtype}:{arr.shape}".encode())
+            h.update(arr.tobytes())
+        return h.hexdigest()
+
+    def peek(self, img: Image.Image | np.ndarray, settings: Hashable) -> Optional[str]:
+        """Cached text for `img` read with `settings`, or None (counted as a miss)."""
+        key = (self.digest(img), settings)
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, img: Image.Image | np.ndarray, settings: Hashable, text: str):
+        key = (self.digest(img), settings)
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_read(self, img: Image.Image | np.ndarray, settings: Hashable, read: Callable[[], str]) -> str:
+        """
+        Cached text for `img` read with `settings`; calls `read()` on a miss.
+        Exceptions from `read` are not cached.
+        """
+        text = self.peek(img, settings)
+        if text is None:
+            text = read()
+            self.put(img, settings, text)
+        return text
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache = OcrCache()
+
+
+def ocr_cache() -> OcrCache:
+    """The shared process-wide OcrCache."""
+    return _default_cache
@@ -4,130 +4,137 @@ import cv2
 import numpy as np
 from PIL import Image
 from data.fonts.location_numbers import digit_templates
-from core.tools import find_subimages, find_subimage
 from typing import Dict, List, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
 from core.region_match import MatchResult
+from core.ocr.cache import ocr_cache
 
-# Cache for digit templates to avoid reloading
-_DIGIT_TEMPLATE_CACHE = None
+# A digit template must score at least this (TM_CCORR_NORMED) to count
+DIGIT_THRESHOLD = 0.98
+# A hit is dropped when more than this share of its box is already covered
+DIGIT_MAX_OVERLAP = 0.25
 
-def _load_digit_templates() -> Dict[str, Image.Image]:
-    """Load digit templates from base64 encodings (cached)."""
-    global _DIGIT_TEMPLATE_CACHE
-    
-    if _DIGIT_TEMPLATE_CACHE is None:
-        _DIGIT_TEMPLATE_CACHE = {}
-        for digit, b64_data in digit_templates.items():
+
+class DigitReader:
+    """
+    Template reader for the position overlay digits.
+
+    The templates are decoded once and grouped by size; a read scores each
+    group with one matrix product over the sliding windows of a single
+    grayscale array (normalised cross-correlation, as TM_CCORR_NORMED),
+    followed by a vectorised greedy overlap suppression.
+    """
+
+    def __init__(self, templates: Dict[str, str] = digit_templates):
+        self.chars: List[str] = []
+        by_shape: Dict[Tuple[int, int], List[np.ndarray]] = {}
+        index: Dict[Tuple[int, int], List[int]] = {}
+        for char, b64_data in templates.items():
             try:
-                # Decode base64 to binary data
-                image_bytes = base64.b64decode(b64_data)
-                # Create an in-memory file-like object
-                image_file = io.BytesIO(image_bytes)
-                # Open and fully load the image immediately
-                template = Image.open(image_file)
-                template.load()  # Ensure image is fully loaded
-                # Store the template in cache
-                _DIGIT_TEMPLATE_CACHE[digit] = template
+                img = Image.open(io.BytesIO(base64.b64decode(b64_data)))
+                tpl = np.array(img.convert('L'), dtype=np.float32)
             except Exception as e:
-                print(f"Error loading template for digit '{digit}': {e}")
+                print(f"Error loading template for digit '{char}': {e}")
+                continue
+            by_shape.setdefault(tpl.shape, []).append(tpl.ravel())
+            index.setdefault(tpl.shape, []).append(len(self.chars))
+            self.chars.append(char)
+        # shape -> (char indices, templates as columns, template norms)
+        self.groups = [
+            (shape, np.array(index[shape]), np.stack(tpls, axis=1), np.linalg.norm(np.stack(tpls), axis=1))
+            for shape, tpls in by_shape.items()
+        ]
+
+    @staticmethod
+    def gray(image: Image.Image | np.ndarray) -> np.ndarray:
+        if isinstance(image, Image.Image):
+            return np.asarray(image.convert('L'))
+        arr = np.asarray(image)
+        if arr.ndim == 3:
+            arr = cv2.cvtColor(np.ascontiguousarray(arr[:, :, :3]), cv2.COLOR_RGB2GRAY)
+        return arr
+
+    def _hits(self, gray: np.ndarray):
+        """(x, y, w, h, confidence, char index) of every window scoring above threshold."""
+        img = gray.astype(np.float32)
+        hits = []
+        for (h, w), chars, tpls, norms in self.groups:
+            if h > img.shape[0] or w > img.shape[1]:
                 continue
-    
-    return _DIGIT_TEMPLATE_CACHE
-
-def _match_digit(parent: Image.Image, template: Image.Image, digit: str) -> List[Tuple[str, MatchResult]]:
-    """Match a single digit template against an image, with error handling."""
-    matches = []
-    try:
-        # Manual template matching to avoid the PIL assertion error
-        parent_np = np.array(parent.convert('L'))
-        template_np = np.array(template.convert('L'))
-        
-        # Get template dimensions
-        h, w = template_np.shape
-        
-        # Ensure template fits in parent
-        if h > parent_np.shape[0] or w > parent_np.shape[1]:
-            return []
-            
-        # Perform template matching using OpenCV directly
-        result = cv2.matchTemplate(parent_np, template_np, cv2.TM_CCORR_NORMED)
-        
-        # Find all matches above threshold
-        threshold = 0.98
-        locations = np.where(result >= threshold)
-        
-        for pt in zip(*locations[::-1]):  # Switch columns and rows
-            match_result = MatchResult(
-                start_x=pt[0],
-                start_y=pt[1],
-                end_x=pt[0] + w,
-                end_y=pt[1] + h,
-                confidence=result[pt[1], pt[0]],
-                scale=1.0
-            )
-            matches.append((digit, match_result))
-            
-    except Exception as e:
-        print(f"Error matching digit '{digit}': {e}")
-        
-    return matches
-
-def read_location_numbers(image: Image.Image) -> str:
+            windows = sliding_window_view(img, (h, w))
+            cols = windows.shape[1]
+            windows = windows.reshape(-1, h * w)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                score = (windows @ tpls) / np.outer(np.linalg.norm(windows, axis=1), norms)
+            pos, k = np.nonzero(score >= DIGIT_THRESHOLD)  # NaN (blank window) never passes
+            y, x = np.divmod(pos, cols)
+            hits.append((x, y, np.full(len(x), w), np.full(len(x), h), score[pos, k], chars[k]))
+        return [np.concatenate(col) for col in zip(*hits)] if hits else None
+
+    def read(self, gray: np.ndarray) -> str:
+        """Digits in a uint8 grayscale array, left to right."""
+        hits = self._hits(gray)
+        if hits is None:
+            return ""
+        x1, y1, w, h, conf, char = hits
+        x2, y2 = x1 + w, y1 + h
+        # covered[j, i]: hit i hides more than the allowed share of hit j
+        iw = np.clip(np.minimum(x2[:, None], x2) - np.maximum(x1[:, None], x1), 0, None)
+        ih = np.clip(np.minimum(y2[:, None], y2) - np.maximum(y1[:, None], y1), 0, None)
+        covered = iw * ih > DIGIT_MAX_OVERLAP * (w * h)[:, None]
+
+        # greedy by descending confidence
+        alive = np.ones(len(conf), dtype=bool)
+        kept = []
+        for i in np.argsort(-conf, kind='stable'):
+            if alive[i]:
+                kept.append(i)
+                alive &= ~covered[:, i]
+
+        kept.sort(key=lambda i: x1[i])
+        return ''.join(self.chars[char[i]] for i in kept)
+
+
+_reader = None
+
+
+def digit_reader() -> DigitReader:
+    """Shared reader, built on first use."""
+    global _reader
+    if _reader is None:
+        _reader = DigitReader()
+    return _reader
+
+
+def read_location_numbers(image: Image.Image | np.ndarray) -> str:
     """
     Extract numerical text from images like coordinate displays.
     Uses predefined digit templates for matching.
-    
+
     Args:
-        image: PIL Image containing numerical text
-        
+        image: PIL Image (or uint8 array) containing numerical text
+
     Returns:
         Recognized text as a string
     """
-    templates = _load_digit_templates()
-    if not templates:
-        return ""
-    
-    # Convert image to grayscale to improve matching
-    image = image.convert('L').convert('RGB')
-    
-    # Find matches for all digits - use a static copy of the templates to prevent dictionary changes during iteration
-    all_matches = []
-    template_items = list(templates.items())  # Create a static copy of items
-    
-    for digit, template in template_items:
-        if template is not None:  # Additional safety check
-            matches = _match_digit(image, template, digit)
-            all_matches.extend(matches)
-    
-    # Filter out overlapping matches by keeping highest confidence
-    all_matches.sort(key=lambda x: x[1].confidence, reverse=True)
-    kept_matches = []
-    
-    for digit, match in all_matches:
-        should_keep = True
-        for _, kept_match in kept_matches:
-            # Check for significant overlap
-            overlap_x = max(0, min(match.end_x, kept_match.end_x) - 
-                           max(match.start_x, kept_match.start_x))
-            overlap_y = max(0, min(match.end_y, kept_match.end_y) - 
-                           max(match.start_y, kept_match.start_y))
-            
-            if overlap_x > 0 and overlap_y > 0:
-                match_width = match.end_x - match.start_x
-                match_height = match.end_y - match.start_y
-                overlap_area = overlap_x * overlap_y
-                match_area = match_width * match_height
-                
-                if overlap_area / match_area > 0.25:  # 25% overlap threshold
-                    should_keep = False
-                    break
-        
-        if should_keep:
-            kept_matches.append((digit, match))
-    
-    # Sort by x-coordinate to get correct reading order
-    kept_matches.sort(key=lambda x: x[1].start_x)
-    
-    # Build final result string
-    result = ''.join(digit for digit, _ in kept_matches)
-    return result
+    gray = DigitReader.gray(image)
+    return ocr_cache().get_or_read(gray, 'location_numbers', lambda: digit_reader().read(gray))
+
+
+def read_location_strips(
+        image: Image.Image | np.ndarray,
+        strips: Dict[str, MatchResult]
+    ) -> Dict[str, str]:
+    """
+    Read several strips of one image (e.g. the tile / chunk / region rows of
+    the position overlay) with a single grayscale conversion.
+    Returns {name: text}.
+    """
+    gray = DigitReader.gray(image)
+    reader = digit_reader()
+    texts = {}
+    for name, strip in strips.items():
+        x1, y1, x2, y2 = strip.bounding_box
+        crop = gray[max(0, y1):y2, max(0, x1):x2]
+        texts[name] = ocr_cache().get_or_read(crop, 'location_numbers', lambda crop=crop: reader.read(crop))
+    return texts
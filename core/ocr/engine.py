@@ -0,0 +1,257 @@
+"""
+Resident Tesseract engines.
+
+`pytesseract` shells out for every read: it writes a temp image, starts the
+`tesseract` binary, loads the traineddata for the requested language and
+parses stdout. When the optional `tesserocr` binding is installed this
+module keeps initialised `PyTessBaseAPI` instances alive instead, pooled per
+(lang, psm, oem), so a read is just SetImage + Recognize. tesserocr releases
+the GIL while recognising, so pooled engines also run in parallel.
+
+Without tesserocr every call falls back to pytesseract with the same
+arguments, so callers don't need to care which one is active.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterator, List, Optional
+
+import numpy as np
+import pytesseract
+from PIL import Image
+
+try:
+    import tesserocr
+    HAVE_TESSEROCR = True
+except ImportError:
+    tesserocr = None
+    HAVE_TESSEROCR = False
+
+# created on first use: core.logger starts its WebSocket server on import,
+# which plain `from core import ocr` users (tests, item db, web UI) don't want
+_log = None
+_fallback_noted = False
+
+
+def _logger():
+    global _log
+    if _log is None:
+        from core.logger import get_logger
+        _log = get_logger('TessEngine')
+    return _log
+
+
+def _note_fallback():
+    global _fallback_noted
+    if not _fallback_noted:
+        _fallback_noted = True
+        _logger().info('tesserocr not found, falling back to pytesseract (one process per read)')
+
+# a read taking longer than this is abandoned with a RuntimeError, so a stuck
+# engine can't hold a caller (or a worker thread) indefinitely
+READ_TIMEOUT_S = 5
+
+TSV_COLUMNS = (
+    'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+    'left', 'top', 'width', 'height', 'conf', 'text'
+)
+
+
+class EnginePool:
+    """
+    Bounded pool of reusable engines per key.
+
+    Engines are created lazily by `factory(key)` and handed out exclusively;
+    at most `max_per_key` exist per key and further callers wait for one to
+    be released. After `close()` the pool hands out nothing: waiting and new
+    callers get a RuntimeError, and engines still in use are ended when they
+    are released.
+    """
+
+    def __init__(
+            self,
+            factory: Callable[[Hashable], object],
+            max_per_key: int = 2,
+            close: Callable[[object], None] = None
+        ):
+        self.factory = factory
+        self.max_per_key = max_per_key
+        self._close = close
+        self._idle: Dict[Hashable, queue.LifoQueue] = {}
+        self._created: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def acquire(self, key: Hashable) -> Iterator[object]:
+        engine = self._take(key)
+        try:
+            yield engine
+        finally:
+            self._release(key, engine)
+
+    def _release(self, key: Hashable, engine):
+        with self._lock:
+            if not self._closed:
+                self._idle.setdefault(key, queue.LifoQueue()).put(engine)
+                return
+            self._created[key] -= 1
+        if self._close:
+            self._close(engine)
+
+    def _take(self, key: Hashable):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('engine pool is closed')
+            idle = self._idle.setdefault(key, queue.LifoQueue())
+            try:
+                return idle.get_nowait()
+            except queue.Empty:
+                pass
+            create = self._created.get(key, 0) < self.max_per_key
+            if create:
+                self._created[key] = self._created.get(key, 0) + 1
+        if not create:
+            engine = idle.get()
+            if engine is _CLOSED:
+                # wake the next waiter too
+                idle.put(_CLOSED)
+                raise RuntimeError('engine pool is closed')
+            return engine
+        try:
+            return self.factory(key)
+        except Exception:
+            with self._lock:
+                self._created[key] -= 1
+            raise
+
+    def created(self, key: Hashable) -> int:
+        return self._created.get(key, 0)
+
+    def close(self):
+        """End every idle engine; engines in use are ended when released."""
+        idle_engines = []
+        with self._lock:
+            self._closed = True
+            for key, idle in self._idle.items():
+                while True:
+                    try:
+                        engine = idle.get_nowait()
+                    except queue.Empty:
+                        break
+                    if engine is not _CLOSED:
+                        idle_engines.append(engine)
+                        self._created[key] -= 1
+                idle.put(_CLOSED)
+        if self._close:
+            for engine in idle_engines:
+                self._close(engine)
+
+
+# queued by close() to wake callers waiting for an engine
+_CLOSED = object()
+
+
+def _tessdata() -> str:
+    return os.environ.get('TESSDATA_PREFIX') or os.path.abspath('./data/fonts')
+
+
+def _new_api(key):
+    lang, psm, oem = key
+    _logger().debug(f'Starting tesseract engine lang={lang} psm={psm} oem={oem}')
+    return tesserocr.PyTessBaseAPI(path=_tessdata(), lang=lang, psm=psm, oem=oem)
+
+
+_pool = EnginePool(_new_api, max_per_key=max(1, min(4, os.cpu_count() or 1)), close=lambda api: api.End())
+atexit.register(_pool.close)
+
+
+def engine_pool() -> EnginePool:
+    return _pool
+
+
+def _as_pil(img: Image.Image | np.ndarray) -> Image.Image:
+    return img if isinstance(img, Image.Image) else Image.fromarray(np.asarray(img))
+
+
+def _recognize(api):
+    """Recognize the set image within READ_TIMEOUT_S (like pytesseract's timeout)."""
+    if not api.Recognize(timeout=int(READ_TIMEOUT_S * 1000)):
+        raise RuntimeError('Tesseract read timed out')
+
+
+def image_to_string(
+        img: Image.Image | np.ndarray,
+        lang: str,
+        psm: int,
+        oem: int,
+        whitelist: Optional[str] = None
+    ) -> str:
+    """Text in `img`, read by a pooled engine (or pytesseract)."""
+    if not HAVE_TESSEROCR:
+        _note_fallback()
+        config = f'--oem {oem} --psm {psm}'
+        if whitelist is not None:
+            config += f' -c tessedit_char_whitelist={whitelist}'
+        return pytesseract.image_to_string(img, lang=lang, config=config, timeout=READ_TIMEOUT_S)
+
+    with _pool.acquire((lang, psm, oem)) as api:
+        api.SetVariable('tessedit_char_whitelist', whitelist or '')
+        try:
+            api.SetImage(_as_pil(img))
+            _recognize(api)
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+
+def parse_tsv(tsv: str) -> Dict[str, List]:
+    """Tesseract TSV rows (no header) in `pytesseract.Output.DICT` layout."""
+    data: Dict[str, List] = {col: [] for col in TSV_COLUMNS}
+    for row in tsv.splitlines():
+        fields = row.split('\t')
+        if len(fields) < len(TSV_COLUMNS) - 1:
+            continue
+        fields += [''] * (len(TSV_COLUMNS) - len(fields))
+        for col, value in zip(TSV_COLUMNS, fields):
+            if col == 'text':
+                data[col].append(value)
+            elif col == 'conf':
+                data[col].append(float(value))
+            else:
+                data[col].append(int(value))
+    return data
+
+
+def image_to_data(
+        img: Image.Image | np.ndarray,
+        lang: str,
+        psm: int,
+        oem: int = 3,
+        whitelist: Optional[str] = None
+    ) -> Dict[str, List]:
+    """Word boxes in `img` in `pytesseract.Output.DICT` layout."""
+    if not HAVE_TESSEROCR:
+        _note_fallback()
+        config = f'--oem {oem} --psm {psm}'
+        if whitelist is not None:
+            config += f' -c tessedit_char_whitelist={whitelist}'
+        return pytesseract.image_to_data(
+            img, lang=lang,
+            config=config,
+            output_type=pytesseract.Output.DICT,
+            timeout=READ_TIMEOUT_S
+        )
+
+    with _pool.acquire((lang, psm, oem)) as api:
+        api.SetVariable('tessedit_char_whitelist', whitelist or '')
+        try:
+            api.SetImage(_as_pil(img))
+            _recognize(api)
+            return parse_tsv(api.GetTSVText(0))
+        finally:
+            api.Clear()
@@ -21,6 +21,11 @@ class FontChoice(Enum):
 
 # New canonical identifiers for all TTFs (existing ones treated as legacy)
 
+class OcrBackend(Enum):
+    """Engine used by `ocr.execute`."""
+    TESSERACT = "tesseract"  # general purpose, runs the tesseract binary
+    GLYPH = "glyph"          # in-process bitmap-font matching (core.ocr.glyph)
+
 class TessOem(Enum):
     TESSERACT_ONLY = 0
     LSTM_ONLY = 1
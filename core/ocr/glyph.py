@@ -0,0 +1,373 @@
+"""
+Glyph-template OCR for the RuneScape bitmap fonts.
+
+The game draws text with pixel fonts and no anti-aliasing, so a glyph on
+screen is an exact copy of its bitmap. This engine renders an atlas of every
+glyph from the TTFs in `data/fonts` (at the size where each TTF reproduces
+its bitmap pixel-for-pixel), then reads a binarised text image by:
+
+  1. splitting it into lines on empty rows,
+  2. splitting each line into ink runs on empty columns,
+  3. decoding every run with template matching against the atlas (an exact
+     width match first, then a greedy left-to-right fit for touching glyphs).
+
+No process is spawned, so a line reads in a few milliseconds instead of the
+50-200 ms of a Tesseract call. Use it through
+`ocr.execute(..., backend=OcrBackend.GLYPH)`.
+"""
+from __future__ import annotations
+
+import string
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PIL import Image, ImageDraw, ImageFont
+
+from core.ocr.enums import FontChoice
+
+FONT_DIR = Path('data/fonts')
+CHARSET = string.digits + string.ascii_letters + string.punctuation
+AUTO_FONTS = (
+    FontChoice.RUNESCAPE_PLAIN_12,
+    FontChoice.RUNESCAPE_PLAIN_11,
+    FontChoice.RUNESCAPE_BOLD_12,
+)
+# A decoded glyph may disagree with the image on this fraction of its pixels
+MAX_MISMATCH = 0.1
+
+
+@dataclass(frozen=True)
+class Glyph:
+    char: str
+    bitmap: np.ndarray  # bool (h, w), cropped to ink
+    top: int            # first ink row below the drawing origin
+
+    @property
+    def width(self) -> int:
+        return self.bitmap.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.bitmap.shape[0]
+
+    @property
+    def ink(self) -> int:
+        return int(self.bitmap.sum())
+
+
+def _render(font: ImageFont.FreeTypeFont, text: str) -> np.ndarray:
+    """Render `text` without anti-aliasing; returns a bool array."""
+    left, top, right, bottom = font.getbbox(text)
+    canvas = Image.new('L', (right + 4, bottom + 4), 0)
+    draw = ImageDraw.Draw(canvas)
+    draw.fontmode = '1'
+    draw.text((2, 2), text, font=font, fill=255)
+    return np.asarray(canvas) > 127
+
+
+@lru_cache(maxsize=None)
+def pixel_size(path: str, lo: int = 6, hi: int = 48) -> int:
+    """
+    Smallest point size at which the TTF renders as a pure bitmap, i.e.
+    anti-aliased output contains no intermediate grey levels.
+    """
+    sample = string.digits + 'AbgXyz'
+    for size in range(lo, hi + 1):
+        mask = np.asarray(ImageFont.truetype(path, size).getmask(sample, mode='L'))
+        ink = mask > 0
+        if ink.any() and not np.any(mask[ink] < 255):
+            return size
+    raise ValueError(f'{path} has no pixel-perfect size between {lo} and {hi}')
+
+
+class GlyphFont:
+    """Atlas of one bitmap font."""
+
+    def __init__(self, font: FontChoice, charset: str = CHARSET):
+        path = str(FONT_DIR / f'{font.value}.ttf')
+        self.font = font
+        self.size = pixel_size(path)
+        pil_font = ImageFont.truetype(path, self.size)
+        self.space_width = max(1, int(round(pil_font.getlength(' '))))
+        self.glyphs: List[Glyph] = []
+        # glyphs sharing a bitmap (' and , or O and 0) are decoded as one and
+        # told apart afterwards by baseline offset and neighbouring characters
+        self.twins: Dict[bytes, List[Glyph]] = {}
+        for ch in charset:
+            arr = _render(pil_font, ch)
+            rows, cols = np.flatnonzero(arr.any(axis=1)), np.flatnonzero(arr.any(axis=0))
+            if not len(cols):
+                continue
+            bitmap = np.ascontiguousarray(arr[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1])
+            glyph = Glyph(ch, bitmap, int(rows[0]))
+            twins = self.twins.setdefault(self.shape_key(bitmap), [])
+            if not twins:
+                self.glyphs.append(glyph)
+            twins.append(glyph)
+
+        # every bitmap zero-padded to a common box, so one product scores
+        # all glyphs at a given column
+        self.box = (max(g.height for g in self.glyphs), max(g.width for g in self.glyphs))
+        self.kernels = np.zeros((len(self.glyphs), *self.box), dtype=np.float32)
+        for i, g in enumerate(self.glyphs):
+            self.kernels[i, :g.height, :g.width] = g.bitmap
+        self.kernels = self.kernels.reshape(len(self.glyphs), -1).T
+        self.widths = np.array([g.width for g in self.glyphs])
+        self.heights = np.array([g.height for g in self.glyphs])
+        self.inks = np.array([g.ink for g in self.glyphs])
+
+    @staticmethod
+    def shape_key(bitmap: np.ndarray) -> bytes:
+        return bytes(bitmap.shape) + np.packbits(bitmap).tobytes()
+
+    def allowed_mask(self, allowed: Optional[str] = None) -> np.ndarray:
+        """Which atlas entries (or one of their twins) may be emitted."""
+        if allowed is None:
+            return np.ones(len(self.glyphs), dtype=bool)
+        return np.array([
+            any(t.char in allowed for t in self.twins[self.shape_key(g.bitmap)])
+            for g in self.glyphs
+        ])
+
+
+_fonts: Dict[FontChoice, GlyphFont] = {}
+_fonts_lock = threading.Lock()
+
+
+def get_font(font: FontChoice) -> GlyphFont:
+    """Atlas for `font`, rendered once per process."""
+    with _fonts_lock:
+        atlas = _fonts.get(font)
+        if atlas is None:
+            atlas = _fonts[font] = GlyphFont(font)
+        return atlas
+
+
+# ---- binarisation / segmentation ---------------------------------------
+def binarize(img: Image.Image | np.ndarray) -> np.ndarray:
+    """Bool ink mask of `img`; light-on-dark or dark-on-light, any mode."""
+    arr = np.asarray(img)
+    if arr.ndim == 3:
+        arr = cv2.cvtColor(np.ascontiguousarray(arr[:, :, :3]), cv2.COLOR_RGB2GRAY)
+    if arr.dtype == bool:
+        ink = arr
+    elif np.isin(arr, (0, 255)).all():
+        ink = arr > 127
+    else:
+        _, thr = cv2.threshold(arr.astype(np.uint8), 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        ink = thr > 0
+    # text is the minority of pixels
+    return ~ink if ink.mean() > 0.5 else ink
+
+
+def _runs(profile: np.ndarray) -> List[Tuple[int, int]]:
+    """[start, end) spans where `profile` is non-zero."""
+    on = np.concatenate(([False], profile > 0, [False]))
+    edges = np.flatnonzero(on[1:] != on[:-1])
+    return list(zip(edges[::2], edges[1::2]))
+
+
+# ---- decoding -------------------------------------------------------------
+class _LineScorer:
+    """
+    Placement scores of every glyph along one text line.
+
+    For a glyph placed with its left edge at column x, mismatch is the glyph
+    ink it fails to cover plus any line ink in its columns it doesn't
+    explain: ink + col_ink(x) - 2 * hit. Only `hit` depends on the row.
+    """
+
+    def __init__(self, band: np.ndarray, atlas: GlyphFont):
+        self.band = band
+        self.atlas = atlas
+        h, w = band.shape
+        bh, bw = atlas.box
+        self._padded = np.zeros((h + bh, w + bw), dtype=np.float32)
+        self._padded[:h, :w] = band
+        self._col_cum = np.concatenate(([0], np.cumsum(band.sum(axis=0))))
+        self._fits_height = atlas.heights <= h
+        self._row_ok = np.arange(h)[:, None] <= h - atlas.heights[None, :]
+
+    def fits(self, x: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Best placement of every atlas glyph with its left edge at column `x`,
+        not reaching past `end`: (mismatch, matched ink, row) arrays.
+        """
+        atlas = self.atlas
+        h = self.band.shape[0]
+        bh, bw = atlas.box
+        windows = sliding_window_view(self._padded[:, x:x + bw], (bh, bw))[:h, 0]
+        hits = windows.reshape(h, -1) @ atlas.kernels
+        hits = np.where(self._row_ok, hits, -1.0)
+        rows = hits.argmax(axis=0)
+        hit = np.rint(hits.max(axis=0)).astype(int)
+
+        right = np.minimum(x + atlas.widths, self.band.shape[1])
+        col_ink = self._col_cum[right] - self._col_cum[x]
+        miss = atlas.inks + col_ink - 2 * hit
+        miss[~((x + atlas.widths <= end) & self._fits_height)] = 1 << 30
+        return miss, hit, rows
+
+
+Placed = Tuple[Glyph, int]  # glyph and the band row its top landed on
+
+
+def _decode_run(line: _LineScorer, start: int, end: int, allowed: np.ndarray) -> Tuple[List[Placed], int]:
+    """Decode the ink run in columns [start, end); returns (placed glyphs, total mismatch)."""
+    atlas = line.atlas
+    limit = MAX_MISMATCH * atlas.inks
+    miss, hit, rows = line.fits(start, end)
+    good = allowed & (miss <= limit)
+
+    # isolated glyph: only atlas entries of exactly this width can match
+    exact = np.flatnonzero(good & (atlas.widths == end - start))
+    if len(exact):
+        i = exact[np.lexsort((-hit[exact], miss[exact]))[0]]
+        return [(atlas.glyphs[i], int(rows[i]))], int(miss[i])
+
+    # touching glyphs: greedy left to right, widest good fit first
+    placed, total, x = [], 0, start
+    while x < end:
+        if not line.band[:, x].any():
+            x += 1
+            continue
+        if x != start:
+            miss, hit, rows = line.fits(x, end)
+            good = allowed & (miss <= limit)
+        ok = np.flatnonzero(good)
+        if not len(ok):
+            total += int(line.band[:, x].sum())
+            x += 1
+            continue
+        score = (hit[ok] - 2 * miss[ok]) * 64 + atlas.widths[ok]
+        i = ok[score.argmax()]
+        g = atlas.glyphs[i]
+        placed.append((g, int(rows[i])))
+        total += int(miss[i])
+        x += g.width
+    return placed, total
+
+
+def _resolve_twins(placed: List[Placed], atlas: GlyphFont, allowed: Optional[str]) -> str:
+    """
+    Pick between same-shaped glyphs: first by the line's baseline offset,
+    then letters next to letters and digits next to digits.
+    """
+    twins = [
+        [t for t in atlas.twins[atlas.shape_key(g.bitmap)] if allowed is None or t.char in allowed] or [g]
+        for g, _ in placed
+    ]
+    offsets = [y - g.top for (g, y), tw in zip(placed, twins) if len({t.top for t in tw}) == 1]
+    origin = max(set(offsets), key=offsets.count) if offsets else None
+
+    chars = [tw[0].char for tw in twins]
+    for i, ((g, y), tw) in enumerate(zip(placed, twins)):
+        if len(tw) == 1:
+            continue
+        if origin is not None:
+            dist = min(abs(y - t.top - origin) for t in tw)
+            tw = [t for t in tw if abs(y - t.top - origin) == dist]
+        near = chars[max(0, i - 1):i] + chars[i + 1:i + 2]
+        if any(c.isalpha() for c in near):
+            tw = sorted(tw, key=lambda t: not t.char.isalpha())
+        elif any(c.isdigit() for c in near):
+            tw = sorted(tw, key=lambda t: not t.char.isdigit())
+        chars[i] = tw[0].char
+    return ''.join(chars)
+
+
+def _read_line(band: np.ndarray, atlas: GlyphFont, allowed: Optional[str]) -> Tuple[str, int]:
+    placed: List[Placed] = []
+    spaces, total, prev_end = [], 0, None
+    line = _LineScorer(band, atlas)
+    mask = atlas.allowed_mask(allowed)
+    for start, end in _runs(band.any(axis=0)):
+        if prev_end is not None and start - prev_end > atlas.space_width:
+            spaces.append(len(placed))
+        glyphs, miss = _decode_run(line, start, end, mask)
+        placed += glyphs
+        total += miss
+        prev_end = end
+
+    text = _resolve_twins(placed, atlas, allowed)
+    if allowed is None or ' ' in allowed:
+        for i in reversed(spaces):
+            text = text[:i] + ' ' + text[i:]
+    return text, total
+
+
+def _line_bands(ink: np.ndarray, max_gap: int = 1) -> List[Tuple[int, int]]:
+    """Row spans of text lines; gaps of up to `max_gap` rows (the dot of an
+    'i' or 'j') don't split a line."""
+    bands: List[List[int]] = []
+    for top, bottom in _runs(ink.any(axis=1)):
+        if bands and top - bands[-1][1] <= max_gap:
+            bands[-1][1] = bottom
+        else:
+            bands.append([top, bottom])
+    return [(t, b) for t, b in bands]
+
+
+def _read(ink: np.ndarray, font: FontChoice, characters: Optional[str], give_up: float) -> Tuple[List[str], int]:
+    atlas = get_font(font)
+    lines, total = [], 0
+    for top, bottom in _line_bands(ink):
+        text, miss = _read_line(ink[top:bottom], atlas, characters)
+        if text:
+            lines.append(text)
+        total += miss
+        if total > give_up:
+            break
+    return lines, total
+
+
+def read_lines(img: Image.Image | np.ndarray, font: FontChoice, characters: str = None) -> Tuple[List[str], int]:
+    """Decode every text line of `img` with one font; returns (lines, total mismatch)."""
+    return _read(binarize(img), font, characters, float('inf'))
+
+
+def read_text(
+        img: Image.Image | np.ndarray,
+        font: FontChoice = FontChoice.AUTO,
+        characters: str = None,
+        fonts: Sequence[FontChoice] = AUTO_FONTS
+    ) -> str:
+    """
+    Read the text in `img` (lines joined by newlines).
+    `font=AUTO` tries each of `fonts` and keeps the read that explains the
+    image best. `characters` optionally whitelists the output.
+    """
+    return read_scored(img, font, characters, fonts)[0]
+
+
+def read_scored(
+        img: Image.Image | np.ndarray,
+        font: FontChoice = FontChoice.AUTO,
+        characters: str = None,
+        fonts: Sequence[FontChoice] = AUTO_FONTS
+    ) -> Tuple[str, float]:
+    """
+    `read_text`, plus how well the read explains the image: 1 minus the
+    mismatched pixels over the ink pixels (1.0 is an exact read, 0.0 an
+    empty image).
+    """
+    ink = binarize(img)
+    total = int(ink.sum())
+    if not total:
+        return '', 0.0
+    choices = fonts if font == FontChoice.AUTO else (font,)
+    best: Tuple[int, int, List[str]] | None = None
+    for choice in choices:
+        lines, miss = _read(ink, choice, characters, best[0] if best else float('inf'))
+        key = (miss, -sum(map(len, lines)))
+        if best is None or key < best[:2]:
+            best = (*key, lines)
+        if best[0] == 0:
+            break
+    return '\n'.join(best[2]), max(0.0, 1.0 - best[0] / total)
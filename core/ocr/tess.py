@@ -8,7 +8,9 @@ import shutil
 import re
 from typing import List, Tuple, Optional, Dict
 from difflib import SequenceMatcher
-from core.ocr.enums import TessOem, TessPsm, FontChoice
+from core.ocr.enums import TessOem, TessPsm, FontChoice, OcrBackend
+from core.ocr import engine, glyph
+from core.ocr.cache import ocr_cache
 
 # Set Tesseract command path per OS
 if sys.platform.startswith('win'):
@@ -19,55 +21,91 @@ else:
 
 os.environ['TESSDATA_PREFIX'] = os.path.abspath('./data/fonts')
 
-def _preprocess(pil_img: Image.Image) -> Image.Image:
-    """Upscale & grayscale (no binarization)."""
-    img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
-    img = cv2.resize(img, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+def _preprocess(pil_img: Image.Image | np.ndarray) -> Image.Image:
+    """Upscale & grayscale (no binarization). Accepts PIL images or uint8 arrays."""
+    arr = np.asarray(pil_img)
+    if arr.ndim == 2:
+        # Single-channel input (e.g. a colour mask) is already grayscale
+        gray = cv2.resize(arr, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
+    else:
+        img = cv2.cvtColor(arr[:, :, :3], cv2.COLOR_RGB2BGR)
+        img = cv2.resize(img, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     img = Image.fromarray(gray)
     return img.filter(ImageFilter.UnsharpMask(radius=2, percent=200))
 
             
 
+def _lang(font: FontChoice) -> str:
+    lang = ""
+    if font == FontChoice.AUTO:
+        lang += f'{FontChoice.RUNESCAPE.value}'
+        lang += f'+{FontChoice.RUNESCAPE_BOLD.value}'
+        lang += f"+{FontChoice.RUNESCAPE_SMALL.value}"
+    else:
+        lang += f"{font.value}"
+    return lang
+
+
 def execute(
-        img: Image.Image,
+        img: Image.Image | np.ndarray,
         font: FontChoice = FontChoice.AUTO,
         oem: TessOem = TessOem.DEFAULT,
         psm: TessPsm = TessPsm.SINGLE_LINE,
         preprocess: bool = True,
         characters: str = None,
-        raise_on_blank = True
+        raise_on_blank = True,
+        backend: OcrBackend = OcrBackend.TESSERACT,
+        cache: bool = True
     ) -> str:
     """
-    Run Tesseract on `img` and return the text it found.
+    Run Tesseract on `img` and return the text it found (on a resident
+    engine when tesserocr is installed, see `core.ocr.engine`).
+    `img` may be a PIL image or a uint8 array (e.g. from `core.color_mask`).
+    With `backend=OcrBackend.GLYPH` the text is read in-process by matching
+    the RuneScape bitmap fonts instead; `oem`, `psm` and `preprocess` are
+    ignored then.
+    Results are cached by image content and settings (see `core.ocr.cache`);
+    pass `cache=False` to force a fresh read.
     """
-    lang = ""
-    if font == FontChoice.AUTO:
-        lang += f'{FontChoice.RUNESCAPE.value}'
-        lang += f'+{FontChoice.RUNESCAPE_BOLD.value}'
-        lang += f"+{FontChoice.RUNESCAPE_SMALL.value}"
+    def read() -> str:
+        return _read(img, font, oem, psm, preprocess, characters, backend)
+
+    if cache:
+        settings = (font, oem, psm, preprocess, characters, backend)
+        ans = ocr_cache().get_or_read(img, settings, read)
     else:
-        lang += f"{font.value}"
+        ans = read()
+    if not ans and raise_on_blank:
+        print(f"font: {font.value}, psm: {psm.value}, oem: {oem.value}, characters: {characters}")
+        if isinstance(img, Image.Image):
+            img.show()
+        raise ValueError('OCR yielded no characters')
+    return ans
+
+
+def _read(
+        img: Image.Image | np.ndarray,
+        font: FontChoice,
+        oem: TessOem,
+        psm: TessPsm,
+        preprocess: bool,
+        characters: Optional[str],
+        backend: OcrBackend
+    ) -> str:
+    if backend == OcrBackend.GLYPH:
+        return glyph.read_text(img, font=font, characters=characters)
 
     if preprocess:
         img = _preprocess(img)
         
-    config = f'--oem {oem.value} --psm {psm.value}'
-    if characters is not None:
-        config += f' -c tessedit_char_whitelist={characters}'
-
-    
-    ans = pytesseract.image_to_string(
-        img, 
-        lang=lang, 
-        config=config,
-        timeout=5
+    return engine.image_to_string(
+        img,
+        lang=_lang(font),
+        psm=psm.value,
+        oem=oem.value,
+        whitelist=characters
     ).strip()
-    if not ans and raise_on_blank:
-        print(f"lang: {lang}, config: {config}")
-        img.show()
-        raise ValueError('OCR yielded no characters')
-    return ans
 
 
 def find_string_bounds(
@@ -88,13 +126,7 @@ def find_string_bounds(
     if preprocess:
         img = _preprocess(img)
 
-    cfg = f"--psm {psm}"
-    data = pytesseract.image_to_data(
-        img, lang=lang, 
-        config=cfg, 
-        output_type=pytesseract.Output.DICT, 
-        timeout=5
-        )
+    data = engine.image_to_data(img, lang=lang, psm=psm)
 
     # Group words by line
     n = len(data["text"])
@@ -165,7 +197,12 @@ def find_string_bounds(
     return best_box
 
 
-def get_number(img: Image.Image, font: FontChoice = FontChoice.AUTO, preprocess:bool=True) -> str:
+def get_number(
+        img: Image.Image | np.ndarray,
+        font: FontChoice = FontChoice.AUTO,
+        preprocess: bool = True,
+        backend: OcrBackend = OcrBackend.TESSERACT
+    ) -> str:
     """
     Return the number as a string (e.g. '60', '2009').
     Raises a ValueError if *nothing* is read.
@@ -175,7 +212,8 @@ def get_number(img: Image.Image, font: FontChoice = FontChoice.AUTO, preprocess:
         img, font=font, 
         psm=TessPsm.SINGLE_LINE, 
         characters="0123456789.",
-        preprocess=preprocess
+        preprocess=preprocess,
+        backend=backend
     )
     try:
         
@@ -1,4 +1,3 @@
-import mss
 import time
 from PIL import Image
 import io
@@ -7,6 +6,7 @@ from core.tools import (
     find_color_box, seconds_to_hms, find_subimages
 )
 from core.input.mouse_control import click_in_match, move_to, ClickType, click
+from core.input.backend import InputBackend, InputFailSafe, input_backend
 from core import ocr
 from typing import Tuple, List, Optional, Dict, Any
 import threading
@@ -16,8 +16,6 @@ from dataclasses import field
 from core.item_db import ItemLookup, Item
 from enum import Enum
 import random
-from pathlib import Path
-import keyboard
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION, TimeoutError, as_completed
 
@@ -25,17 +23,29 @@ from core import tools
 from core.control import ScriptControl, ScriptTerminationException
 import os
 import sys
-import pyautogui
 from core.window_manager import WindowManager
+from core.capture import CaptureSession, CapturedFrame
+from core.frame import Frame, as_frame
+from core.color_mask import mask_colors_array, mask_above_array
+from core.roi_prior import LocationPriors
+from core.motion import MotionDetector
+from core.hover import HoverReader
+from core.position_tracker import PositionTracker
+from core.inventory import InventoryGrid, InventorySnapshot
+from core.assets import assets
+from core.layout_cache import Layout, LayoutCache, layout_cache, layout_fingerprint, verify_layout
 from PIL import ImageFilter
-from core.ocr.custom import read_location_numbers
+from core.ocr.custom import read_location_strips
+from core.ocr import glyph
 from core.logger import get_logger
 
 # Constants
 MAXTHREAD = os.cpu_count()
 control = ScriptControl()
-POSITION_STATE = Image.open('data/ui/player-position-state.png')
-ACTION_HOVER = Image.open('data/ui/action-hover.png')
+POSITION_STATE = assets().image('player-position-state')
+ACTION_HOVER = assets().image('action-hover')
+# glyph reads explaining less of the ink than this go to Tesseract instead
+GLYPH_MIN_CONFIDENCE = 0.9
 
 # Centralized randomness configuration for user interaction behavior
 @dataclass
@@ -82,7 +92,9 @@ class MinimapElement(Enum):
 
 class GenericWindow:
     """Represents a generic window with functionality to interact with it."""
-    def __init__(self, window_title: str, randomness: InteractionRandomness | None = None):
+    def __init__(
+            self, window_title: str, randomness: InteractionRandomness | None = None,
+            backend: InputBackend | None = None):
         """
         Initialize the GenericWindow instance.
 
@@ -90,11 +102,16 @@ class GenericWindow:
             window_title (str): The title of the window to interact with.
             randomness (InteractionRandomness | None): Optional behavior config to
                 tune default random movement/click behavior.
+            backend (InputBackend | None): Where mouse / keyboard input goes;
+                defaults to input_backend() (the real desktop).
         """
         self.log = get_logger('GenericWindow')
         self.window_title = window_title
         self.window = None
+        self.input: InputBackend = backend or input_backend()
         self._last_screenshot: Image.Image = None
+        self.capture = CaptureSession()
+        self.priors = LocationPriors()
         self.window_manager = WindowManager.create()
         self.update_window()
         # Default/random behavior settings
@@ -140,6 +157,10 @@ class GenericWindow:
                     position = _get_window_position()
                     if position != last:
                         last = position
+                        # buffered frames and remembered match locations
+                        # no longer line up with the window
+                        self.capture.clear()
+                        self.priors.clear()
                         try:
                             if on_resize:
                                 on_resize()
@@ -153,6 +174,10 @@ class GenericWindow:
         threading.Thread(target=_loop, daemon=True).start()
         return stop_evt  # Caller can call .set() to stop
 
+    def close(self):
+        """Release the capture handles; the window itself is left alone."""
+        self.capture.close()
+
     @control.guard
     def on_resize(self):
         """
@@ -265,33 +290,55 @@ class GenericWindow:
 
         # Move the window to the new position
         try:
-            move_to(new_x, new_y)
-        except pyautogui.FailSafeException as e:
+            move_to(new_x, new_y, backend=self.input)
+        except InputFailSafe as e:
             self.log.warning(f'Failed to move off window!! {e}')
 
+    @property
+    def bbox(self) -> Tuple[int, int, int, int]:
+        """Screen region (left, top, right, bottom) covered by the window."""
+        return (
+            self.window.left, self.window.top,
+            self.window.left + self.window.width, self.window.top + self.window.height
+        )
+
     @timeit
     @control.guard
-    def get_screenshot(self, maximize=True) -> Image.Image:
+    def get_frame(self, maximize=True, max_age_ms: float = 0) -> CapturedFrame:
         """
-        Captures and returns a screenshot of the RuneLite window.
+        Returns a frame of the RuneLite window from the capture session.
 
         Args:
             maximize (bool, optional): Whether to bring the window to focus before capturing.
+            max_age_ms (float, optional): Reuse a buffered frame if one is at most
+                this old; 0 always captures a new frame.
 
         Returns:
-            Image.Image: The screenshot of the window.
+            CapturedFrame: The frame, with its sequence number and timestamp.
         """
-        if maximize:
-            self.bring_to_focus()
         if not self.is_open:
             raise RuntimeError(f'Window {self.window_title} is not open.')
+        if max_age_ms > 0:
+            frame = self.capture.latest(max_age_ms=max_age_ms, bbox=self.bbox)
+            if frame is not None:
+                return frame
+        if maximize:
+            self.bring_to_focus()
+        return self.capture.grab(self.bbox)
 
-        with mss.mss(with_cursor=True) as sct:
-            bbox = (self.window.left, self.window.top, self.window.left + self.window.width, self.window.top + self.window.height)
-            sct_img = sct.grab(bbox)
-            img = Image.frombytes('RGB', sct_img.size, sct_img.rgb)
+    def get_screenshot(self, maximize=True, max_age_ms: float = 0) -> Image.Image:
+        """
+        Captures and returns a screenshot of the RuneLite window.
 
-        self._last_screenshot = img
+        Args:
+            maximize (bool, optional): Whether to bring the window to focus before capturing.
+            max_age_ms (float, optional): Reuse a buffered frame if one is at most
+                this old; 0 always captures a new frame.
+
+        Returns:
+            Image.Image: The screenshot of the window.
+        """
+        self._last_screenshot = self.get_frame(maximize, max_age_ms).image
         return self._last_screenshot
 
     def save_screenshot(self, filename="runelite_screenshot.png") -> str | None:
@@ -312,20 +359,41 @@ class GenericWindow:
     
     @timeit
     def find_in_window(
-            self, img: Image.Image, screenshot: Image.Image=None,
+            self, img: Image.Image, screenshot: Image.Image | Frame=None,
             min_scale: float = 0.9, max_scale: float = 1.1,
-            min_confidence: float = 0.7, sub_match: MatchResult = None
+            min_confidence: float = 0.7, sub_match: MatchResult = None,
+            pyramid: bool = False, use_prior: bool = False
         ) -> MatchResult:
-        """Finds a subimage within the RuneLite window."""
+        """
+        Finds a subimage within the RuneLite window.
+        `pyramid` uses the coarse-to-fine search (see tools.find_subimage).
+        With `use_prior` (and no `sub_match`) the search starts in a small
+        region around where `img` was last found in a screenshot of this size,
+        and only scans the whole screenshot if that region no longer matches.
+        Only pass it for anchors that stay put (overlays, toolplane, bank
+        buttons): for things that move, like inventory items, a similar
+        look-alike left at the old spot would be returned instead.
+        """
         screenshot = screenshot or self.get_screenshot()
 
         if sub_match: 
             screenshot = sub_match.crop_in(screenshot)
+        elif use_prior:
+            ans = self._find_near_prior(img, screenshot, min_scale, max_scale, min_confidence)
+            if ans is not None:
+                return ans
 
         ans = find_subimage(
             screenshot, img, 
             min_scale=min_scale, max_scale=max_scale,
+            pyramid=pyramid
         )
+        if not sub_match and use_prior:
+            if ans.confidence >= min_confidence:
+                self.priors.record(img, screenshot.size, ans)
+            else:
+                self.priors.forget(img, screenshot.size)
+
         if min_confidence > ans.confidence:
             raise ValueError(f'Match did not meet minimum confidence {ans.confidence}')
         
@@ -335,6 +403,29 @@ class GenericWindow:
             )
         
         return ans
+
+    def _find_near_prior(
+            self, img: Image.Image, screenshot: Image.Image | Frame,
+            min_scale: float, max_scale: float, min_confidence: float
+        ) -> Optional[MatchResult]:
+        """Match `img` around its last known location; None if that fails."""
+        prior = self.priors.get(img, screenshot.size)
+        if prior is None:
+            return None
+        roi = self.priors.roi(prior, screenshot.size, max_scale)
+        try:
+            ans = find_subimage(
+                roi.crop_in(screenshot), img,
+                min_scale=min_scale, max_scale=max_scale
+            )
+        except ValueError:
+            # template no longer fits in the clamped region
+            return None
+        if not self.priors.accepts(prior, ans, min_confidence):
+            self.priors.misses += 1
+            return None
+        self.priors.hits += 1
+        return ans.transform(roi.start_x, roi.start_y)
     
     def show_in_window(self, match: MatchResult, screenshot: Image=None, color="red"):
         """Draws a box around the found match in the screenshot."""
@@ -382,7 +473,7 @@ class GenericWindow:
         if random.random() < chance:
             self.move_to(self.window_match,translated=True)
             
-        move_to(x,y)
+        move_to(x,y,backend=self.input)
 
 
     def click(
@@ -422,6 +513,7 @@ class GenericWindow:
             click_type=click_type,
             click_cnt=click_cnt, 
             min_click_interval=min_click_interval,
+            backend=self.input
         )
         if random.random() < after_click_settle_chance:
             time.sleep(self.randomness.settle_sleep())
@@ -433,23 +525,39 @@ class GenericWindow:
 
 
 class RuneLiteClient(GenericWindow):
-    def __init__(self,username='', randomness: InteractionRandomness | None = None):
+    def __init__(
+            self, username='', randomness: InteractionRandomness | None = None,
+            backend: InputBackend | None = None):
         start_time = time.time()
-        super().__init__(f'RuneLite - {username}', randomness=randomness)
+        super().__init__(f'RuneLite - {username}', randomness=randomness, backend=backend)
         self.log = get_logger('RLClient')
         self.log.info('Initializing RuneLite client...')
         
+        # decode every UI template once, up front
+        assets().preload()
         self.minimap = MinimapContext()
+        self.motion = MotionDetector()
+        self.position_tracker: PositionTracker['PlayerPosition'] | None = None
+        # hover reads grab a small box around the cursor, separately from
+        # the full-window frames buffered in self.capture
+        self.hover_capture = CaptureSession(buffer_size=1, with_cursor=False)
+        self.hover = HoverReader(ACTION_HOVER, self._grab_window_box)
+        # long-lived workers for get_hover_texts, so each keeps one capture handle
+        self._hover_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hover")
         self.toolplane = ToolplaneContext()
         self.item_db = ItemLookup()
         self.sectors: UISectors = UISectors()
+        self.layout_cache: LayoutCache = layout_cache()
+        self._layout_fingerprint = layout_fingerprint(
+            assets().image(name) for name in self._layout_anchor_names()
+        )
 
-        self.ui_type: UIType = self.get_ui_type()
-        self.log.info(f'UI Type detected: {self.ui_type.value}')
+        # detected on the first calibration unless a cached layout fits
+        self.ui_type: UIType | None = None
         self.log.debug('Finding UI sectors...')
         
         self.on_resize()
-        self.start_resize_watch_polling()
+        self._resize_watch = self.start_resize_watch_polling()
         elapsed = seconds_to_hms(time.time() - start_time)
         self.log.info(f'Client initialized successfully in {elapsed}')
         
@@ -479,7 +587,7 @@ class RuneLiteClient(GenericWindow):
         """
         Returns the current mouse position relative to the RuneLite window.
         """
-        x, y = pyautogui.position()
+        x, y = self.input.position()
         return (x - self.window.left, y - self.window.top)
 
     @timeit
@@ -538,6 +646,19 @@ class RuneLiteClient(GenericWindow):
         item_name = item.name
         if item.noted: item_name += ' (noted)'
 
+        if tab == ToolplaneTab.INVENTORY:
+            # 28 slot patches instead of a sweep over the whole toolplane
+            snap = self.get_inventory(
+                [item.id], min_confidence=min_confidence,
+                verify_tab=False, screenshot=sc
+            )
+            slot = int(np.argmax(snap.confidences))
+            confidence = snap.confidences[slot]
+            self.log.debug(f"Found {item_name} with confidence: {round(confidence*100,2)}%")
+            if snap.slots[slot] is None:
+                raise ValueError(f"Item {item_name} not found in window. Confidence: {confidence}")
+            return snap.matches[slot]
+
         sc = self.sectors.toolplane.crop_in(sc)
         match = self.find_in_window(
             item.icon, sc, min_scale=1,max_scale=1
@@ -659,7 +780,7 @@ class RuneLiteClient(GenericWindow):
         match.end_x = match.start_x + 35
 
         sc = match.crop_in(self.screenshot)
-        num_img = tools.mask_colors(sc, [
+        num_img = mask_colors_array(sc, [
             (255, 255, 0), # < 100k
             # TODO: actually handle these
             # (255,255,255), # > 100k
@@ -706,8 +827,8 @@ class RuneLiteClient(GenericWindow):
 
     def get_right_click_menu(self, sc:Image.Image=None) -> MatchResult:
         sc = sc or self.get_screenshot()
-        right_click_header = Image.open('data/ui/right-click-header.png')
-        right_click_menu_end = Image.open('data/ui/right-click-menu-end.png')
+        right_click_header = assets().image('right-click-header')
+        right_click_menu_end = assets().image('right-click-menu-end')
         top_left = self.find_in_window(
             right_click_header,
             sc,
@@ -737,7 +858,7 @@ class RuneLiteClient(GenericWindow):
         menu_match = self.get_right_click_menu(sc)
 
         menu = menu_match.crop_in(sc)
-        menu = tools.mask_above_color_value(menu, 150)
+        menu = mask_above_array(menu, 150)
         
 
         ocr_match = ocr.find_string_bounds(
@@ -769,7 +890,7 @@ class RuneLiteClient(GenericWindow):
         self.minimap.prayer.debug_draw(self.screenshot, color=(0, 0, 255))
         self.minimap.run.debug_draw(self.screenshot, color=(255, 0, 0))
         self.minimap.spec.debug_draw(self.screenshot, color=(255, 255, 0))
-        find_subimage(self.screenshot, Image.open("data/ui/map.webp")).debug_draw(self.screenshot, color=(255, 255, 255))
+        find_subimage(self.screenshot, assets().image('map')).debug_draw(self.screenshot, color=(255, 255, 255))
         self.minimap.get_minimap_match(self.minimap.health,screenshot).debug_draw(self.screenshot,color=(255,255,255))
         self.minimap.get_minimap_match(self.minimap.run,screenshot).debug_draw(self.screenshot,color=(255,255,255))
         # health_val = self.minimap.get_minimap_stat(self.minimap.health, self.screenshot)
@@ -797,13 +918,15 @@ class RuneLiteClient(GenericWindow):
         #self.screenshot.show()
 
     def get_hover_image(self) -> Image.Image:
-        logo = Image.open('data/ui/rl-window-logo.png')
+        logo = assets().image('rl-window-logo')
+        sc = self.get_screenshot(max_age_ms=50)
         match = self.find_in_window(
-            logo,min_scale=1,max_scale=1,min_confidence=0.95
+            logo,sc,min_scale=1,max_scale=1,min_confidence=0.95,
+            use_prior=True
         )
         match = match.transform(0,25)
         match.end_x = match.start_x + 350
-        return match.crop_in(self.get_screenshot())
+        return match.crop_in(sc)
 
 
     def get_hover_text(self):
@@ -859,7 +982,7 @@ class RuneLiteClient(GenericWindow):
         return False
     
     def get_skilling_state(self, substring: str) -> bool:
-        state_box = Image.open('data/ui/skilling-state.png')
+        state_box = assets().image('skilling-state')
         sc = self.get_screenshot()
         matches = find_subimages(
             sc,state_box,
@@ -868,18 +991,23 @@ class RuneLiteClient(GenericWindow):
             )
         skill_match = None
         for match in matches:
-            skill_img = tools.mask_colors(
+            skill_img = mask_colors_array(
                 match.crop_in(sc),
                 [[255,255,255], # white
                 [255,0,0], # red
                 [0,255,0]] # green
             )
-            text = ocr.execute(
-                skill_img,
-                font=ocr.FontChoice.RUNESCAPE_PLAIN_12,
-                psm=ocr.TessPsm.SPARSE_TEXT,
-                raise_on_blank=False,
-            )
+            # the label is drawn pixel-exact in plain 12, so the in-process
+            # glyph reader goes first; Tesseract only runs when that read is
+            # blank or doesn't explain the ink.
+            text, confidence = glyph.read_scored(skill_img, ocr.FontChoice.RUNESCAPE_PLAIN_12)
+            if not text or confidence < GLYPH_MIN_CONFIDENCE:
+                text = ocr.execute(
+                    skill_img,
+                    font=ocr.FontChoice.RUNESCAPE_PLAIN_12,
+                    psm=ocr.TessPsm.SPARSE_TEXT,
+                    raise_on_blank=False,
+                )
 
             if substring.lower() in text.lower():
                 skill_match = match
@@ -903,8 +1031,29 @@ class RuneLiteClient(GenericWindow):
 
         raise ValueError(f"Could not determine skilling state for substring: {substring}. No red or green pixels found in {img.size} image.")
         
+    def _minimap_sample(self) -> np.ndarray:
+        """BGR pixels of the minimap in a fresh frame."""
+        return self.get_frame(maximize=False).frame.crop(self.minimap.map.bounding_box).bgr
+
+    @control.guard
+    def is_moving(self, sleep_between=.8, retry_cnt=2, confirm=False) -> bool:
+        """
+        Checks if the player is moving by watching the minimap scroll
+        (see `core.motion`); a verdict takes at most one settle window.
+
+        Args:
+            sleep_between, retry_cnt: Used by the position-OCR check, which
+                runs when the minimap hasn't been located yet.
+            confirm: Confirm a "stopped" verdict with the position-OCR check.
+        """
+        if self.minimap.map is None:
+            return self.is_moving_ocr(sleep_between, retry_cnt)
+        if self.motion.poll(self._minimap_sample):
+            return True
+        return self.is_moving_ocr(sleep_between, retry_cnt) if confirm else False
+
     @control.guard
-    def is_moving(self, sleep_between=.8, retry_cnt=2) -> bool:
+    def is_moving_ocr(self, sleep_between=.8, retry_cnt=2) -> bool:
         """
         Checks if the player is moving by comparing the 
         player's position at two different times.
@@ -935,69 +1084,83 @@ class RuneLiteClient(GenericWindow):
         # Compare positions to determine movement
         return positions[0].tile != positions[1].tile
     
-    @timeit
-    def get_position(self,retry_cnt=0) -> 'PlayerPosition':
-        def do_ocr(match: MatchResult, sc: Image.Image) -> str:
-            return read_location_numbers(match.crop_in(sc))
-        sc = self.get_screenshot()
-        position_container = POSITION_STATE
+    def _position_overlay(self, sc: Image.Image | Frame) -> Optional[np.ndarray]:
+        """Masked pixels of the World Location overlay, or None if it isn't shown."""
         match = self.find_in_window(
-            position_container,sc,
-            min_scale=1,max_scale=1
+            POSITION_STATE,sc,
+            min_scale=1,max_scale=1,use_prior=True
         )
-
-        
-        
         if match.confidence < 0.98:
-            if retry_cnt > 0:
-                time.sleep(1)
-                self.log.info(f"Retrying position detection: {retry_cnt} attempts remaining")
-                return self.get_position(retry_cnt=retry_cnt-1)
-            raise RuntimeError('Missing plugin: "World Location" please install & enable "Grid Location" with "Grid Info Type" == "UniqueID"')
-    
-        
-        sc = match.crop_in(sc)
-        sc = tools.mask_colors(sc,[(255,255,255)])
-        
-        def process_ocr(match: MatchResult):
-            return do_ocr(match, sc)
+            return None
+        return mask_colors_array(match.crop_in(sc),[(255,255,255)])
 
+    @staticmethod
+    def _parse_position(overlay: np.ndarray) -> 'PlayerPosition':
+        """Decode the tile / chunk / region strips of a masked overlay."""
         matches = {
             "tile": MatchResult(40, 6, 128, 21),
             "chunk": MatchResult(75, 22, 127, 37),
             "region": MatchResult(85, 38, 127, 53),
         }
-
-        with ThreadPoolExecutor(max_workers=len(matches)) as executor:
-            results = {key: executor.submit(process_ocr, match) for key, match in matches.items()}
-
-        tile_val = results["tile"].result()
-        if not tile_val and retry_cnt > 0:
-            time.sleep(1)
-            self.log.warning(f"Failed to read tile position, retrying: {retry_cnt} attempts left")
-            return self.get_position(retry_cnt=retry_cnt-1)
-        tile_ans = tuple(int(t.strip()) for t in tile_val.split(',') if t.isdigit())
-
-        chunk_val = results["chunk"].result()
-        if not chunk_val and retry_cnt > 0:
-            time.sleep(1)
-            self.log.warning(f"Failed to read chunk position, retrying: {retry_cnt} attempts left")
-            return self.get_position(retry_cnt=retry_cnt-1)
-        chunk_ans = int(chunk_val.strip())
-
-        region_val = results["region"].result()
-        if not region_val and retry_cnt > 0:
-            time.sleep(1)
-            self.log.warning(f"Failed to read region position, retrying: {retry_cnt} attempts left")
-            return self.get_position(retry_cnt=retry_cnt-1)
-        region_ans = int(region_val.strip())
+        results = read_location_strips(overlay, matches)
+        for key, val in results.items():
+            if not val:
+                raise ValueError(f"Failed to read {key} position")
 
         return PlayerPosition(
-            tile=tile_ans, 
-            chunk=chunk_ans, 
-            region=region_ans
+            tile=tuple(int(t.strip()) for t in results["tile"].split(',') if t.isdigit()),
+            chunk=int(results["chunk"].strip()),
+            region=int(results["region"].strip())
         )
-        
+
+    @timeit
+    def get_position(self,retry_cnt=0) -> 'PlayerPosition':
+        overlay = self._position_overlay(self.get_screenshot())
+        if overlay is None:
+            if retry_cnt > 0:
+                time.sleep(1)
+                self.log.info(f"Retrying position detection: {retry_cnt} attempts remaining")
+                return self.get_position(retry_cnt=retry_cnt-1)
+            raise RuntimeError('Missing plugin: "World Location" please install & enable "Grid Location" with "Grid Info Type" == "UniqueID"')
+
+        try:
+            return self._parse_position(overlay)
+        except ValueError as e:
+            if retry_cnt > 0:
+                time.sleep(1)
+                self.log.warning(f"{e}, retrying: {retry_cnt} attempts left")
+                return self.get_position(retry_cnt=retry_cnt-1)
+            raise
+
+    def start_position_tracker(self, samples_per_tick: int = 2) -> PositionTracker['PlayerPosition']:
+        """
+        Start (once) a background tracker that keeps the player position up
+        to date; read it with `self.position_tracker.position()`.
+        """
+        if self.position_tracker is None:
+            self.position_tracker = PositionTracker(
+                lambda: self._position_overlay(self.get_frame(maximize=False).frame),
+                self._parse_position,
+                samples_per_tick=samples_per_tick
+            )
+        return self.position_tracker.start()
+
+    def stop_position_tracker(self):
+        """Stop the background position tracker, if one was started."""
+        if self.position_tracker is not None:
+            self.position_tracker.stop()
+
+    def close(self):
+        """Stop the client's background threads and release its capture handles."""
+        resize_watch = getattr(self, '_resize_watch', None)
+        if resize_watch is not None:
+            resize_watch.set()
+        hover_pool = getattr(self, '_hover_pool', None)
+        if hover_pool is not None:
+            hover_pool.shutdown(wait=False, cancel_futures=True)
+        self.stop_position_tracker()
+        self.hover_capture.close()
+        super().close()
 
     def get_inv_items(self, 
             items: List[str | int],min_confidence=0.97,
@@ -1006,24 +1169,9 @@ class RuneLiteClient(GenericWindow):
             do_sort: bool = True,
             verify_tab: bool = True
         ) -> List[MatchResult]:
-        if verify_tab:
-            self.click_toolplane(ToolplaneTab.INVENTORY)
-        sc = self.get_screenshot()
-        tp = self.sectors.toolplane
-        sc = tp.crop_in(sc)
-        matches: List[tools.MatchResult] = []
-        for item in items:
-            itm = self.item_db.get_item(item)
-            if not itm:
-                raise RuntimeError(f"Item '{item}' not found in database.")
-                
-            item_icon = itm.icon
-            if not item_icon:
-                self.log.warning(f"Item icon for '{item}' not found.")
-                continue
-            matches += tools.find_subimages(
-                sc, item_icon, min_confidence=min_confidence
-            )
+        # every slot is classified once against all of `items`
+        snap = self.get_inventory(items, min_confidence=min_confidence, verify_tab=verify_tab)
+        matches: List[tools.MatchResult] = [m for item in dict.fromkeys(items) for m in snap.matches_of(item)]
         if not matches:
             return []
 
@@ -1038,9 +1186,43 @@ class RuneLiteClient(GenericWindow):
                 key=lambda x: x.start_y,
                 reverse=y_sort
             )
-        matches = [m.transform(tp.start_x,tp.start_y) for m in matches]
         return matches
 
+    def get_inventory(
+            self,
+            items: List[str | int],
+            min_confidence: float = 0.97,
+            verify_tab: bool = True,
+            screenshot: Image.Image | Frame = None
+        ) -> InventorySnapshot:
+        """
+        Classify all 28 inventory slots against `items` in one pass.
+        Slot boxes in the snapshot are in window coordinates.
+        """
+        if verify_tab:
+            self.click_toolplane(ToolplaneTab.INVENTORY)
+        icons: Dict[str | int, Image.Image] = {}
+        for item in items:
+            itm = self.item_db.get_item(item)
+            if not itm:
+                raise RuntimeError(f"Item '{item}' not found in database.")
+            if not itm.icon:
+                self.log.warning(f"Item icon for '{item}' not found.")
+                continue
+            icons[item] = itm.icon
+
+        return InventorySnapshot.capture(
+            screenshot if screenshot is not None else self.get_frame().frame,
+            self.sectors.toolplane,
+            icons,
+            InventoryGrid.for_ui(self.ui_type),
+            min_confidence=min_confidence
+        )
+
+    def is_inventory_full(self, verify_tab: bool = True) -> bool:
+        """True when none of the 28 inventory slots is empty."""
+        return self.get_inventory([], verify_tab=verify_tab).is_full
+
     def follow_tile(
             self,
             tile_color: Tuple[int, int, int] = (255, 0, 50),
@@ -1053,6 +1235,7 @@ class RuneLiteClient(GenericWindow):
                 sc = self.get_filtered_screenshot() if filter_ui else self.get_screenshot()
                 t = None
                 if filter_out:
+                    sc = sc.copy()
                     for match in filter_out:
                         sc = match.remove_from(sc)
                 try:
@@ -1067,7 +1250,7 @@ class RuneLiteClient(GenericWindow):
                     y = int(y + self.window.top)
                     if t:
                         t.join()
-                    t = threading.Thread(target=move_to,args=(x,y,0,0,0))
+                    t = threading.Thread(target=move_to,args=(x,y,0,0,0),kwargs={'backend': self.input})
                     t.start()
                 except Exception as e:
                     self.log.error(f"Error following tile: {str(e)}")
@@ -1093,6 +1276,7 @@ class RuneLiteClient(GenericWindow):
             time.sleep(3*mult) # 0 on first try
             sc = self.get_screenshot(filter_ui)
             if filter_out:
+                sc = sc.copy()
                 for match in filter_out:
                     sc = match.remove_from(sc)
             if mult + 1 >= retry_match and retry_match > 1:
@@ -1146,7 +1330,7 @@ class RuneLiteClient(GenericWindow):
             for hover_text in hover_texts:
                 for ans in answers:
                     if hover_text.lower() in ans.lower():
-                        click(-1,-1,click_type=click_type,click_cnt=click_cnt)
+                        click(-1,-1,click_type=click_type,click_cnt=click_cnt,backend=self.input)
                         return
         raise RuntimeError(f'[SmartClick] cant find match {hover_texts}. Hover text: "{ans}"')
 
@@ -1165,33 +1349,27 @@ class RuneLiteClient(GenericWindow):
                 self.log.error("[%s] %s", label, e, exc_info=True)
                 return ''
 
-        ex = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hover")
+        # OCR reads give up after ocr.engine.READ_TIMEOUT_S, so the shared
+        # workers are never stranded by a hung read
         futures = [
-            ex.submit(safe, self.get_hover_text,     "hover_text"),
-            ex.submit(safe, self.get_action_hover,   "action_hover"),
+            self._hover_pool.submit(safe, self.get_hover_text,   "hover_text"),
+            self._hover_pool.submit(safe, self.get_action_hover, "action_hover"),
         ]
-        try:
-            done, not_done = wait(futures, timeout=5, return_when=FIRST_EXCEPTION)
+        done, not_done = wait(futures, timeout=5, return_when=FIRST_EXCEPTION)
 
-            # collect whatever finished
-            results = [f.result() for f in done]
+        # collect whatever finished
+        results = [f.result() for f in done]
 
-            # anything still running after 5 s is probably wedged
+        # anything still queued after 5 s is dropped
+        if not_done:
+            self.log.warning("Timed-out waiting for hover text")
             for f in not_done:
                 f.cancel()
 
-            # pad so we always return two strings
-            while len(results) < 2:
-                results.append('')
-            return results
-
-        except TimeoutError:
-            self.log.warning("Timed-out waiting for hover text")
-            return ['', '']
-
-        finally:
-            # don’t block—just shoot lingering threads
-            ex.shutdown(wait=False, cancel_futures=True)
+        # pad so we always return two strings
+        while len(results) < 2:
+            results.append('')
+        return results
 
     def compare_hover_match(self, target: str) -> float:
         """
@@ -1217,7 +1395,63 @@ class RuneLiteClient(GenericWindow):
         Handles the window resize event by recalculating UI sectors and components.
         """
         self.log.debug("Window resize detected - recalculating UI elements")
-        sc = self.get_screenshot()
+        self.priors.clear()
+        # one ndarray frame shared by every matcher below
+        sc = self.get_frame().frame
+        if not self.restore_layout(sc):
+            self.calibrate(sc)
+
+    # contexts whose anchors look the same in every UI state; toolplane
+    # tabs change when selected or hovered and move with the toolplane
+    LAYOUT_VERIFIED = ('minimap', 'sectors')
+
+    def _layout_contexts(self) -> Dict[str, Any]:
+        return {'minimap': self.minimap, 'toolplane': self.toolplane, 'sectors': self.sectors}
+
+    def _layout_anchor_names(self) -> List[str]:
+        names = []
+        for context in self._layout_contexts().values():
+            names.extend(context.anchor_names())
+        return names
+
+    def restore_layout(self, sc: Frame) -> bool:
+        """
+        Places the UI contexts from the layout cache when the cached anchors
+        are still where they were in `sc` (see core.layout_cache).
+
+        Returns:
+            bool: False when nothing cached fits and a calibration is needed.
+        """
+        ui_types = list(UIType)
+        if self.ui_type is not None:
+            ui_types.remove(self.ui_type)
+            ui_types.insert(0, self.ui_type)
+        for ui_type in ui_types:
+            layout = self.layout_cache.get(sc.size, ui_type.value, self._layout_fingerprint)
+            if layout is None:
+                continue
+            if not verify_layout(sc, layout, assets().image, contexts=self.LAYOUT_VERIFIED):
+                self.layout_cache.forget(sc.size, ui_type.value, self._layout_fingerprint)
+                continue
+            contexts = self._layout_contexts()
+            for name, anchors in layout.items():
+                contexts[name].place(anchors)
+            if ui_type != self.ui_type:
+                self.ui_type = ui_type
+                self.log.info(f'UI Type from layout cache: {self.ui_type.value}')
+            self.log.debug(f'Restored cached layout for {sc.size[0]}x{sc.size[1]}')
+            return True
+        return False
+
+    def calibrate(self, sc: Frame = None):
+        """
+        Locates every UI context with full-window matches and stores the
+        result in the layout cache.
+        """
+        sc = sc if sc is not None else self.get_frame().frame
+        if self.ui_type is None:
+            self.ui_type = self.get_ui_type()
+            self.log.info(f'UI Type detected: {self.ui_type.value}')
 
         match_jobs = [
             (self.minimap.find_matches, (sc,), {}),
@@ -1231,12 +1465,19 @@ class RuneLiteClient(GenericWindow):
             for f in futures:
                 f.result()
 
+        layout: Layout = {name: ctx.anchors() for name, ctx in self._layout_contexts().items()}
+        if all(m.confidence >= 0.8 for anchors in layout.values() for m in anchors.values()):
+            self.layout_cache.put(sc.size, self.ui_type.value, self._layout_fingerprint, layout)
+        else:
+            self.log.debug('Weak UI matches, layout not cached')
+
     def get_ui_type(self) -> 'UIType':
-        modern_toolplane = Image.open('data/ui/toolplane-modern.png')
-        classic_coolplane = Image.open('data/ui/toolplane-classic.png')
+        modern_toolplane = assets().image('toolplane-modern')
+        classic_coolplane = assets().image('toolplane-classic')
 
-        modern = self.find_in_window(modern_toolplane,self.screenshot)
-        classic = self.find_in_window(classic_coolplane,self.screenshot)
+        sc = as_frame(self.screenshot)
+        modern = self.find_in_window(modern_toolplane,sc,pyramid=True,use_prior=True)
+        classic = self.find_in_window(classic_coolplane,sc,pyramid=True,use_prior=True)
 
         return UIType.CLASSIC if classic.confidence > modern.confidence else UIType.MODERN
     
@@ -1247,7 +1488,9 @@ class RuneLiteClient(GenericWindow):
             minimap: bool = True,
             sidebar: bool = True
         ) -> Image.Image:
-        sc = self.get_screenshot()
+        # copy: the regions below are painted over and the capture buffer
+        # hands the same frame to other callers
+        sc = self.get_screenshot().copy()
         if toolplane:
             sc = self.sectors.toolplane.remove_from(sc)
             for variable in vars(self.toolplane):
@@ -1267,11 +1510,10 @@ class RuneLiteClient(GenericWindow):
             sc = sc.crop((0,0,end_tp+5,sc.height))
         return sc
 
-    def get_screenshot(self, filtered=False) -> Image.Image:
+    def get_screenshot(self, filtered=False, max_age_ms: float = 0) -> Image.Image:
         if filtered:
             return self.get_filtered_screenshot()
-        self._last_screenshot = super().get_screenshot(True)
-        return self._last_screenshot
+        return super().get_screenshot(True, max_age_ms)
     
     def find_chat_text(self,text):
         chat = self.sectors.chat
@@ -1325,80 +1567,22 @@ class RuneLiteClient(GenericWindow):
             ans = self.get_hover_text()
         return ans or ''
     
+    def _grab_window_box(self, box: Tuple[int, int, int, int]) -> Frame:
+        """Capture only `box` (window coordinates) into a Frame."""
+        x1, y1, x2, y2 = box
+        left, top = self.window.left, self.window.top
+        return self.hover_capture.grab((left + x1, top + y1, left + x2, top + y2)).frame
+
     @control.guard
     def get_action_hover(self) -> str:
         """
         Gets the hover text from the action bar below the cursor.
         """
         try:
-            h_start = ACTION_HOVER.crop((
-                0, 0, 
-                10, ACTION_HOVER.height
-            ))
-            h_end = ACTION_HOVER.crop((
-                ACTION_HOVER.width - 10, 0, 
-                ACTION_HOVER.width, ACTION_HOVER.height
-            ))
-
-            c_x, c_y = self.mouse_position()
-            sc = self.get_screenshot()
-
-            hover_box = MatchResult(
-                c_x - 45, c_y - 20, 
-                c_x + 20, c_y + 45
-            )
-
-            start = self.find_in_window(
-                h_start,
-                sub_match=hover_box,
-                min_scale=1, max_scale=1,
-                min_confidence=0.95
-            )
-            
-
-            end_x = min(self.window_match.end_x , start.start_x + 350)
-            end_y = min(self.window_match.end_y, start.start_y + 25)
-
-            hover_box = MatchResult(
-                start.start_x, start.start_y,
-                end_x, end_y
-            )
-            
-            end = self.find_in_window(
-                h_end,
-                sub_match=hover_box,
-                min_scale=1, max_scale=1,
-                min_confidence=0.95
-            )
-
-            action = MatchResult(
-                start.start_x, start.start_y,
-                end.end_x, end.end_y
-            )
-            action_img = action.crop_in(self.get_screenshot())
-            action_txt = tools.mask_above_color_value(
-                action_img,
-                threshold=150
-            )
-            ans = ocr.execute(
-                action_txt,
-                font=ocr.FontChoice.RUNESCAPE_PLAIN_11,
-                psm=ocr.TessPsm.SINGLE_LINE,
-                raise_on_blank=False,
-                preprocess=False
-            )
-            return ans
+            return self.hover.read(self.mouse_position(), (self.window.width, self.window.height))
         except Exception as e:
             return None
 
-
-
-
-        
-        
-
-
-        
     def click_chat_text(self,text):
         match = self.find_chat_text(text)
         self.click(match)
@@ -1420,8 +1604,8 @@ class RuneLiteClient(GenericWindow):
     @property
     def quick_prayer_active(self) -> bool:
         """Checks if the quick prayer is active in the RuneLite window."""
-        qp_disabled = Image.open("data/ui/quick-prayer-disabled.png")
-        qp_enabled = Image.open("data/ui/quick-prayer-enabled.png")
+        qp_disabled = assets().image('quick-prayer-disabled')
+        qp_enabled = assets().image('quick-prayer-enabled')
 
         self.get_screenshot()
         
@@ -1453,8 +1637,12 @@ class UISectors:
     """Represents UI sectors such as the toolplane and chat areas."""
     toolplane: MatchResult = None
     chat: MatchResult = None
+    TOOLPLANES = {UIType.MODERN: 'toolplane-modern', UIType.CLASSIC: 'toolplane-classic'}
 
-    def find_matches(self, sc: Image.Image, uitype: UIType):
+    def anchor_names(self) -> List[str]:
+        return list(self.TOOLPLANES.values()) + ['chat-top-left', 'chat-bottom-right']
+
+    def find_matches(self, sc: Image.Image | Frame, uitype: UIType):
         """
         Finds and sets the matches for UI sectors based on the UI type.
 
@@ -1463,29 +1651,42 @@ class UISectors:
             uitype (UIType): The type of UI (modern, classic, etc.).
         """
         # Determine the toolplane template based on the UI type
-        if uitype == UIType.MODERN:
-            toolplane = Image.open('data/ui/toolplane-modern.png')
-        else:
-            toolplane = Image.open('data/ui/toolplane-classic.png')
+        toolplane_name = self.TOOLPLANES.get(uitype, 'toolplane-classic')
+        toolplane = assets().image(toolplane_name)
         
         # Find the toolplane match
-        self.toolplane = find_subimage(
+        match_tp = find_subimage(
             sc, toolplane,
-            min_scale=1, max_scale=1
+            min_scale=1, max_scale=1,
+            pyramid=True
         )
 
         # Find the chat area matches
-        chat_bottom_right = Image.open('data/ui/chat-bottom-right.png')
-        chat_top_left = Image.open('data/ui/chat-top-left.png')
+        chat_bottom_right = assets().image('chat-bottom-right')
+        chat_top_left = assets().image('chat-top-left')
 
         match_br = find_subimage(
             sc, chat_bottom_right,
-            min_scale=1,max_scale=1
+            min_scale=1,max_scale=1,
+            pyramid=True
         )
         match_tl = find_subimage(
             sc, chat_top_left,
-            min_scale=1,max_scale=1
+            min_scale=1,max_scale=1,
+            pyramid=True
         )
+        self.place({
+            toolplane_name: match_tp,
+            'chat-top-left': match_tl,
+            'chat-bottom-right': match_br,
+        })
+
+    def place(self, anchors: Dict[str, MatchResult]):
+        """Sets the sectors from their anchor matches (as found by find_matches)."""
+        self._anchors = dict(anchors)
+        self.toolplane = next(anchors[n] for n in self.TOOLPLANES.values() if n in anchors)
+        match_tl = anchors['chat-top-left']
+        match_br = anchors['chat-bottom-right']
         self.chat = MatchResult(
             match_tl.start_x,
             match_tl.start_y,
@@ -1493,6 +1694,9 @@ class UISectors:
             match_br.end_y,
             confidence=(match_br.confidence + match_tl.confidence)/2
         )
+
+    def anchors(self) -> Dict[str, MatchResult]:
+        return dict(getattr(self, '_anchors', {}))
     
 
 class ToolplaneContext:
@@ -1512,33 +1716,36 @@ class ToolplaneContext:
     music:     MatchResult = None
 
     def __init__(self):
-        self._TEMPLATE_PATHS = {
-            "combat":    Path("data/ui/combat.webp"),
-            "skills":    Path("data/ui/stats.webp"),
-            "inventory": Path("data/ui/inventory.webp"),
-            "equipment": Path("data/ui/equipment.webp"),
-            "prayer":    Path("data/ui/prayer.webp"),
-            "spells":    Path("data/ui/spellbook.webp"),
-            "account":   Path("data/ui/account.webp"),
-            "logout":    Path("data/ui/logout.webp"),
-            "settings":  Path("data/ui/settings.webp"),
-            "emotes":    Path("data/ui/emotes.webp"),
-            "music":     Path("data/ui/music.webp"),
+        # tab -> asset name
+        self._TEMPLATE_NAMES = {
+            "combat":    "combat",
+            "skills":    "stats",
+            "inventory": "inventory",
+            "equipment": "equipment",
+            "prayer":    "prayer",
+            "spells":    "spellbook",
+            "account":   "account",
+            "logout":    "logout",
+            "settings":  "settings",
+            "emotes":    "emotes",
+            "music":     "music",
             # progress / groups / friends omitted for now
         }
-        self._TEMPLATE_CACHE = {k: Image.open(p) for k, p in self._TEMPLATE_PATHS.items()}
+        self._TEMPLATE_CACHE = {k: assets().image(n) for k, n in self._TEMPLATE_NAMES.items()}
 
 
     @timeit
-    def find_matches(self, screenshot: Image.Image, max_workers: int | None = 10):
+    def find_matches(self, screenshot: Image.Image | Frame, max_workers: int | None = 10):
         """
         Locate all tool-plane icons in *screenshot* concurrently.
         Results are assigned to the matching attributes (self.combat, …).
         """
         def _worker(name_img):
             name, tpl_img = name_img
+            # small icons fall back to the exhaustive search by themselves
             return name, find_subimage(
-                screenshot, tpl_img, min_scale=0.9, max_scale=1.1
+                screenshot, tpl_img, min_scale=0.9, max_scale=1.1,
+                pyramid=True
             )
 
         # ThreadPoolExecutor is ideal here because find_subimage is
@@ -1550,6 +1757,21 @@ class ToolplaneContext:
                 name, match = fut.result()
                 setattr(self, name, match)
 
+    def anchor_names(self) -> List[str]:
+        return list(self._TEMPLATE_NAMES.values())
+
+    def place(self, anchors: Dict[str, MatchResult]):
+        """Sets the tab matches from {asset name: match}."""
+        for tab, name in self._TEMPLATE_NAMES.items():
+            if name in anchors:
+                setattr(self, tab, anchors[name])
+
+    def anchors(self) -> Dict[str, MatchResult]:
+        return {
+            name: getattr(self, tab) for tab, name in self._TEMPLATE_NAMES.items()
+            if isinstance(getattr(self, tab), MatchResult)
+        }
+
     # ────────────────────────────────────────────────────────────────
     # helper: iterator of (name, template-image) pairs
     # ────────────────────────────────────────────────────────────────
@@ -1557,7 +1779,7 @@ class ToolplaneContext:
         return self._TEMPLATES.items() if "_TEMPLATES" in globals() else self._TEMPLATE_CACHE.items()
 
     def _is_tab_active(self,
-            screenshot: Image.Image,
+            screenshot: Image.Image | Frame,
             match: MatchResult,
             pad: int = 4,
         ) -> float:
@@ -1565,16 +1787,13 @@ class ToolplaneContext:
         Returns the fraction of pixels in the padded match box
         that fall into the 'red' HSV range.
         """
-        # Crop with padding
+        # Crop with padding (a view when given a Frame)
+        screenshot = as_frame(screenshot)
         x1 = max(match.start_x - pad, 0)
         y1 = max(match.start_y - pad, 0)
         x2 = min(match.end_x + pad, screenshot.width)
         y2 = min(match.end_y + pad, screenshot.height)
-        patch = screenshot.crop((x1, y1, x2, y2)).convert("RGB")
-        arr   = np.array(patch)
-
-        # Convert to HSV
-        hsv = cv2.cvtColor(arr, cv2.COLOR_RGB2HSV)
+        hsv = screenshot.crop((x1, y1, x2, y2)).hsv
         # Two red hue ranges
         lo1, hi1 = np.array([0, 50, 50]),  np.array([10, 255, 255])
         lo2, hi2 = np.array([160, 50, 50]), np.array([180, 255, 255])
@@ -1586,11 +1805,12 @@ class ToolplaneContext:
         return red_mask.mean() / 255.0
 
     @timeit
-    def get_active_tab(self, screenshot: Image.Image) -> str | None:
+    def get_active_tab(self, screenshot: Image.Image | Frame) -> str | None:
         """
         Returns the name of the active tab (highest red‐ratio),
         or None if no tab exceeds the threshold.
         """
+        screenshot = as_frame(screenshot)  # convert once for every tab
         best_tab = None
         best_score = 0.0
         for variable in vars(self):
@@ -1626,15 +1846,22 @@ class MinimapContext:
         
         return match
 
-    def get_minimap_stat(self,match: MatchResult, screenshot: Image.Image) -> int:
+    def get_minimap_stat(self,match: MatchResult, screenshot: Image.Image | Frame) -> int:
         """Returns the health value from the screenshot."""
         match = self.get_minimap_value_match(match)
         return match.extract_number(screenshot, ocr.FontChoice.RUNESCAPE_PLAIN_11)
     @timeit
-    def find_matches(self, screenshot: Image.Image):
+    def find_matches(self, screenshot: Image.Image | Frame):
         """Finds and sets the matches for health, prayer, run, and spec."""
 
-        map = find_subimage(screenshot, Image.open("data/ui/map.webp"))
+        self.place({'map': find_subimage(screenshot, assets().image('map'), pyramid=True)})
+
+    def anchor_names(self) -> List[str]:
+        return ['map']
+
+    def place(self, anchors: Dict[str, MatchResult]):
+        """Derives every minimap element from the globe match."""
+        map = anchors['map'].copy()
         map.shape = MatchShape.ELIPSE
         self.map = map.transform(-63, -60).scale_px(60)
         self.health = map.transform(-152, -76)
@@ -1652,6 +1879,9 @@ class MinimapContext:
                 match.end_x = m.end_x
                 m.end_y = m.end_y
         self.globe = map # blue globe thing
+
+    def anchors(self) -> Dict[str, MatchResult]:
+        return {'map': self.globe} if self.globe is not None else {}
                 
                 
 
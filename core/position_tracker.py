@@ -0,0 +1,205 @@
+"""
+Background player-position tracking.
+
+The game only moves the player on 600 ms ticks, so reading the position
+overlay on demand (and sleeping between retries) wastes most of its time.
+`PositionTracker` samples the overlay on its own thread at a fixed cadence
+locked to the tick grid, keeps a short timestamped history and notifies
+subscribers when the position changes. Consumers read `latest` without
+blocking.
+
+The tracker is generic: `sample()` returns the (masked) overlay pixels and
+`decode(pixels)` turns them into a position. Pixels identical to the last
+sample are not decoded again.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Generic, List, Optional, TypeVar
+
+import numpy as np
+
+from core.control import ScriptTerminationException
+from core.logger import get_logger
+
+P = TypeVar('P')
+
+GAME_TICK_S = 0.6
+
+
+@dataclass(frozen=True)
+class PositionSample(Generic[P]):
+    """A decoded position and when it was first / last seen."""
+    position: P
+    first_seen: float  # time.monotonic()
+    last_seen: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the overlay last confirmed this position."""
+        return time.monotonic() - self.last_seen
+
+
+class PositionTracker(Generic[P]):
+    """Tick-aligned sampler of the position overlay with change events."""
+
+    def __init__(
+            self,
+            sample: Callable[[], Optional[np.ndarray]],
+            decode: Callable[[np.ndarray], P],
+            samples_per_tick: int = 2,
+            history: int = 32,
+            clock: Callable[[], float] = time.monotonic
+        ):
+        """
+        Args:
+            sample: Returns the overlay pixels, or None when the overlay isn't
+                visible.
+            decode: Turns overlay pixels into a position; may raise.
+            samples_per_tick: Samples per 600 ms game tick.
+            history: Number of distinct positions remembered.
+        """
+        self.log = get_logger('PositionTracker')
+        self._sample = sample
+        self._decode = decode
+        self.period = GAME_TICK_S / max(1, samples_per_tick)
+        self._clock = clock
+        self._history: Deque[PositionSample[P]] = deque(maxlen=history)
+        self._listeners: List[Callable[[Optional[P], P], None]] = []
+        self._changed = threading.Condition()
+        self._changes = 0
+        self._last_digest: Optional[bytes] = None
+        self._anchor: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.decodes = 0
+        self.skipped = 0
+        self.errors = 0
+
+    # ---- consumers ------------------------------------------------------
+    @property
+    def latest(self) -> Optional[PositionSample[P]]:
+        """The most recent position, or None before the first read."""
+        with self._changed:
+            return self._history[-1] if self._history else None
+
+    def position(self, max_age: float = None) -> Optional[P]:
+        """Latest position, or None if there is none at most `max_age` seconds old."""
+        latest = self.latest
+        if latest is None or (max_age is not None and self._clock() - latest.last_seen > max_age):
+            return None
+        return latest.position
+
+    @property
+    def history(self) -> List[PositionSample[P]]:
+        """Distinct positions seen, oldest first."""
+        with self._changed:
+            return list(self._history)
+
+    def subscribe(self, callback: Callable[[Optional[P], P], None]) -> Callable[[], None]:
+        """
+        Call `callback(old, new)` on the tracker thread whenever the position
+        changes. Returns a function that unsubscribes.
+        """
+        self._listeners.append(callback)
+        return lambda: self._listeners.remove(callback) if callback in self._listeners else None
+
+    @property
+    def changes(self) -> int:
+        """Number of position changes seen so far."""
+        with self._changed:
+            return self._changes
+
+    def wait_for_change(self, timeout: float = None, since: int = None) -> Optional[P]:
+        """
+        Block until the position changes; returns the new one (None on
+        timeout). With `since` (a `changes` count), a change made after that
+        count returns at once, so no change slips by between the two calls.
+        """
+        with self._changed:
+            seen = self._changes if since is None else since
+            if not self._changed.wait_for(lambda: self._changes != seen, timeout):
+                return None
+            return self._history[-1].position
+
+    # ---- sampling -------------------------------------------------------
+    def step(self) -> Optional[P]:
+        """Take one sample; returns the current position (None if unknown)."""
+        pixels = self._sample()
+        now = self._clock()
+        if pixels is None:
+            return None
+        digest = hashlib.blake2b(np.ascontiguousarray(pixels).tobytes(), digest_size=16).digest()
+        if digest == self._last_digest:
+            self.skipped += 1
+            with self._changed:
+                latest = self._history[-1]
+                self._history[-1] = PositionSample(latest.position, latest.first_seen, now)
+                return latest.position
+
+        try:
+            position = self._decode(pixels)
+        except Exception as e:
+            self.errors += 1
+            self.log.debug(f'Failed to decode position overlay: {e}')
+            return None
+        self.decodes += 1
+        self._last_digest = digest
+
+        with self._changed:
+            previous = self._history[-1].position if self._history else None
+            if previous == position:
+                latest = self._history[-1]
+                self._history[-1] = PositionSample(position, latest.first_seen, now)
+                return position
+            self._history.append(PositionSample(position, now, now))
+            self._changes += 1
+            # the overlay updates on a tick boundary: line samples up with it
+            self._anchor = now
+            self._changed.notify_all()
+        for callback in list(self._listeners):
+            try:
+                callback(previous, position)
+            except Exception as e:
+                self.log.warning(f'Position listener failed: {e}')
+        return position
+
+    def next_sample_time(self, now: float) -> float:
+        """Next slot on the tick-aligned sampling grid after `now`."""
+        if self._anchor is None:
+            return now + self.period
+        periods = int((now - self._anchor) / self.period + 1e-9) + 1
+        return self._anchor + periods * self.period
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.step()
+            except ScriptTerminationException:
+                self.log.info('Term signaled, stopping position tracker.')
+                break
+            except Exception as e:
+                self.errors += 1
+                self.log.debug(f'Position sample failed: {e}')
+            self._stop.wait(max(0.0, self.next_sample_time(self._clock()) - self._clock()))
+
+    def start(self) -> 'PositionTracker[P]':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='position-tracker', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
@@ -18,6 +18,7 @@ from typing import Iterable, List, Sequence, Tuple, Optional
 from PIL import Image, ImageDraw
 
 from core import ocr
+from core.frame import Frame, as_frame
 
 # ────────────────────────────────
 # 0.   shared mixin / base class
@@ -59,22 +60,19 @@ class RegionMixin(ABC):
             draw.line(seg, fill=color, width=2)
         return img
 
-    def extract_number(self, img: Image.Image,
+    def extract_number(self, img: Image.Image | Frame,
                        font=ocr.FontChoice.AUTO) -> str:
         """OCR of whatever is inside the region (same pipeline as before)."""
-        sx, sy, ex, ey = self.bounding_box
-        rgba = np.array(img.crop((sx, sy, ex, ey)))
+        region = as_frame(img).crop(self.bounding_box)   # view, no copy
 
         # 1. colour mask (yellow text in your RuneScape HUD)
-        bgr = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR)
-        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv,
+        mask = cv2.inRange(region.hsv,
                            np.array([ 0,250,250], np.uint8),
                            np.array([65,255,255], np.uint8))
-        isolated = cv2.bitwise_and(rgba, rgba, mask=mask)
+        # masked-out pixels are 0 either way, so gray-then-mask == mask-then-gray
+        gray = cv2.bitwise_and(region.gray, region.gray, mask=mask)
 
         # 2. binarise → OCR
-        gray     = cv2.cvtColor(isolated, cv2.COLOR_RGBA2GRAY)
         _, thr   = cv2.threshold(gray,0,255,cv2.THRESH_BINARY|cv2.THRESH_OTSU)
         return ocr.get_number(Image.fromarray(thr), font=font, preprocess=False)
 
@@ -93,7 +91,7 @@ class RegionMixin(ABC):
         return self._shallow_copy(grow=pixels)
 
     # convenience
-    def crop_in(self, img: Image.Image) -> Image.Image:
+    def crop_in(self, img: Image.Image | Frame) -> Image.Image | Frame:
         sx, sy, ex, ey = self.bounding_box
         return img.crop((sx, sy, ex, ey))
 
@@ -0,0 +1,84 @@
+"""
+Location priors for template searches.
+
+Most UI anchors (position overlay, chat corners, bank frame, right-click
+header, ...) sit at the same spot frame after frame, so a full-window
+`find_subimage` for them is mostly wasted work. `LocationPriors` remembers
+where each template was last found, keyed by the template's content digest
+and the size of the image it was searched in, and lets the caller re-match
+inside a small padded region around that spot first.
+
+A prior is only trusted while the ROI match stays about as good as the hit
+that created it; anything worse means the element moved (or vanished) and
+the caller should fall back to a full search. Priors are dropped whenever
+the window geometry changes.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from core.region_match import MatchResult
+from core.template_cache import get_template
+
+PriorKey = Tuple[str, Tuple[int, int]]
+
+
+class LocationPriors:
+    """Last known match per (template, parent size)."""
+
+    def __init__(self, pad: int = 8, tolerance: float = 0.02):
+        """
+        Args:
+            pad: Pixels added around the last hit to form the search ROI.
+            tolerance: How far below the recorded confidence an ROI match may
+                fall before the prior is considered stale.
+        """
+        self.pad = pad
+        self.tolerance = tolerance
+        self._priors: Dict[PriorKey, MatchResult] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(template: Image.Image, parent_size: Tuple[int, int]) -> PriorKey:
+        return get_template(template).digest, tuple(parent_size)
+
+    def get(self, template: Image.Image, parent_size: Tuple[int, int]) -> Optional[MatchResult]:
+        with self._lock:
+            return self._priors.get(self.key(template, parent_size))
+
+    def roi(self, prior: MatchResult, parent_size: Tuple[int, int], max_scale: float = 1.0) -> MatchResult:
+        """Padded search region around `prior`, clamped to the parent."""
+        w, h = parent_size
+        grow_x = self.pad + int(prior.width * max(0.0, max_scale - prior.scale))
+        grow_y = self.pad + int(prior.height * max(0.0, max_scale - prior.scale))
+        return MatchResult(
+            max(0, prior.start_x - grow_x),
+            max(0, prior.start_y - grow_y),
+            min(w, prior.end_x + grow_x),
+            min(h, prior.end_y + grow_y)
+        )
+
+    def accepts(self, prior: MatchResult, match: MatchResult, min_confidence: float) -> bool:
+        """True when an ROI match is good enough to skip the full search."""
+        return match.confidence >= max(min_confidence, prior.confidence - self.tolerance)
+
+    def record(self, template: Image.Image, parent_size: Tuple[int, int], match: MatchResult):
+        with self._lock:
+            self._priors[self.key(template, parent_size)] = match.copy()
+
+    def forget(self, template: Image.Image, parent_size: Tuple[int, int]):
+        with self._lock:
+            self._priors.pop(self.key(template, parent_size), None)
+
+    def clear(self):
+        """Drop every prior (call when the window moves or resizes)."""
+        with self._lock:
+            self._priors.clear()
+
+    def __len__(self) -> int:
+        return len(self._priors)
@@ -0,0 +1,179 @@
+"""
+Preprocessed template registry for the matching helpers.
+
+Preparing a template for `cv2.matchTemplate` (RGBA conversion, BGR / gray
+conversion, alpha-mask extraction and one resize per scale) costs more than
+the match itself for small UI icons, and the same handful of templates is
+matched thousands of times per session. `TemplateCache` does that work once
+per template and keeps the results in a bounded LRU:
+
+  * entries are keyed by a digest of the template pixels, so two identical
+    images loaded separately share one entry;
+  * a per-object shortcut (weak reference -> digest) skips re-hashing the
+    same PIL image on every call;
+  * resized BGR / mask variants are memoised per scale step;
+  * fully opaque templates are flagged so callers can use the faster
+    unmasked `matchTemplate` (same scores for the normalised correlation
+    methods; see UNMASKED_OK_METHODS).
+
+Templates are treated as immutable; don't paint into an image after it has
+been used as a template.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Methods whose unmasked scores equal the all-opaque masked ones. The SQDIFF
+# variants diverge on flat regions, so they always go through the mask.
+UNMASKED_OK_METHODS = (cv2.TM_CCORR_NORMED, cv2.TM_CCOEFF_NORMED)
+
+
+class PreparedTemplate:
+    """BGR / gray / mask arrays of one template plus its per-scale variants."""
+
+    def __init__(self, template: Image.Image, digest: str):
+        rgba = np.array(template.convert("RGBA"))
+        self.digest = digest
+        self.bgr = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR)
+        self.mask = rgba[:, :, 3]  # alpha channel: 0 = transparent, 255 = opaque
+        self.opaque = bool(self.mask.min() == 255)
+        self._gray: Optional[np.ndarray] = None
+        self._scaled: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def width(self) -> int:
+        return self.bgr.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.bgr.shape[0]
+
+    @property
+    def gray(self) -> np.ndarray:
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    def scaled(self, scale: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (bgr, mask) resized by `scale`.
+        Sizes follow find_subimage: int(side * scale).
+        """
+        key = round(scale, 4)
+        variant = self._scaled.get(key)
+        if variant is not None:
+            return variant
+
+        if key == 1.0:
+            bgr, mask = self.bgr, self.mask
+        else:
+            w = int(self.width * scale)
+            h = int(self.height * scale)
+            bgr = cv2.resize(self.bgr, (w, h),
+                             interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC)
+            mask = cv2.resize(self.mask, (w, h), interpolation=cv2.INTER_NEAREST)
+        variant = (bgr, mask)
+        with self._lock:
+            self._scaled[key] = variant
+        return variant
+
+
+class TemplateCache:
+    """Bounded LRU of `PreparedTemplate`s, keyed by template content."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, PreparedTemplate] = OrderedDict()
+        # never evicted (registered UI assets, see core.assets)
+        self._pinned: Dict[str, PreparedTemplate] = {}
+        self._by_id: Dict[int, Tuple[weakref.ref, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(template: Image.Image) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{template.mode}:{template.size}".encode())
+        h.update(template.tobytes())
+        return h.hexdigest()
+
+    def _digest_for(self, template: Image.Image) -> str:
+        key = id(template)
+        known = self._by_id.get(key)
+        if known is not None and known[0]() is template:
+            return known[1]
+
+        digest = self.digest(template)
+        try:
+            ref = weakref.ref(template, lambda _, k=key: self._by_id.pop(k, None))
+        except TypeError:
+            return digest
+        self._by_id[key] = (ref, digest)
+        return digest
+
+    def get(self, template: Image.Image) -> PreparedTemplate:
+        """Return the prepared form of `template`, building it on first use."""
+        digest = self._digest_for(template)
+        with self._lock:
+            entry = self._pinned.get(digest)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = PreparedTemplate(template, digest)
+        with self._lock:
+            entry = self._entries.setdefault(digest, entry)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def pin(self, template: Image.Image) -> PreparedTemplate:
+        """Prepare `template` and keep it out of the LRU for the life of the process."""
+        digest = self._digest_for(template)
+        with self._lock:
+            entry = self._pinned.get(digest) or self._entries.pop(digest, None)
+            if entry is None:
+                self.misses += 1
+                entry = PreparedTemplate(template, digest)
+            self._pinned[digest] = entry
+        return entry
+
+    def clear(self):
+        """Drop the LRU entries (pinned templates stay)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_id.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache = TemplateCache()
+
+
+def get_template(template: Image.Image) -> PreparedTemplate:
+    """Prepared template from the shared process-wide cache."""
+    return _default_cache.get(template)
+
+
+def template_cache() -> TemplateCache:
+    """The shared process-wide TemplateCache."""
+    return _default_cache
@@ -1,166 +1,358 @@
 import cv2
 import numpy as np
-from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageChops
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
 from dataclasses import dataclass
 from enum import Enum
 from core import ocr
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Dict, Hashable, TypeVar
 from core.region_match import MatchResult, ShapeResult, MatchShape
+from core.frame import Frame, as_frame
+from core.color_mask import mask_colors_array, mask_above_array
+from core.template_cache import get_template, UNMASKED_OK_METHODS
 from functools import wraps
 # Add this import (safe even if not enabled; enqueue is a no-op until enable() is called)
 from core import cv_debug
 from io import BytesIO
 import base64
 from core.logger import get_logger
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import os
 
+K = TypeVar('K', bound=Hashable)
 
 
-def find_subimage(parent: Image.Image,
+
+def find_subimage(parent: Image.Image | Frame,
                   template: Image.Image,
                   min_scale: float = 1,
                   max_scale: float = 1,
                   scale_step: float = 0.1,
-                  method=cv2.TM_CCORR_NORMED
+                  method=cv2.TM_CCORR_NORMED,
+                  pyramid: bool = False,
+                  top_k: int = 4
                   ) -> MatchResult:
     """
     Search `parent` for the best match to `template`, ignoring transparent pixels
     and trying scales from min_scale to max_scale in increments of scale_step.
     Returns the MatchResult at the scale & location with highest confidence.
+    `parent` may be a PIL image or a Frame (whose BGR view is reused as-is).
+
+    With `pyramid`, candidates are first located on a 2x or 4x downscaled copy
+    of the parent and only the `top_k` best are refined at full resolution.
+    Templates too small to survive downscaling use the exhaustive search.
     """
-    # --- prepare parent image as BGR ---
-    parent_rgba = np.array(parent.convert("RGBA"))
-    parent_bgr  = cv2.cvtColor(parent_rgba, cv2.COLOR_RGBA2BGR)
+    parent_frame = as_frame(parent)
+    if pyramid:
+        best = _find_subimage_pyramid(parent_frame, template, min_scale, max_scale, scale_step, method, top_k)
+    else:
+        best = _find_subimage_bgr(parent_frame.bgr, template, min_scale, max_scale, scale_step, method)
 
-    # --- prepare template + mask from its alpha channel ---
-    tpl_rgba = np.array(template.convert("RGBA"))
-    tpl_bgr  = cv2.cvtColor(tpl_rgba, cv2.COLOR_RGBA2BGR)
-    tpl_mask = tpl_rgba[:, :, 3]  # alpha channel: 0 = transparent, 255 = opaque
+    # Non-blocking debug enqueue; does nothing unless cv_debug.enable() was called.
+    try:
+        cv_debug.enqueue_match(parent, template, best)
+    except Exception:
+        pass
 
-    best = MatchResult(0, 0, 0, 0, confidence=-1.0, scale=1.0)
+    return best
+
+
+def _response_maps(parent_bgr: np.ndarray,
+                   template: Image.Image,
+                   min_scale: float,
+                   max_scale: float,
+                   scale_step: float,
+                   method):
+    """
+    Yield (scale, w, h, confidence_map) for every scale at which `template`
+    fits inside `parent_bgr`. Higher confidence is always better (SQDIFF
+    scores are inverted) and NaN / inf entries are mapped to -1.
+    """
+    # --- template + mask come prepared (and per-scale memoised) from the cache ---
+    prepared = get_template(template)
     parent_h, parent_w = parent_bgr.shape[:2]
 
     # loop over scales
     scale = min_scale
     while scale <= max_scale + 1e-6:
         # compute new size
-        w = int(tpl_bgr.shape[1] * scale)
-        h = int(tpl_bgr.shape[0] * scale)
+        w = int(prepared.width * scale)
+        h = int(prepared.height * scale)
         # skip if template is larger than parent
         if 1 < w < parent_w and 1 < h < parent_h:
-            resized_tpl  = cv2.resize(tpl_bgr, (w, h),
-                                      interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC)
-            resized_mask = cv2.resize(tpl_mask, (w, h), interpolation=cv2.INTER_NEAREST)
-
-            # matchTemplate with mask (only works for SQDIFF or CCORR_NORMED)
-            result = cv2.matchTemplate(parent_bgr,
-                                       resized_tpl,
-                                       method,
-                                       mask=resized_mask)
-            
-            result = np.nan_to_num(result, nan=-1.0, posinf=-1.0, neginf=-1.0)
+            resized_tpl, resized_mask = prepared.scaled(scale)
+            h, w = resized_tpl.shape[:2]
 
-            # get best match
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            if method in (cv2.TM_CCORR_NORMED, cv2.TM_CCOEFF_NORMED):
-                confidence = max_val
-                top_left   = max_loc
+            # matchTemplate with mask (only works for SQDIFF or CCORR_NORMED);
+            # fully opaque templates skip the mask where that scores the same
+            if prepared.opaque and method in UNMASKED_OK_METHODS:
+                result = cv2.matchTemplate(parent_bgr, resized_tpl, method)
             else:
+                result = cv2.matchTemplate(parent_bgr,
+                                           resized_tpl,
+                                           method,
+                                           mask=resized_mask)
+
+            result = np.nan_to_num(result, nan=-1.0, posinf=-1.0, neginf=-1.0)
+            if method not in (cv2.TM_CCORR_NORMED, cv2.TM_CCOEFF_NORMED):
                 # TM_SQDIFF variants: lower = better, so invert
-                confidence = 1.0 - min_val
-                top_left   = min_loc
-                
-            if confidence > best.confidence:
-                best = MatchResult(
-                    start_x=top_left[0],
-                    start_y=top_left[1],
-                    end_x=top_left[0] + w,
-                    end_y=top_left[1] + h,
-                    confidence=confidence,
-                    scale=scale
-                )
+                result = 1.0 - result
+            yield scale, w, h, result
 
         scale += scale_step
 
+
+def _find_subimage_bgr(parent_bgr: np.ndarray,
+                       template: Image.Image,
+                       min_scale: float,
+                       max_scale: float,
+                       scale_step: float,
+                       method) -> MatchResult:
+    """find_subimage on an already prepared BGR parent array."""
+    best = MatchResult(0, 0, 0, 0, confidence=-1.0, scale=1.0)
+
+    for scale, w, h, result in _response_maps(parent_bgr, template, min_scale, max_scale, scale_step, method):
+        # get best match
+        _, confidence, _, top_left = cv2.minMaxLoc(result)
+        if confidence > best.confidence:
+            best = MatchResult(
+                start_x=top_left[0],
+                start_y=top_left[1],
+                end_x=top_left[0] + w,
+                end_y=top_left[1] + h,
+                confidence=confidence,
+                scale=scale
+            )
+
     if best.confidence < 0:
         raise ValueError("No valid match found (template never fit inside parent).")
 
-    # Non-blocking debug enqueue; does nothing unless cv_debug.enable() was called.
-    try:
-        cv_debug.enqueue_match(parent, template, best)
-    except Exception:
-        pass
+    return best
+
 
+PYRAMID_FACTORS = (4, 2)  # downscale factors tried, largest first
+PYRAMID_MIN_SIDE = 10     # smallest downscaled template side worth matching coarsely
+
+
+def _find_subimage_pyramid(parent: Frame,
+                           template: Image.Image,
+                           min_scale: float,
+                           max_scale: float,
+                           scale_step: float,
+                           method,
+                           top_k: int) -> MatchResult:
+    """
+    Coarse-to-fine find_subimage: match every scale on a downscaled parent,
+    keep the `top_k` strongest spatially distinct peaks, then rerun the full
+    scale range at full resolution in a small window around each peak.
+    Coarse peaks are ranked with TM_CCOEFF_NORMED whatever `method` is: at
+    low resolution plain correlation is close to 1 almost everywhere on
+    smooth backgrounds. The final score always comes from `method`.
+    """
+    prepared = get_template(template)
+    min_side = min(prepared.width, prepared.height) * min_scale
+    f = next((f for f in PYRAMID_FACTORS if min_side / f >= PYRAMID_MIN_SIDE), None)
+    if f is None:
+        return _find_subimage_bgr(parent.bgr, template, min_scale, max_scale, scale_step, method)
+
+    # --- coarse: one response map per scale on the small parent ---
+    small = parent.downscaled(f)
+    xs, ys, confs = [], [], []
+    for _, _, _, result in _response_maps(small, template, min_scale / f, max_scale / f, scale_step / f, cv2.TM_CCOEFF_NORMED):
+        peaks = result >= cv2.dilate(result, np.ones((3, 3), np.uint8))
+        py, px = np.nonzero(peaks)
+        xs.append(px * f)
+        ys.append(py * f)
+        confs.append(result[py, px])
+
+    if not confs:
+        return _find_subimage_bgr(parent.bgr, template, min_scale, max_scale, scale_step, method)
+
+    # refine windows must absorb the coarse rounding and the drift of the
+    # top-left corner between neighbouring scales
+    max_w = int(prepared.width * max_scale)
+    max_h = int(prepared.height * max_scale)
+    pad = 2 * f + 1 + int(np.ceil(max(max_w, max_h) * scale_step))
+
+    # strongest peaks first; a peak inside an accepted window adds nothing
+    xs, ys, confs = np.concatenate(xs), np.concatenate(ys), np.concatenate(confs)
+    candidates: List[Tuple[int, int]] = []
+    for i in np.argsort(confs)[::-1]:
+        x, y = int(xs[i]), int(ys[i])
+        if all(abs(x - cx) > pad or abs(y - cy) > pad for cx, cy in candidates):
+            candidates.append((x, y))
+            if len(candidates) >= top_k:
+                break
+
+    # --- fine: exhaustive search restricted to a window around each peak ---
+    parent_bgr = parent.bgr
+    parent_h, parent_w = parent_bgr.shape[:2]
+    best = MatchResult(0, 0, 0, 0, confidence=-1.0, scale=1.0)
+    for x, y in candidates:
+        sx, sy = max(0, x - pad), max(0, y - pad)
+        ex, ey = min(parent_w, x + max_w + pad), min(parent_h, y + max_h + pad)
+        try:
+            m = _find_subimage_bgr(parent_bgr[sy:ey, sx:ex], template, min_scale, max_scale, scale_step, method)
+        except ValueError:
+            continue
+        if m.confidence > best.confidence:
+            best = m.transform(sx, sy)
+
+    if best.confidence < 0:
+        return _find_subimage_bgr(parent_bgr, template, min_scale, max_scale, scale_step, method)
     return best
 
+
+def _find_peaks_bgr(parent_bgr: np.ndarray,
+                    template: Image.Image,
+                    min_scale: float,
+                    max_scale: float,
+                    scale_step: float,
+                    method,
+                    min_confidence: float,
+                    max_count: int,
+                    max_overlap: float = 0.25) -> List[MatchResult]:
+    """
+    Every match of `template` from one response map per scale.
+
+    Candidates are the local maxima (3x3) scoring at least `min_confidence`
+    on any scale. They are accepted greedily by descending confidence; a
+    candidate is dropped when it covers more than `max_overlap` of the
+    smaller of itself and an already accepted box.
+    """
+    xs, ys, ws, hs, confs, scales = [], [], [], [], [], []
+    fitted = False
+    for scale, w, h, result in _response_maps(parent_bgr, template, min_scale, max_scale, scale_step, method):
+        fitted = True
+        peaks = (result >= min_confidence) & (result >= cv2.dilate(result, np.ones((3, 3), np.uint8)))
+        py, px = np.nonzero(peaks)
+        xs.append(px)
+        ys.append(py)
+        ws.append(np.full(len(px), w))
+        hs.append(np.full(len(px), h))
+        confs.append(result[py, px])
+        scales.append(np.full(len(px), scale))
+
+    if not fitted:
+        raise ValueError("No valid match found (template never fit inside parent).")
+
+    x1, y1 = np.concatenate(xs), np.concatenate(ys)
+    x2, y2 = x1 + np.concatenate(ws), y1 + np.concatenate(hs)
+    conf, scale = np.concatenate(confs), np.concatenate(scales)
+    area = (x2 - x1) * (y2 - y1)
+    alive = np.ones(len(conf), dtype=bool)
+
+    answers = []
+    while len(answers) < max_count and alive.any():
+        i = int(np.argmax(np.where(alive, conf, -np.inf)))
+        answers.append(MatchResult(
+            start_x=int(x1[i]),
+            start_y=int(y1[i]),
+            end_x=int(x2[i]),
+            end_y=int(y2[i]),
+            confidence=float(conf[i]),
+            scale=float(scale[i])
+        ))
+        iw = np.clip(np.minimum(x2, x2[i]) - np.maximum(x1, x1[i]), 0, None)
+        ih = np.clip(np.minimum(y2, y2[i]) - np.maximum(y1, y1[i]), 0, None)
+        alive &= (iw * ih) <= max_overlap * np.minimum(area, area[i])
+    return answers
+
+
 def find_subimages(
-    parent: Image.Image,
+    parent: Image.Image | Frame,
     template: Image.Image,
     min_scale: float = 1,
     max_scale: float = 1,
     scale_step: float = 0.1,
     method=cv2.TM_CCORR_NORMED,
     min_confidence: float = 0.5,
-    max_count: int = 9999
+    max_count: int = 9999,
+    single_pass: bool = True
 ) -> List[MatchResult]:
+    """
+    Find every occurrence of `template` in `parent`, best match first.
+
+    With `single_pass` (default) the response map of each scale is computed
+    once and all peaks above `min_confidence` are extracted with non-maximum
+    suppression. `single_pass=False` keeps the legacy behaviour of blacking
+    out each match and re-running the full search for the next one.
+    """
+    if single_pass:
+        return _find_peaks_bgr(
+            as_frame(parent).bgr, template, min_scale, max_scale, scale_step,
+            method, min_confidence, max_count
+        )
+
     answers = []
-    parent = parent.copy()
-    m = find_subimage(
-        parent=parent,
-        template=template,
-        min_scale=min_scale,
-        max_scale=max_scale,
-        scale_step=scale_step,
-        method=method
-    )
+    # convert once; found matches are blacked out directly in the array
+    parent_bgr = as_frame(parent).bgr.copy()
+    m = _find_subimage_bgr(parent_bgr, template, min_scale, max_scale, scale_step, method)
     while m.confidence >= min_confidence and max_count > len(answers):
         answers.append(m)
-        # remove the found match from the parent image
-        parent = m.remove_from(parent)
+        # remove the found match from the parent (inclusive box, like remove_from)
+        parent_bgr[max(m.start_y, 0):m.end_y + 1, max(m.start_x, 0):m.end_x + 1] = 0
         # find the next match in the updated parent image
-        m = find_subimage(
-            parent=parent,
-            template=template,
-            min_scale=min_scale,
-            max_scale=max_scale,
-            scale_step=scale_step,
-            method=method
-        )
+        m = _find_subimage_bgr(parent_bgr, template, min_scale, max_scale, scale_step, method)
     return answers
 
+_match_pool: Optional[ThreadPoolExecutor] = None
+_match_pool_lock = threading.Lock()
+
+
+def _get_match_pool() -> ThreadPoolExecutor:
+    """Process-wide worker pool for batched matching (OpenCV releases the GIL)."""
+    global _match_pool
+    with _match_pool_lock:
+        if _match_pool is None:
+            _match_pool = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 4,
+                thread_name_prefix='match'
+            )
+        return _match_pool
+
+
+def find_subimages_batch(
+    parent: Image.Image | Frame,
+    templates: Dict[K, Image.Image],
+    min_scale: float = 1,
+    max_scale: float = 1,
+    scale_step: float = 0.1,
+    method=cv2.TM_CCORR_NORMED,
+    min_confidence: float = 0.5,
+    max_count: int = 9999
+) -> Dict[K, List[MatchResult]]:
+    """
+    `find_subimages` for many templates against one parent.
+
+    The parent is converted once and every template is matched in parallel
+    on a shared thread pool. Returns {key: matches} in the order of
+    `templates`, each list best match first.
+    """
+    parent_bgr = as_frame(parent).bgr
+    pool = _get_match_pool()
+    futures = {
+        key: pool.submit(
+            _find_peaks_bgr, parent_bgr, template, min_scale, max_scale,
+            scale_step, method, min_confidence, max_count
+        )
+        for key, template in templates.items()
+    }
+    return {key: fut.result() for key, fut in futures.items()}
+
 
 def mask_colors(
-        image: Image.Image, 
-        colors: List[Tuple[int, int, int]], 
+        image: Image.Image | Frame,
+        colors: List[Tuple[int, int, int]],
         tolerance: int = 30
     ) -> Image.Image:
     """
     Create a mask for the specified colors in the image.
     The mask will be a new image where pixels matching the specified colors
     are set to white, and all other pixels are set to black.
+    Use `color_mask.mask_colors_array` to skip the conversion back to PIL.
     """
-    mask = Image.new("L", image.size, 0)  # Create a black mask
-
-    for color in colors:
-        # Create a color range for the mask
-        r, g, b = color
-        lower_bound = (max(0, r - tolerance), max(0, g - tolerance), max(0, b - tolerance))
-        upper_bound = (min(255, r + tolerance), min(255, g + tolerance), min(255, b + tolerance))
-
-        # Create a temporary image to find the matching pixels
-        temp_image = image.convert("RGB")
-        temp_mask = Image.new("L", image.size, 0)
-
-        for x in range(temp_image.width):
-            for y in range(temp_image.height):
-                pixel = temp_image.getpixel((x, y))
-                if (lower_bound[0] <= pixel[0] <= upper_bound[0] and
-                    lower_bound[1] <= pixel[1] <= upper_bound[1] and
-                    lower_bound[2] <= pixel[2] <= upper_bound[2]):
-                    temp_mask.putpixel((x, y), 255)
-
-        # Combine the temporary mask with the main mask for each color
-        mask = ImageChops.lighter(mask, temp_mask)
-    return mask.convert("L")  # Convert to binary mask (black and white)
+    return Image.fromarray(mask_colors_array(image, colors, tolerance))
     
 
 
@@ -230,7 +422,7 @@ def _order_box(pts: np.ndarray) -> list[tuple[int, int]]:
 
 # ───────────────────────────────────────────────────────────────────────
 def find_color_box(
-    pil_img: Image.Image,
+    pil_img: Image.Image | Frame,
     target_rgb: Tuple[int, int, int],
     tol: int = 40,
 ) -> ShapeResult:
@@ -240,7 +432,7 @@ def find_color_box(
     Works for both axis‑aligned and rotated rectangles.
     """
     # 1. colour mask ────────────────────────────────────────────────────
-    arr = np.asarray(pil_img.convert("RGB"))
+    arr = as_frame(pil_img).rgb
     diff = np.abs(arr - np.array(target_rgb))
     mask = np.all(diff <= tol, axis=2) if tol else np.all(arr == target_rgb, axis=2)
 
@@ -306,23 +498,14 @@ def find_color_box(
 
 
 def mask_above_color_value(
-        image: Image.Image,
+        image: Image.Image | Frame,
         threshold: int = 200,
 ):
     """
     Create a mask for pixels in the image that have a color value above the specified threshold.
     The mask will be a new image where pixels above the threshold are set to white, and all other pixels are set to black.
     """
-    # Create a binary mask based on the threshold for RGB channels
-    mask = Image.new("L", image.size, 0)  # Create a black mask
-
-    for x in range(image.width):
-        for y in range(image.height):
-            r, g, b = image.getpixel((x, y))
-            if r > threshold or g > threshold or b > threshold:
-                mask.putpixel((x, y), 255)
-
-    return mask.convert("L")
+    return Image.fromarray(mask_above_array(image, threshold))
 
 
 def calculate_color_percentage(
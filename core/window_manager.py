@@ -4,8 +4,6 @@ Provides window manipulation functionality across Windows, macOS, and Linux.
 """
 
 import sys
-from turtle import title
-import pyautogui
 import time
 import keyboard
 import importlib
@@ -18,6 +16,12 @@ IS_LINUX = sys.platform.startswith('linux')
 
 log = get_logger("OSWindow")
 
+
+def _screen_size():
+    """(width, height) of the primary screen; pyautogui is imported on first use."""
+    import pyautogui
+    return pyautogui.size()
+
 class WindowManager:
     """Cross-platform window management"""
     
@@ -62,7 +66,7 @@ class BasicWindow:
     
     def __init__(self, title):
         self.title = title
-        screen_size = pyautogui.size()
+        screen_size = _screen_size()
         self.left = 0
         self.top = 0
         self.width = screen_size[0]
@@ -226,14 +230,14 @@ class MacWindow:
     def width(self):
         """Return the width of the window"""
         # Get screen size as a fallback for macOS
-        screen = pyautogui.size()
+        screen = _screen_size()
         return screen[0]
     
     @property
     def height(self):
         """Return the height of the window"""
         # Get screen size as a fallback for macOS
-        screen = pyautogui.size()
+        screen = _screen_size()
         return screen[1]
     
     @property
@@ -372,7 +376,7 @@ class LinuxWindow:
             return geom.width
         except Exception:
             # Fallback to screen width
-            return pyautogui.size()[0]
+            return _screen_size()[0]
     
     @property
     def height(self):
@@ -382,7 +386,7 @@ class LinuxWindow:
             return geom.height
         except Exception:
             # Fallback to screen height
-            return pyautogui.size()[1]
+            return _screen_size()[1]
     
     @property
     def left(self):
@@ -390,7 +394,7 @@ class LinuxWindow:
         try:
             # Try translate_coords first
             x, y, _ = self.window.translate_coords(self.root, 0, 0)
-            return max(0, min(pyautogui.size()[0] - 1, x))
+            return max(0, min(_screen_size()[0] - 1, x))
         except Exception:
             # Fallback to traversing window tree
             return self._get_window_x_position()
@@ -401,7 +405,7 @@ class LinuxWindow:
         try:
             # Try translate_coords first
             x, y, _ = self.window.translate_coords(self.root, 0, 0)
-            return max(0, min(pyautogui.size()[1] - 1, y))
+            return max(0, min(_screen_size()[1] - 1, y))
         except Exception:
             # Fallback to traversing window tree
             return self._get_window_y_position()
@@ -434,7 +438,7 @@ class LinuxWindow:
                 x += parent_geom.x
                 parent = parent.query_tree().parent
             
-            return max(0, min(pyautogui.size()[0] - 1, x))
+            return max(0, min(_screen_size()[0] - 1, x))
         except Exception as e:
             log.error(f"Error getting window X position: {e}")
             return 0
@@ -452,7 +456,7 @@ class LinuxWindow:
                 y += parent_geom.y
                 parent = parent.query_tree().parent
             
-            return max(0, min(pyautogui.size()[1] - 1, y))
+            return max(0, min(_screen_size()[1] - 1, y))
         except Exception as e:
             log.error(f"Error getting window Y position: {e}")
             return 0
@@ -66,15 +66,15 @@ def drop_items(items:List[str]):
     sc = client.get_screenshot()
     tp = client.sectors.toolplane
     sc = tp.crop_in(sc)
-    matches: List[tools.MatchResult] = []
+    icons = {}
     for item in items:
         item_icon = db.get_item_by_name(item).icon
         if not item_icon:
             print(f"Item icon for '{item}' not found.")
             continue
-        matches += tools.find_subimages(
-            sc, item_icon, min_confidence=.99
-        )
+        icons[item] = item_icon
+    found = tools.find_subimages_batch(sc, icons, min_confidence=.99)
+    matches: List[tools.MatchResult] = [m for ms in found.values() for m in ms]
     matches.sort(
         key=lambda x: x.start_x, 
         reverse=random.choice([True, False])
@@ -34,7 +34,7 @@ def index():
     """Serve the main page."""
     items = {
         item.id: {"name": item.name, "icon_b64": item.icon_b64}
-        for item in item_lookup._items_by_id.values()
+        for item in item_lookup.all_items()
     }
 
     template = """
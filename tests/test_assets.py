@@ -0,0 +1,89 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.assets import AssetRegistry
+from core.template_cache import template_cache
+
+
+@pytest.fixture
+def ui_dir(tmp_path):
+    root = tmp_path / 'ui'
+    (root / 'pots').mkdir(parents=True)
+    Image.new('RGBA', (12, 8), (200, 10, 10, 255)).save(root / 'button.png')
+    Image.new('RGB', (6, 6), (10, 200, 10)).save(root / 'pots' / 'green.png')
+    Image.new('P', (5, 7), 3).save(root / 'pots' / 'palette.png')
+    Image.new('L', (4, 4), 90).save(root / 'pots' / 'gray.webp')
+    return root
+
+
+def test_names_and_shared_handles(ui_dir):
+    registry = AssetRegistry(str(ui_dir), atlas=None)
+    assert registry.names() == ['button', 'pots/gray', 'pots/green', 'pots/palette']
+    assert registry.names('pots/') == ['pots/gray', 'pots/green', 'pots/palette']
+    assert 'button' in registry
+
+    asset = registry.get('button')
+    assert asset.size == (12, 8)
+    assert asset.bgr.shape == (8, 12, 3)
+    assert registry.get('button') is asset
+    assert registry.image('button') is asset.image
+    # palette images come back as RGBA
+    assert registry.image('pots/palette').mode == 'RGBA'
+
+
+def test_unknown_asset(ui_dir):
+    registry = AssetRegistry(str(ui_dir), atlas=None)
+    with pytest.raises(KeyError):
+        registry.get('missing')
+
+
+def test_assets_stay_pinned_across_cache_clear(ui_dir):
+    registry = AssetRegistry(str(ui_dir), atlas=None)
+    prepared = registry.get('pots/green').template
+    template_cache().clear()
+    assert template_cache().get(registry.image('pots/green')) is prepared
+
+
+def test_atlas_round_trip(ui_dir, tmp_path):
+    atlas = str(tmp_path / 'atlas.npz')
+    AssetRegistry(str(ui_dir), atlas=atlas).save_atlas()
+
+    from_disk = AssetRegistry(str(ui_dir), atlas=None)
+    from_atlas = AssetRegistry(str(ui_dir), atlas=atlas)
+    assert from_atlas.preload() == 4
+    assert len(from_atlas) == 4
+    for name in from_disk.names():
+        a, b = from_disk.image(name), from_atlas.image(name)
+        assert a.mode == b.mode
+        assert np.array_equal(np.asarray(a), np.asarray(b))
+
+
+def test_stale_atlas_entry_is_decoded_again(ui_dir, tmp_path):
+    atlas = str(tmp_path / 'atlas.npz')
+    AssetRegistry(str(ui_dir), atlas=atlas).save_atlas()
+
+    path = ui_dir / 'button.png'
+    Image.new('RGBA', (3, 3), (0, 0, 255, 255)).save(path)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    registry = AssetRegistry(str(ui_dir), atlas=atlas)
+    registry.preload()
+    assert registry.get('button').size == (3, 3)
+    assert registry.get('pots/green').size == (6, 6)
+
+
+def test_unreadable_atlas_falls_back_to_files(ui_dir, tmp_path):
+    atlas = tmp_path / 'atlas.npz'
+    atlas.write_bytes(b'not an atlas')
+    registry = AssetRegistry(str(ui_dir), atlas=str(atlas))
+    assert registry.preload(['button']) == 1
+    assert registry.get('button').size == (12, 8)
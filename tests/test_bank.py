@@ -0,0 +1,173 @@
+"""
+Tests for the bank session state (open checks, cached geometry and settings).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core import bank, tools
+from core.bank import BankInterface, BankSession
+from core.capture import CapturedFrame
+
+SIZE = (800, 600)
+
+
+def _paste(img: Image.Image, template: Image.Image, xy):
+    rgba = template.convert('RGBA')
+    img.paste(rgba.convert('RGB'), xy, rgba)
+
+
+def _scene(tl=(100, 80), br=(500, 500), close=True) -> Image.Image:
+    rng = np.random.default_rng(1)
+    img = Image.fromarray(rng.integers(0, 60, (SIZE[1], SIZE[0], 3), dtype=np.uint8))
+    if tl is None:
+        return img
+    _paste(img, bank.BANK_TL, tl)
+    _paste(img, bank.BANK_BR, (br[0] - bank.BANK_BR.width, br[1] - bank.BANK_BR.height))
+    if close:
+        _paste(img, bank.BANK_CLOSE, (br[0] - 40, tl[1] + 6))
+    return img
+
+
+class FakeClient:
+    """The parts of RuneLiteClient the bank uses, over a settable scene."""
+
+    def __init__(self, scene: Image.Image):
+        self.scene = scene
+        self.frames = 0
+        self.full_searches = 0
+        self.clicks = []
+        self.on_click = None
+        self._last: CapturedFrame = None
+
+    def get_frame(self, maximize=True, max_age_ms: float = 0) -> CapturedFrame:
+        if max_age_ms > 0 and self._last is not None and self._last.age_ms <= max_age_ms:
+            return self._last
+        self.frames += 1
+        rgb = np.asarray(self.scene.convert('RGB'))
+        raw = np.dstack([rgb[..., ::-1], np.full(rgb.shape[:2], 255, np.uint8)])
+        self._last = CapturedFrame(self.frames, time.monotonic(), (0, 0) + SIZE, np.ascontiguousarray(raw))
+        return self._last
+
+    def find_in_window(self, img, screenshot=None, min_scale=1, max_scale=1,
+                       min_confidence=.7, use_prior=False, **kw):
+        self.full_searches += 1
+        match = tools.find_subimage(screenshot, img, min_scale=min_scale, max_scale=max_scale)
+        if match.confidence < min_confidence:
+            raise ValueError('Match did not meet minimum confidence')
+        return match
+
+    def click(self, match, **kw):
+        self.clicks.append(match)
+        if self.on_click:
+            self.on_click()
+
+
+@pytest.fixture
+def client():
+    return FakeClient(_scene())
+
+
+class TestBankSession:
+    def test_roi_check_after_first_locate(self, client):
+        session = BankSession(client)
+        assert session.refresh()
+        assert session.bank_match.bounding_box == (100, 80, 500, 500)
+        assert (session.full_checks, session.roi_checks) == (1, 0)
+        settings = session.settings
+
+        assert session.refresh()
+        assert (session.full_checks, session.roi_checks) == (1, 1)
+        assert session.settings is settings
+
+    def test_moved_bank_falls_back_to_locate(self, client):
+        session = BankSession(client)
+        session.refresh()
+        settings = session.settings
+        client.scene = _scene(tl=(130, 60), br=(530, 480))
+        assert session.refresh()
+        assert session.full_checks == 2
+        assert session.bank_match.bounding_box == (130, 60, 530, 480)
+        assert session.settings is not settings
+
+    def test_closed_bank(self, client):
+        session = BankSession(client)
+        session.refresh()
+        client.scene = _scene(tl=None)
+        assert not session.refresh()
+        assert not session.is_open
+        # reopened in place: the corner check alone finds it
+        client.scene = _scene()
+        full = session.full_checks
+        assert session.refresh()
+        assert session.full_checks == full
+
+    def test_same_frame_is_not_checked_twice(self, client):
+        session = BankSession(client)
+        session.refresh()
+        checks = (session.full_checks, session.roi_checks)
+        assert session.refresh(max_age_ms=10_000)
+        assert session.refresh(max_age_ms=10_000)
+        assert (session.full_checks, session.roi_checks) == checks
+        assert client.frames == 1
+
+    def test_settings_read_once_until_close(self, client):
+        session = BankSession(client)
+        session.refresh()
+        reads = []
+        original = session.settings.get_withdraw_setting
+        session.settings.get_withdraw_setting = lambda sc: reads.append(1) or original(sc)
+
+        first = session.read_settings()
+        assert set(first) == {'Rearrange', 'Withdraw', 'Quantity'}
+        session.refresh()
+        session.read_settings()
+        assert len(reads) == 1
+
+        client.scene = _scene(tl=None)
+        session.refresh()
+        client.scene = _scene()
+        session.refresh()
+        session.read_settings()
+        assert len(reads) == 2
+
+
+class TestBankInterface:
+    def test_setting_click_invalidates_settings(self, client):
+        iface = BankInterface(client, itemdb=None)
+        current = iface.get_settings()['Withdraw']
+        other = 'Note' if current == 'Item' else 'Item'
+
+        iface.set_withdraw_setting(current)
+        assert client.clicks == []
+        iface.set_withdraw_setting(other)
+        assert len(client.clicks) == 1
+        assert iface.session._setting_values is None
+
+    def test_close_is_bounded(self, client):
+        iface = BankInterface(client, itemdb=None)
+        assert iface.close(max_clicks=2, timeout=0) is False
+        assert len(client.clicks) == 2
+
+    def test_close_stops_once_closed(self, client):
+        iface = BankInterface(client, itemdb=None)
+        client.on_click = lambda: setattr(client, 'scene', _scene(tl=None))
+        assert iface.close(max_clicks=3, timeout=0.5) is True
+        assert len(client.clicks) == 1
+        assert not iface.is_open
+
+    def test_is_open_never_raises(self, client):
+        iface = BankInterface(client, itemdb=None)
+
+        def broken(*args, **kwargs):
+            raise OSError('capture failed')
+        client.get_frame = broken
+        assert iface.is_open is False
@@ -0,0 +1,170 @@
+"""
+Tests for CaptureSession's ring buffer, with a fake mss grabber.
+"""
+
+import sys
+import threading
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core import capture
+from core.capture import CaptureSession
+from core.frame import Frame
+
+
+class FakeShot:
+    def __init__(self, bbox, value):
+        self.width = bbox[2] - bbox[0]
+        self.height = bbox[3] - bbox[1]
+        pixels = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        pixels[..., 0] = value       # blue
+        pixels[..., 2] = 255 - value  # red
+        self.bgra = pixels.tobytes()
+
+
+class FakeMss:
+    """Stands in for mss.mss(); every grab fills the region with a new value."""
+    opened = []
+
+    def __init__(self, with_cursor=True):
+        self.with_cursor = with_cursor
+        self.grabs = 0
+        self.closed = False
+        FakeMss.opened.append(self)
+
+    def grab(self, bbox):
+        self.grabs += 1
+        return FakeShot(bbox, self.grabs % 256)
+
+    def close(self):
+        self.closed = True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    FakeMss.opened = []
+    monkeypatch.setattr(capture.mss, 'mss', FakeMss)
+    clock = Clock()
+    monkeypatch.setattr(capture, 'time', types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+BOX = (0, 0, 8, 6)
+
+
+def test_sequence_numbers_and_pixels(clock):
+    session = CaptureSession()
+    first, second = session.grab(BOX), session.grab(BOX)
+    assert (first.seq, second.seq) == (1, 2)
+    assert first.raw.shape == (6, 8, 4)
+    assert first.bbox == BOX
+    assert session.latest() is second
+    # one handle for the thread, reused between grabs
+    assert len(FakeMss.opened) == 1
+
+
+def test_reuse_within_max_age(clock):
+    session = CaptureSession()
+    grabbed = session.get(BOX)
+    clock.now += 0.030
+    assert grabbed.age_ms == pytest.approx(30)
+    assert session.get(BOX, max_age_ms=50) is grabbed
+    assert session.latest(max_age_ms=50, bbox=BOX) is grabbed
+    # a different region or an older frame means a fresh grab
+    assert session.latest(bbox=(0, 0, 4, 4)) is None
+    other = session.get((0, 0, 4, 4), max_age_ms=50)
+    assert other.seq == 2
+    assert session.latest(max_age_ms=20, bbox=BOX) is None
+    assert session.get(BOX, max_age_ms=20).seq == 3
+    # max_age_ms=0 always grabs
+    assert session.get(BOX).seq == 4
+
+
+def test_eviction_at_capacity(clock):
+    session = CaptureSession(buffer_size=3)
+    for _ in range(5):
+        session.grab(BOX)
+    assert [f.seq for f in session.frames()] == [3, 4, 5]
+    session.clear()
+    assert session.frames() == []
+    assert session.latest() is None
+
+
+def test_image_and_frame_are_lazy_and_cached(clock):
+    grabbed = CaptureSession().grab(BOX)
+    assert 'image' not in grabbed.__dict__ and 'frame' not in grabbed.__dict__
+
+    image = grabbed.image
+    assert image.mode == 'RGB' and image.size == (8, 6)
+    assert image.getpixel((0, 0)) == (254, 0, 1)
+    assert grabbed.image is image
+    assert 'frame' not in grabbed.__dict__
+
+    frame = grabbed.frame
+    assert isinstance(frame, Frame)
+    assert grabbed.frame is frame
+    assert np.array_equal(frame.rgb, np.asarray(image))
+
+
+def test_handle_per_thread_and_close(clock):
+    session = CaptureSession()
+    session.grab(BOX)
+    worker = threading.Thread(target=session.grab, args=(BOX,))
+    worker.start()
+    worker.join()
+    assert len(FakeMss.opened) == 2
+    assert [f.seq for f in session.frames()] == [1, 2]
+    # the worker's handle went with the worker
+    main, done = FakeMss.opened
+    assert done.closed and not main.closed
+    assert session.open_handles == 1
+
+    session.close()
+    assert all(sct.closed for sct in FakeMss.opened)
+    assert session.frames() == []
+    session.grab(BOX)
+    assert len(FakeMss.opened) == 3
+
+
+def test_short_lived_threads_release_their_handles(clock):
+    session = CaptureSession()
+    for _ in range(50):
+        workers = [threading.Thread(target=session.grab, args=(BOX,)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    assert len(FakeMss.opened) == 200
+    assert session.open_handles == 0
+    assert all(sct.closed for sct in FakeMss.opened)
+
+
+def test_client_close_releases_capture_handles(clock):
+    from core import osrs_client
+
+    client = object.__new__(osrs_client.RuneLiteClient)
+    client.capture = CaptureSession()
+    client.hover_capture = CaptureSession(buffer_size=1, with_cursor=False)
+    client.position_tracker = None
+    client._resize_watch = threading.Event()
+    client.capture.grab(BOX)
+    client.hover_capture.grab(BOX)
+
+    client.close()
+    assert client._resize_watch.is_set()
+    assert client.capture.open_handles == client.hover_capture.open_handles == 0
+    assert all(sct.closed for sct in FakeMss.opened)
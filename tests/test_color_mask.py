@@ -0,0 +1,90 @@
+"""
+Tests for the vectorised colour masks against the original per-pixel loops.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.color_mask import mask_colors_array, mask_above_array, get_color_mask
+from core.frame import as_frame
+from core import tools
+
+
+def _reference_mask_colors(image, colors, tolerance):
+    rgb = image.convert("RGB")
+    mask = Image.new("L", image.size, 0)
+    for r, g, b in colors:
+        lo = (max(0, r - tolerance), max(0, g - tolerance), max(0, b - tolerance))
+        hi = (min(255, r + tolerance), min(255, g + tolerance), min(255, b + tolerance))
+        for x in range(rgb.width):
+            for y in range(rgb.height):
+                p = rgb.getpixel((x, y))
+                if all(lo[i] <= p[i] <= hi[i] for i in range(3)):
+                    mask.putpixel((x, y), 255)
+    return np.asarray(mask)
+
+
+def _reference_mask_above(image, threshold):
+    mask = Image.new("L", image.size, 0)
+    for x in range(image.width):
+        for y in range(image.height):
+            if max(image.getpixel((x, y))) > threshold:
+                mask.putpixel((x, y), 255)
+    return np.asarray(mask)
+
+
+@pytest.fixture
+def strip():
+    rng = np.random.default_rng(3)
+    arr = rng.integers(0, 256, (16, 40, 3), dtype=np.uint8)
+    # Plant exact and near-boundary hits for the target colours
+    arr[2, 2] = (255, 255, 0)
+    arr[3, 3] = (250, 250, 5)
+    arr[4, 4] = (255, 0, 0)
+    arr[5, 5] = (224, 31, 31)
+    return Image.fromarray(arr)
+
+
+class TestMaskColors:
+    @pytest.mark.parametrize("tolerance", [0, 5, 30])
+    def test_matches_reference(self, strip, tolerance):
+        colors = [(255, 255, 0), (255, 0, 0), (255, 255, 255)]
+        expected = _reference_mask_colors(strip, colors, tolerance)
+        assert np.array_equal(mask_colors_array(strip, colors, tolerance), expected)
+        pil = tools.mask_colors(strip, colors, tolerance)
+        assert pil.mode == "L"
+        assert np.array_equal(np.asarray(pil), expected)
+
+    def test_accepts_frames_and_crops(self, strip):
+        colors = [(255, 255, 0)]
+        crop = as_frame(strip).crop((0, 0, 10, 10))
+        expected = _reference_mask_colors(strip.crop((0, 0, 10, 10)), colors, 5)
+        assert np.array_equal(mask_colors_array(crop, colors, 5), expected)
+
+    def test_many_colors(self, strip):
+        rng = np.random.default_rng(11)
+        colors = [tuple(int(v) for v in c) for c in rng.integers(0, 256, (70, 3))]
+        arr = np.asarray(strip)
+        expected = np.zeros(arr.shape[:2], dtype=bool)
+        for c in colors:
+            c = np.array(c)
+            expected |= np.all((arr >= np.clip(c - 8, 0, 255)) & (arr <= np.clip(c + 8, 0, 255)), axis=2)
+        assert np.array_equal(mask_colors_array(strip, colors, 8) == 255, expected)
+
+    def test_compiled_masks_are_shared(self):
+        assert get_color_mask([(1, 2, 3)], 4) is get_color_mask([[1, 2, 3]], 4)
+
+
+class TestMaskAbove:
+    @pytest.mark.parametrize("threshold", [0, 150, 254])
+    def test_matches_reference(self, strip, threshold):
+        expected = _reference_mask_above(strip, threshold)
+        assert np.array_equal(mask_above_array(strip, threshold), expected)
+        assert np.array_equal(np.asarray(tools.mask_above_color_value(strip, threshold)), expected)
@@ -0,0 +1,97 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.control import ScriptControl, ScriptTerminationException
+
+
+def _control() -> ScriptControl:
+    # bypass the singleton so tests don't share state; no keyboard hook
+    control = object.__new__(ScriptControl)
+    control.start_listener = lambda: None
+    control.__init__()
+    return control
+
+
+def _blocked_call(control, results):
+    @control.guard
+    def work():
+        return time.monotonic()
+
+    def run():
+        try:
+            results.append(work())
+        except ScriptTerminationException as e:
+            results.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_guard_passes_through_when_idle():
+    control = _control()
+    calls = []
+    guarded = control.guard(lambda x: calls.append(x) or x * 2)
+    assert guarded(3) == 6
+    assert calls == [3]
+    assert not control._blocked
+
+
+def test_resume_wakes_waiter_immediately():
+    control = _control()
+    control.pause = True
+    results = []
+    thread = _blocked_call(control, results)
+    time.sleep(0.05)
+    assert results == []
+
+    resumed = time.monotonic()
+    control.pause = False
+    thread.join(timeout=1)
+    assert len(results) == 1
+    assert results[0] - resumed < 0.2
+
+
+def test_terminate_interrupts_pause():
+    control = _control()
+    control.pause = True
+    results = []
+    thread = _blocked_call(control, results)
+    time.sleep(0.05)
+    control.terminate = True
+    thread.join(timeout=1)
+    assert len(results) == 1 and isinstance(results[0], ScriptTerminationException)
+
+
+def test_terminate_raises_without_waiting():
+    control = _control()
+    control.terminate = True
+    with pytest.raises(ScriptTerminationException):
+        control.guard(lambda: None)()
+
+
+def test_break_is_timed():
+    control = _control()
+    control.initialize_break(1)
+    assert control.on_break and control._blocked
+    start = time.monotonic()
+    control.guard(lambda: None)()
+    assert 0.9 <= time.monotonic() - start < 1.5
+    time.sleep(0.05)
+    assert not control._blocked
+
+
+def test_wait_until_ready_timeout_and_reset():
+    control = _control()
+    control.initialize_break(60)
+    assert control.wait_until_ready(timeout=0.05) is False
+    control.reset()
+    assert control.break_until == 0
+    assert control.wait_until_ready(timeout=0.05) is True
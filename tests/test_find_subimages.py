@@ -0,0 +1,117 @@
+"""
+Tests for the single-pass multi-match mode of tools.find_subimages.
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core import tools
+
+POSITIONS = [(5, 5), (40, 8), (80, 50), (12, 70), (100, 90)]
+
+
+@pytest.fixture
+def scene_and_template():
+    rng = np.random.default_rng(21)
+    template = rng.integers(0, 255, (18, 18, 3), dtype=np.uint8)
+    scene = rng.integers(0, 255, (130, 140, 3), dtype=np.uint8)
+    for i, (x, y) in enumerate(POSITIONS):
+        copy = template.astype(int)
+        # Degrade later copies a little so the confidences are ordered
+        copy += rng.integers(-4 * i, 4 * i + 1, copy.shape)
+        scene[y:y + 18, x:x + 18] = np.clip(copy, 0, 255)
+    return Image.fromarray(scene), Image.fromarray(template)
+
+
+class TestSinglePass:
+    def test_finds_every_copy_best_first(self, scene_and_template):
+        scene, template = scene_and_template
+        matches = tools.find_subimages(scene, template, min_confidence=0.95)
+        assert [(m.start_x, m.start_y) for m in matches] == POSITIONS
+        confs = [m.confidence for m in matches]
+        assert confs == sorted(confs, reverse=True)
+
+    def test_same_as_legacy(self, scene_and_template):
+        scene, template = scene_and_template
+        fast = tools.find_subimages(scene, template, min_confidence=0.95)
+        slow = tools.find_subimages(scene, template, min_confidence=0.95, single_pass=False)
+        assert [m.bounding_box for m in fast] == [m.bounding_box for m in slow]
+        for a, b in zip(fast, slow):
+            assert a.confidence == pytest.approx(b.confidence, abs=1e-5)
+
+    def test_max_count_and_threshold(self, scene_and_template):
+        scene, template = scene_and_template
+        assert len(tools.find_subimages(scene, template, min_confidence=0.95, max_count=2)) == 2
+        assert tools.find_subimages(scene, template, min_confidence=1.01) == []
+
+    def test_multi_scale(self, scene_and_template):
+        scene, template = scene_and_template
+        matches = tools.find_subimages(
+            scene, template, min_scale=0.9, max_scale=1.1, min_confidence=0.95
+        )
+        assert {(m.start_x, m.start_y) for m in matches} == set(POSITIONS)
+        assert all(m.scale == pytest.approx(1.0) for m in matches)
+
+    def test_template_too_large_raises(self, scene_and_template):
+        scene, _ = scene_and_template
+        with pytest.raises(ValueError):
+            tools.find_subimages(scene.crop((0, 0, 10, 10)), scene.crop((0, 0, 20, 20)))
+
+
+@pytest.fixture(scope="module")
+def ui_scene():
+    rng = np.random.default_rng(2)
+    bg = cv2.GaussianBlur(rng.integers(0, 255, (500, 700, 3), dtype=np.uint8), (0, 0), 3)
+    scene = Image.fromarray(bg)
+    placed = {
+        "toolplane-modern.png": (460, 200),
+        "chat-top-left.png": (10, 380),
+        "chat-bottom-right.png": (300, 430),
+        "map.webp": (620, 30),
+        "combat.webp": (200, 100),
+    }
+    for name, pos in placed.items():
+        tpl = Image.open(project_root / "data/ui" / name).convert("RGBA")
+        scene.paste(tpl, pos, tpl)
+    return scene, placed
+
+
+class TestPyramid:
+    @pytest.mark.parametrize("name", [
+        "toolplane-modern.png", "chat-top-left.png", "chat-bottom-right.png", "map.webp", "combat.webp"
+    ])
+    @pytest.mark.parametrize("scales", [(1, 1), (0.9, 1.1)])
+    def test_agrees_with_exhaustive(self, ui_scene, name, scales):
+        scene, placed = ui_scene
+        template = Image.open(project_root / "data/ui" / name)
+        kw = dict(min_scale=scales[0], max_scale=scales[1])
+        exhaustive = tools.find_subimage(scene, template, **kw)
+        coarse = tools.find_subimage(scene, template, pyramid=True, **kw)
+        assert coarse.bounding_box == exhaustive.bounding_box
+        assert coarse.bounding_box[:2] == placed[name]
+        assert coarse.confidence == pytest.approx(exhaustive.confidence, abs=1e-5)
+        assert coarse.scale == pytest.approx(exhaustive.scale)
+
+
+class TestBatch:
+    def test_same_as_individual_calls(self, scene_and_template):
+        scene, template = scene_and_template
+        other = scene.crop((60, 60, 76, 76))
+        templates = {"copy": template, "other": other, "again": template}
+        batch = tools.find_subimages_batch(scene, templates, min_confidence=0.95)
+        assert list(batch) == ["copy", "other", "again"]
+        for key, tpl in templates.items():
+            single = tools.find_subimages(scene, tpl, min_confidence=0.95)
+            assert [m.bounding_box for m in batch[key]] == [m.bounding_box for m in single]
+
+    def test_empty(self, scene_and_template):
+        scene, _ = scene_and_template
+        assert tools.find_subimages_batch(scene, {}) == {}
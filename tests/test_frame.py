@@ -0,0 +1,72 @@
+"""
+Tests for the NumPy-native Frame type and its use by the matching helpers.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.frame import Frame, as_frame
+from core.region_match import MatchResult
+from core import tools
+
+
+@pytest.fixture
+def scene():
+    rng = np.random.default_rng(7)
+    arr = rng.integers(0, 255, (120, 160, 3), dtype=np.uint8)
+    return Image.fromarray(arr)
+
+
+class TestFrame:
+    def test_views_match_pil(self, scene):
+        frame = as_frame(scene)
+        assert frame.size == scene.size
+        assert np.array_equal(frame.rgb, np.asarray(scene))
+        assert np.array_equal(frame.bgr, np.asarray(scene)[:, :, ::-1])
+        # PIL and OpenCV round the luma weights slightly differently
+        assert np.abs(frame.gray.astype(int) - np.asarray(scene.convert('L'))).max() <= 1
+
+    def test_from_bgra_roundtrip(self, scene):
+        rgb = np.asarray(scene)
+        bgra = np.dstack([rgb[:, :, ::-1], np.full(rgb.shape[:2], 255, np.uint8)])
+        frame = Frame.from_bgra(bgra)
+        assert np.array_equal(frame.rgb, rgb)
+        assert np.array_equal(np.asarray(frame.image), rgb)
+
+    def test_crop_is_view_and_clamped(self, scene):
+        frame = as_frame(scene)
+        _ = frame.hsv
+        child = frame.crop((-5, 10, 40, 500))
+        assert child.size == (40, 110)
+        assert np.shares_memory(child.rgb, frame.rgb)
+        assert np.shares_memory(child.hsv, frame.hsv)
+
+    def test_crop_in_accepts_frame(self, scene):
+        m = MatchResult(10, 20, 30, 50)
+        cropped = m.crop_in(as_frame(scene))
+        assert isinstance(cropped, Frame)
+        assert np.array_equal(cropped.rgb, np.asarray(m.crop_in(scene)))
+
+
+class TestMatchingWithFrames:
+    def test_find_subimage_same_for_pil_and_frame(self, scene):
+        template = scene.crop((50, 40, 70, 60))
+        from_pil = tools.find_subimage(scene, template)
+        from_frame = tools.find_subimage(as_frame(scene), template)
+        assert from_pil.bounding_box == from_frame.bounding_box == (50, 40, 70, 60)
+        assert from_pil.confidence == pytest.approx(from_frame.confidence)
+
+    def test_find_subimages_leaves_parent_untouched(self, scene):
+        frame = as_frame(scene)
+        before = frame.bgr.copy()
+        template = scene.crop((10, 10, 30, 30))
+        matches = tools.find_subimages(frame, template, min_confidence=0.99)
+        assert matches[0].bounding_box == (10, 10, 30, 30)
+        assert np.array_equal(frame.bgr, before)
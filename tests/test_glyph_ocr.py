@@ -0,0 +1,117 @@
+"""
+Tests for the glyph-template OCR backend.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core import ocr
+from core.ocr import FontChoice, OcrBackend, glyph
+
+
+def _draw(lines, font: FontChoice, fg=(255, 255, 0), bg=(40, 30, 20), size=(260, 40)) -> Image.Image:
+    """Text drawn the way the client draws it: bitmap font, no anti-aliasing."""
+    path = str(glyph.FONT_DIR / f'{font.value}.ttf')
+    pil_font = ImageFont.truetype(path, glyph.pixel_size(path))
+    img = Image.new('RGB', size, bg)
+    draw = ImageDraw.Draw(img)
+    draw.fontmode = '1'
+    for i, line in enumerate(lines):
+        draw.text((3, 3 + 16 * i), line, font=pil_font, fill=fg)
+    return img
+
+
+@pytest.mark.parametrize('font', glyph.AUTO_FONTS)
+@pytest.mark.parametrize('text', ['Chop down Yew tree', 'Use Knife -> Oak logs', "it's (level-20), 100%"])
+def test_reads_known_font(font, text):
+    assert glyph.read_text(_draw([text], font), font) == text
+
+
+def test_auto_picks_font():
+    img = _draw(['Walk here / Mithril ore'], FontChoice.RUNESCAPE_BOLD_12)
+    assert glyph.read_text(img) == 'Walk here / Mithril ore'
+
+
+def test_multiline_and_dark_on_light():
+    img = _draw(['Bank', 'Deposit-All'], FontChoice.RUNESCAPE_PLAIN_12, fg=(0, 0, 0), bg=(200, 190, 160))
+    assert glyph.read_text(img, FontChoice.RUNESCAPE_PLAIN_12) == 'Bank\nDeposit-All'
+
+
+def test_pixel_perfect_size_detected():
+    path = str(glyph.FONT_DIR / f'{FontChoice.RUNESCAPE_PLAIN_12.value}.ttf')
+    assert glyph.pixel_size(path) == 16
+
+
+def test_read_scored():
+    text, confidence = glyph.read_scored(_draw(['Mining'], FontChoice.RUNESCAPE_PLAIN_12), FontChoice.RUNESCAPE_PLAIN_12)
+    assert (text, confidence) == ('Mining', 1.0)
+    _, confidence = glyph.read_scored(_draw(['Mining'], FontChoice.RUNESCAPE_BOLD_12), FontChoice.RUNESCAPE_PLAIN_12)
+    assert confidence < 0.9
+    assert glyph.read_scored(Image.new('RGB', (40, 20))) == ('', 0.0)
+
+
+class TestExecuteBackend:
+    def test_get_number(self):
+        img = _draw(['12345'], FontChoice.RUNESCAPE_PLAIN_11, size=(80, 20))
+        assert ocr.get_number(img, FontChoice.RUNESCAPE_PLAIN_11, backend=OcrBackend.GLYPH) == 12345
+
+    def test_whitelist(self):
+        img = _draw(['O0l1'], FontChoice.RUNESCAPE_PLAIN_12, size=(60, 20))
+        assert ocr.execute(img, FontChoice.RUNESCAPE_PLAIN_12, characters='0123456789',
+                           backend=OcrBackend.GLYPH) == '01'
+
+    def test_blank_raises(self):
+        img = Image.new('RGB', (40, 20), (40, 30, 20))
+        with pytest.raises(ValueError):
+            ocr.execute(img, backend=OcrBackend.GLYPH)
+        assert ocr.execute(img, backend=OcrBackend.GLYPH, raise_on_blank=False) == ''
+
+
+class TestSkillingState:
+    """RuneLiteClient.get_skilling_state reads its label with the glyph backend first."""
+
+    @staticmethod
+    def _client(label: str, fg, font=FontChoice.RUNESCAPE_PLAIN_12):
+        from core import osrs_client
+        from core.assets import assets
+
+        box = assets().image('skilling-state').convert('RGBA')
+        scene = Image.new('RGB', (300, 200), (20, 20, 20))
+        scene.paste(box.convert('RGB'), (60, 50), box)
+        scene.paste(_draw([label], font, fg=fg, bg=(0, 0, 0), size=(110, 20)), (68, 60))
+        client = object.__new__(osrs_client.RuneLiteClient)
+        client.get_screenshot = lambda: scene
+        return client
+
+    @pytest.fixture
+    def tesseract(self, monkeypatch):
+        calls = []
+
+        def image_to_string(img, **kw):
+            calls.append(kw)
+            return 'Fishing'
+        monkeypatch.setattr(ocr.tess.engine, 'image_to_string', image_to_string)
+        return calls
+
+    def test_glyph_read_skips_tesseract(self, tesseract):
+        assert self._client('Mining', (0, 255, 0)).get_skilling_state('mining') is True
+        assert self._client('Mining', (255, 0, 0)).get_skilling_state('Mining') is False
+        assert tesseract == []
+
+    def test_other_label_skips_tesseract(self, tesseract):
+        # a clean read of another state box is trusted as it is
+        with pytest.raises(ValueError):
+            self._client('Mining', (0, 255, 0)).get_skilling_state('fishing')
+        assert tesseract == []
+
+    def test_unsure_read_falls_back_to_tesseract(self, tesseract):
+        # drawn in a font the reader isn't told about: the glyph read doesn't fit
+        client = self._client('Fishing', (0, 255, 0), font=FontChoice.RUNESCAPE_BOLD_12)
+        assert client.get_skilling_state('fishing') is True
+        assert len(tesseract) == 1
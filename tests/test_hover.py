@@ -0,0 +1,109 @@
+"""
+Tests for the cursor-anchored hover reader.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.hover import HoverReader
+from core.ocr import FontChoice, OcrBackend, glyph
+
+TEMPLATE = Image.open(project_root / 'data/ui/action-hover.png')
+
+
+def _scene(text: str, box_at=(310, 215), size=(800, 600)) -> Image.Image:
+    """Dark scene with a hover box of the right width holding `text`."""
+    rng = np.random.default_rng(5)
+    scene = Image.fromarray(rng.integers(0, 60, (size[1], size[0], 3), dtype=np.uint8))
+    path = str(glyph.FONT_DIR / f'{FontChoice.RUNESCAPE_PLAIN_11.value}.ttf')
+    font = ImageFont.truetype(path, glyph.pixel_size(path))
+    width = int(font.getlength(text)) + 12
+    x, y = box_at
+    tw, th = TEMPLATE.size
+    middle = TEMPLATE.crop((tw // 2, 0, tw // 2 + 1, th))
+    for dx in range(10, width - 10):
+        scene.paste(middle, (x + dx, y), middle)
+    scene.paste(TEMPLATE.crop((0, 0, 10, th)), (x, y), TEMPLATE.crop((0, 0, 10, th)))
+    right = TEMPLATE.crop((tw - 10, 0, tw, th))
+    scene.paste(right, (x + width - 10, y), right)
+    draw = ImageDraw.Draw(scene)
+    draw.fontmode = '1'
+    draw.text((x + 5, y + 3), text, font=font, fill=(255, 255, 255))
+    return scene
+
+
+class Grabber:
+    def __init__(self, scene):
+        self.scene = scene
+        self.boxes = []
+
+    def __call__(self, box):
+        self.boxes.append(box)
+        return self.scene.crop(box)
+
+
+@pytest.fixture
+def reader_and_grab():
+    grab = Grabber(_scene('Chop down Oak'))
+    return HoverReader(TEMPLATE, grab, backend=OcrBackend.GLYPH), grab
+
+
+def test_reads_text_from_small_capture(reader_and_grab):
+    reader, grab = reader_and_grab
+    assert reader.read((330, 220), (800, 600)) == 'Chop down Oak'
+    x1, y1, x2, y2 = grab.boxes[0]
+    assert (x2 - x1) * (y2 - y1) < 800 * 600 / 5
+
+
+def test_cache_by_cell_and_pixels(reader_and_grab):
+    reader, grab = reader_and_grab
+    reader.read((330, 220), (800, 600))
+    assert reader.read((331, 221), (800, 600)) == 'Chop down Oak'
+    assert reader.hits == 1
+    grab.scene = _scene('Chop down Yew')
+    assert reader.read((331, 221), (800, 600)) == 'Chop down Yew'
+    stats = reader.stats()
+    assert stats['reads'] == 3 and stats['hits'] == 1
+    assert stats['max_ms'] >= stats['mean_ms'] > 0
+
+
+def test_no_box_near_cursor(reader_and_grab):
+    reader, _ = reader_and_grab
+    assert reader.read((700, 40), (800, 600)) is None
+
+
+def test_region_is_clamped():
+    reader = HoverReader(TEMPLATE, lambda box: None)
+    assert reader.region((10, 590), (800, 600)).bounding_box == (0, 564, 386, 600)
+
+
+def test_hover_texts_reuse_client_workers(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from core import osrs_client
+
+    monkeypatch.setattr(osrs_client.sys, 'platform', 'win32')
+    client = object.__new__(osrs_client.RuneLiteClient)
+    client._hover_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hover")
+    workers = set()
+
+    def read(text):
+        workers.add(threading.get_ident())
+        return text
+    client.get_hover_text = lambda: read('Mine')
+    client.get_action_hover = lambda: read('Rocks')
+    for _ in range(20):
+        assert sorted(client.get_hover_texts()) == ['Mine', 'Rocks']
+    assert len(workers) <= 2
+
+    client.position_tracker = None
+    client.capture = client.hover_capture = type('C', (), {'close': lambda self: None})()
+    client.close()
+    assert client._hover_pool._shutdown
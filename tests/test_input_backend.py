@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.input import mouse_control
+import pytest
+
+from core.input.backend import (
+    InputFailSafe, NullBackend, PyAutoGuiBackend, RecordingBackend, input_backend, set_input_backend
+)
+
+
+def test_null_backend_tracks_cursor():
+    backend = NullBackend((5, 6))
+    assert backend.position() == (5, 6)
+    backend.move_to(10.7, 3)
+    assert backend.position() == (10, 3)
+    backend.click()
+    backend.press_and_release('enter')
+
+
+def test_recording_backend_logs_calls():
+    ticks = iter(range(100))
+    rec = RecordingBackend(clock=lambda: next(ticks) * 0.001)
+    rec.move_to(1, 2)
+    rec.click('right', 0.1)
+    rec.write('abc', delay=0.2)
+    assert rec.position() == (1, 2)
+    kinds = [e.kind for e in rec.events]
+    assert kinds == ['move', 'click', 'write', 'position']
+    assert rec.path() == [(1, 2)]
+    assert all(e.dt > 0 for e in rec.events)
+    assert rec.summary()['move']['count'] == 1
+
+    events = RecordingBackend.loads(rec.dumps())
+    assert [e.kind for e in events] == kinds
+    assert events[1].args == ('right', '0.1')
+    assert events[3].args == ()
+
+
+def test_mouse_down_is_recorded():
+    rec = RecordingBackend()
+    rec.mouse_down('right')
+    rec.mouse_up('right')
+    assert [(e.kind, e.args) for e in rec.events] == [('mouse_down', ('right',)), ('mouse_up', ('right',))]
+
+
+def test_pyautogui_fail_safe_is_translated():
+    class FakePyAutoGui:
+        class FailSafeException(Exception):
+            pass
+
+        def moveTo(self, *args, **kwargs):
+            raise self.FailSafeException('corner')
+
+    backend = PyAutoGuiBackend()
+    backend._pyautogui = FakePyAutoGui()
+    with pytest.raises(InputFailSafe):
+        backend.move_to(0, 0)
+
+
+def test_move_to_reads_cursor_only_to_plan_and_verify():
+    rec = RecordingBackend(NullBackend((20, 20)))
+    mouse_control.move_to(400, 300, seed=11, pause_prob=0, backend=rec)
+    assert rec.inner.position() == (400, 300)
+    assert len(rec.of_kind('position')) == 2
+    assert len(rec.of_kind('move')) > 10
+
+
+def test_click_goes_through_backend():
+    rec = RecordingBackend(NullBackend((0, 0)))
+    mouse_control.click(50, 60, click_type=mouse_control.ClickType.RIGHT, backend=rec)
+    clicks = rec.of_kind('click')
+    assert len(clicks) == 1 and clicks[0].args[0] == 'right'
+    assert rec.inner.position() == (50, 60)
+
+
+def test_default_backend_is_replaceable():
+    assert isinstance(input_backend(), PyAutoGuiBackend)
+    null = NullBackend()
+    previous = set_input_backend(null)
+    try:
+        assert input_backend() is null
+    finally:
+        set_input_backend(previous)
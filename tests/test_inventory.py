@@ -0,0 +1,218 @@
+"""
+Tests for the slot-grid inventory model.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.inventory import InventoryGrid, InventorySnapshot
+from core.region_match import MatchResult
+
+
+def _icon(seed: int, size=(30, 26)) -> Image.Image:
+    """Random sprite with a black outline and transparent corners."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    rgba = np.zeros((h, w, 4), dtype=np.uint8)
+    rgba[:, :, :3] = rng.integers(60, 255, (h, w, 3))
+    rgba[:, :, 3] = 255
+    rgba[[0, -1], :, :3] = 0
+    rgba[:, [0, -1], :3] = 0
+    rgba[:3, :3, 3] = 0
+    return Image.fromarray(rgba)
+
+
+@pytest.fixture
+def layout():
+    rng = np.random.default_rng(0)
+    panel = np.clip(rng.normal(50, 6, (300, 240, 3)), 20, 255).astype(np.uint8)
+    scene = Image.fromarray(panel)
+    toolplane = MatchResult(10, 5, 214, 278)
+    grid = InventoryGrid.for_ui('modern')
+    icons = {'ore': _icon(1), 'gem': _icon(2), 'log': _icon(3)}
+    boxes = grid.slot_boxes(toolplane)
+    contents = {0: 'ore', 1: 'ore', 5: 'gem', 27: 'ore', 13: 'log'}
+    for slot, key in contents.items():
+        b = boxes[slot]
+        # nudge the sprite inside its slot like the game does
+        scene.paste(icons[key], (b.start_x + 2, b.start_y + 3), icons[key])
+    return scene, toolplane, grid, icons, contents
+
+
+class TestInventoryGrid:
+    def test_slot_boxes(self):
+        boxes = InventoryGrid(origin=(10, 20)).slot_boxes(MatchResult(100, 50, 300, 350))
+        assert len(boxes) == 28
+        assert boxes[0].bounding_box == (110, 70, 146, 102)
+        assert boxes[1].start_x - boxes[0].start_x == 42
+        assert boxes[4].start_y - boxes[0].start_y == 36
+
+
+class TestInventorySnapshot:
+    def test_classifies_slots(self, layout):
+        scene, toolplane, grid, icons, contents = layout
+        snap = InventorySnapshot.capture(scene, toolplane, icons, grid)
+        assert {i: k for i, k in enumerate(snap.slots) if k} == contents
+        assert snap.counts == {'ore': 3, 'gem': 1, 'log': 1}
+        assert snap.slots_of('ore') == [0, 1, 27]
+        assert [b.bounding_box for b in snap.boxes_of('gem')] == [snap.boxes[5].bounding_box]
+
+    def test_empty_mask(self, layout):
+        scene, toolplane, grid, icons, contents = layout
+        snap = InventorySnapshot.capture(scene, toolplane, {}, grid)
+        assert set(np.flatnonzero(~snap.empty)) == set(contents)
+        assert snap.empty_count == 28 - len(contents)
+        assert not snap.is_full
+        # unknown items occupy a slot but aren't classified
+        assert all(k is None for k in snap.slots)
+
+    def test_diff(self, layout):
+        scene, toolplane, grid, icons, _ = layout
+        before = InventorySnapshot.capture(scene, toolplane, icons, grid)
+        b = grid.slot_boxes(toolplane)[2]
+        scene.paste(icons['gem'], (b.start_x + 2, b.start_y + 3), icons['gem'])
+        after = InventorySnapshot.capture(scene, toolplane, icons, grid)
+        assert after.diff(before) == {2: (None, 'gem')}
+        assert after.diff(after) == {}
+
+
+# ---- grid origins against the real side-panel templates -------------------
+
+def _alpha(name: str) -> np.ndarray:
+    from core.assets import assets
+    return np.asarray(assets().image(name).convert('RGBA'))[:, :, 3] > 0
+
+
+def _grid_extent(grid: InventoryGrid):
+    w, h = grid.slot_size
+    px, py = grid.pitch
+    return (grid.cols - 1) * px + w, (grid.rows - 1) * py + h
+
+
+class TestGridOrigins:
+    INTERIOR = (190, 261)
+    WIDGET = (16, 8)
+
+    def test_modern_frame(self):
+        opaque = _alpha('toolplane-modern')
+        row, col = opaque[opaque.shape[0] // 2], opaque[:, opaque.shape[1] // 2]
+        left, top = int(np.argmin(row)), int(np.argmin(col))  # inner edge of the frame
+        right = len(row) - int(np.argmin(row[::-1]))
+        bottom = len(col) - int(np.argmin(col[::-1]))
+        assert (right - left, bottom - top) == self.INTERIOR
+        grid = InventoryGrid.for_ui('modern')
+        assert grid.origin == (left + self.WIDGET[0], top + self.WIDGET[1])
+
+    def test_classic_pillars(self):
+        opaque = _alpha('toolplane-classic')
+        row = opaque[opaque.shape[0] // 2]
+        pillars = np.flatnonzero(row)
+        left_inner = int(pillars[pillars < len(row) // 2].max()) + 1
+        right_inner = int(pillars[pillars > len(row) // 2].min())
+        assert (right_inner - left_inner, opaque.shape[0]) == self.INTERIOR
+        for ui in ('classic', 'fixed'):
+            assert InventoryGrid.for_ui(ui).origin == (left_inner + self.WIDGET[0], self.WIDGET[1])
+
+    @pytest.mark.parametrize('ui', ['modern', 'classic'])
+    def test_grid_fits_interior(self, ui):
+        grid = InventoryGrid.for_ui(ui)
+        w, h = _grid_extent(grid)
+        x, y = grid.origin[0] - self.WIDGET[0], grid.origin[1] - self.WIDGET[1]
+        assert self.WIDGET[0] + w <= self.INTERIOR[0]
+        assert self.WIDGET[1] + h + grid.margin <= self.INTERIOR[1]
+        assert x >= 0 and y >= 0
+
+    def test_real_side_panel(self):
+        """The captured classic side panel: every slot lands on the empty panel."""
+        from core import tools
+        from core.assets import assets
+
+        # the capture is exactly as wide as the template: give it some room
+        panel = Image.new('RGB', (260, 360))
+        panel.paste(assets().image('ui_inventory').convert('RGB'), (12, 12))
+        toolplane = tools.find_subimage(panel, assets().image('toolplane-classic'),
+                                        min_scale=1, max_scale=1)
+        assert toolplane.confidence > 0.99
+        snap = InventorySnapshot.capture(panel, toolplane, {}, InventoryGrid.for_ui('classic'))
+        assert snap.empty_count == 28
+        # the slot grid sits between the top and bottom tab rows
+        grid = InventoryGrid.for_ui('classic')
+        first, last = snap.boxes[0], snap.boxes[-1]
+        assert first.start_y - grid.margin >= toolplane.start_y
+        assert last.end_y + grid.margin <= toolplane.end_y
+
+
+# ---- RuneLiteClient reads the inventory through the snapshot --------------
+
+def _item(item_id: int, icon: Image.Image):
+    import base64
+    from io import BytesIO
+    from core.item_db import Item
+
+    buf = BytesIO()
+    icon.save(buf, format='PNG')
+    return Item(
+        id=item_id, name=f'item {item_id}', tradeable_on_ge=True, members=False,
+        noted=False, noteable=True, placeholder=False, stackable=False, equipable=False,
+        cost=1, lowalch=1, highalch=1, icon_b64=base64.b64encode(buf.getvalue()).decode('ascii')
+    )
+
+
+class FakeItemDb:
+    def __init__(self, items):
+        self.by_id = {item.id: item for item in items}
+        self.by_name = {item.name: item for item in items}
+
+    def get_item(self, key):
+        return self.by_id.get(key) if isinstance(key, int) else self.by_name.get(key)
+
+    def get_item_by_id(self, item_id):
+        return self.by_id.get(item_id)
+
+    def get_item_by_name(self, name):
+        return self.by_name.get(name)
+
+
+@pytest.fixture
+def client(layout, monkeypatch):
+    from core import osrs_client, tools
+
+    scene, toolplane, grid, icons, contents = layout
+    items = {'ore': _item(1, icons['ore']), 'gem': _item(2, icons['gem']), 'log': _item(3, icons['log'])}
+    client = object.__new__(osrs_client.RuneLiteClient)
+    client.log = osrs_client.get_logger('RLClient')
+    client.item_db = FakeItemDb(items.values())
+    client.ui_type = osrs_client.UIType.MODERN
+    client.sectors = osrs_client.UISectors()
+    client.sectors.toolplane = toolplane
+    client.click_toolplane = lambda tab: None
+    client.get_screenshot = lambda: scene
+    client.get_frame = lambda *a, **kw: type('F', (), {'frame': scene})()
+    # no sweep over the whole toolplane
+    monkeypatch.setattr(tools, 'find_subimages_batch', None)
+    monkeypatch.setattr(osrs_client, 'find_subimage', None)
+    return client, items, grid.slot_boxes(toolplane)
+
+
+class TestClientInventory:
+    def test_get_inv_items(self, client):
+        client, items, boxes = client
+        matches = client.get_inv_items(['item 1', 'item 2'], do_sort=False)
+        starts = [m.bounding_box[:2] for m in matches]
+        assert starts == [(boxes[i].start_x + 2, boxes[i].start_y + 3) for i in (0, 1, 27, 5)]
+        assert all(m.confidence > 0.99 for m in matches)
+        assert client.get_inv_items([3])[0].bounding_box[:2] == (boxes[13].start_x + 2, boxes[13].start_y + 3)
+
+    def test_find_item(self, client):
+        client, items, boxes = client
+        match = client.find_item('item 2')
+        assert match.bounding_box[:2] == (boxes[5].start_x + 2, boxes[5].start_y + 3)
+        with pytest.raises(ValueError):
+            client.find_item('item 3', min_confidence=1.01)
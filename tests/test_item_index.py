@@ -0,0 +1,130 @@
+import base64
+import json
+import os
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.item_db import ItemLookup
+
+
+def _icon(color, size=(36, 32), box=(4, 6, 20, 24)) -> str:
+    img = Image.new('RGBA', size, (0, 0, 0, 0))
+    img.paste(Image.new('RGBA', (box[2] - box[0], box[3] - box[1]), color), box[:2])
+    buf = BytesIO()
+    img.save(buf, format='PNG')
+    return base64.b64encode(buf.getvalue()).decode('ascii')
+
+
+def _item(item_id, name, **kw):
+    item = {
+        'id': item_id, 'name': name, 'tradeable_on_ge': True, 'members': False,
+        'noted': False, 'noteable': True, 'placeholder': False, 'stackable': False,
+        'equipable': False, 'cost': 10 * item_id, 'lowalch': item_id, 'highalch': 2 * item_id,
+        'linked_id_item': None, 'linked_id_placeholder': item_id + 1000,
+    }
+    item.update(kw)
+    return item
+
+
+@pytest.fixture
+def sources(tmp_path):
+    items = {
+        '1': _item(1, 'Iron ore', members=True),
+        '2': _item(2, 'Coal', stackable=True),
+        '3': _item(3, 'Iron bar'),
+        '4': _item(4, 'Bones'),
+    }
+    icons = {'1': _icon((200, 0, 0, 255)), '2': _icon((0, 0, 0, 255)), '3': _icon((90, 90, 90, 255))}
+    items_path, icons_path = tmp_path / 'items.json', tmp_path / 'icons.json'
+    items_path.write_text(json.dumps(items))
+    icons_path.write_text(json.dumps(icons))
+    return str(items_path), str(icons_path), str(tmp_path / 'items.idx')
+
+
+def _lookup(items_path, icons_path, index_path) -> ItemLookup:
+    # bypass the singleton
+    lookup = object.__new__(ItemLookup)
+    lookup.__init__(items_path, icons_path, index_path)
+    return lookup
+
+
+def test_json_load_writes_index_and_index_matches(sources):
+    items_path, icons_path, index_path = sources
+    from_json = _lookup(*sources)
+    assert from_json._index is None and os.path.exists(index_path)
+
+    from_index = _lookup(*sources)
+    assert from_index._index is not None
+    assert from_index.list_all_items() == from_json.list_all_items()
+    for item_id in (1, 2, 3, 4):
+        a, b = from_json.get_item_by_id(item_id), from_index.get_item_by_id(item_id)
+        assert a == b
+        if a.icon_b64:
+            assert np.array_equal(np.asarray(a.icon.convert('RGBA')), np.asarray(b.icon))
+    iron = from_index.get_item_by_name('iron ORE')
+    assert iron.members and not iron.stackable and iron.highalch == 2
+    assert iron.icon.size == (16, 18)  # transparent border cropped at build time
+    assert from_index.get_item_by_id(4).icon is None
+
+
+def test_index_icons_are_cached(sources):
+    _lookup(*sources)
+    lookup = _lookup(*sources)
+    item = lookup.get_item_by_id(1)
+    assert item.icon is item.icon
+    assert lookup._index.icons.hits == 1 and lookup._index.icons.misses == 1
+    assert lookup.get_item_by_id(1) is item
+
+
+def test_index_icon_b64_is_lazy(sources):
+    from_json = _lookup(*sources)
+    lookup = _lookup(*sources)
+    item = lookup.get_item_by_id(1)
+    assert item._icon_b64 is None
+    assert item.icon_b64 == from_json.get_item_by_id(1).icon_b64
+    assert item._icon_b64 is None
+    assert lookup.get_item_by_id(4).icon_b64 is None
+
+
+def test_stale_index_falls_back_to_json(sources):
+    items_path, icons_path, index_path = sources
+    _lookup(*sources)
+    data = json.loads(Path(items_path).read_text())
+    data['5'] = _item(5, 'Gold ore')
+    Path(items_path).write_text(json.dumps(data))
+
+    lookup = _lookup(*sources)
+    assert lookup._index is None
+    assert lookup.get_item_by_name('Gold ore').id == 5
+    # rebuilt for the next start
+    assert _lookup(*sources).get_item_by_name('Gold ore').id == 5
+
+
+def test_corrupt_index_is_ignored(sources):
+    items_path, icons_path, index_path = sources
+    Path(index_path).write_bytes(b'garbage')
+    lookup = _lookup(*sources)
+    assert lookup.get_item_by_id(2).name == 'Coal'
+
+
+def test_search_order(sources):
+    _lookup(*sources)
+    lookup = _lookup(*sources)
+    assert [i.name for i in lookup.search_items('iron').values()] == ['Iron ore', 'Iron bar']
+    assert [i.name for i in lookup.search_items('iron bar').values()] == ['Iron bar']
+    assert list(lookup.search_items('o', limit=2)) == [1, 2]
+
+
+def test_advanced_search_filters(sources):
+    lookup = _lookup(*sources)
+    assert [i.name for i in lookup.search_items_advanced('o', {'stackable': True})] == ['Coal']
+    assert [i.name for i in lookup.search_items_advanced('iron', {'members': False, 'highalch': 6})] == ['Iron bar']
+    assert [i.name for i in lookup.search_items_advanced('irn bar', {}, fuzzy=True)] == ['Iron bar']
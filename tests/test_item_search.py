@@ -0,0 +1,70 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.item_search import ItemSearchIndex
+
+WORDS = ['Iron', 'bar', 'ore', 'Rune', 'potion', '(4)', '(3)', 'bones', 'Dragon', 'shield', 'raw', 'shark', 'é']
+
+
+def _names(n=3000, seed=0):
+    rng = random.Random(seed)
+    names = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) for _ in range(n)]
+    names += ['Iron', 'iron', 'IRON ore']  # duplicates differing in case
+    return names
+
+
+def _brute(names, query, limit, keep=None):
+    """The original three linear passes."""
+    query = query.lower().strip()
+    lower = [n.lower() for n in names]
+    rows = []
+    for match in (lambda n: n == query, lambda n: n.startswith(query), lambda n: query in n):
+        for row, name in enumerate(lower):
+            if len(rows) >= limit:
+                return rows
+            if row not in rows and match(name) and (keep is None or keep[row]):
+                rows.append(row)
+    return rows
+
+
+def test_matches_linear_search():
+    names = _names()
+    index = ItemSearchIndex(names)
+    for query in ['iron', 'IRON', ' iron ', 'iron ore', 'e', 'ne po', 'on (4', 'shark raw', 'é', 'zzz', 'r']:
+        for limit in (1, 5, 50, 10_000):
+            assert index.search(query, limit).tolist() == _brute(names, query, limit), (query, limit)
+    assert len(index.search('   ')) == 0
+
+
+def test_filters_match_linear_search():
+    names = _names()
+    rng = np.random.default_rng(1)
+    members = rng.random(len(names)) < 0.5
+    stackable = rng.random(len(names)) < 0.3
+    index = ItemSearchIndex(names, {'members': members, 'stackable': stackable})
+    keep = members & ~stackable
+    for query in ['iron', 'bar', 'o']:
+        got = index.search(query, 20, filters={'members': True, 'stackable': False, 'unknown': True})
+        assert got.tolist() == _brute(names, query, 20, keep)
+
+
+def test_fuzzy_tier_follows_exact_matches():
+    index = ItemSearchIndex(['Dragon scimitar', 'Rune scimitar', 'Dragon dagger', 'Bones'])
+    assert index.search('dragon scimtar', 10).tolist() == []
+    rows = index.search('dragon scimtar', 10, fuzzy=True).tolist()
+    assert rows[0] == 0 and 3 not in rows
+    # fuzzy rows never repeat the substring tiers
+    assert index.search('dragon', 10, fuzzy=True).tolist()[:2] == [0, 2]
+    assert len(set(index.search('scimitar', 10, fuzzy=True).tolist())) == len(index.search('scimitar', 10, fuzzy=True))
+
+
+def test_empty_index():
+    index = ItemSearchIndex([])
+    assert len(index.search('iron')) == 0
+    assert len(index.search('iron', fuzzy=True)) == 0
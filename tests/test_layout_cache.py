@@ -0,0 +1,186 @@
+"""
+Tests for the persisted UI layout cache used by RuneLiteClient.on_resize.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.frame import Frame
+from core.layout_cache import LayoutCache, layout_fingerprint, verify_anchor, verify_layout
+from core.region_match import MatchResult
+from core import tools
+
+
+@pytest.fixture
+def scene():
+    rng = np.random.default_rng(4)
+    return Image.fromarray(rng.integers(0, 255, (240, 320, 3), dtype=np.uint8))
+
+
+@pytest.fixture
+def anchors(scene):
+    templates = {
+        'map': scene.crop((250, 10, 290, 50)),
+        'inventory': scene.crop((200, 200, 224, 224)),
+    }
+    found = {name: tools.find_subimage(scene, img) for name, img in templates.items()}
+    return templates, {'minimap': {'map': found['map']}, 'toolplane': {'inventory': found['inventory']}}
+
+
+class TestVerify:
+    def test_anchor_in_place(self, scene, anchors):
+        templates, layout = anchors
+        assert verify_anchor(scene, templates['map'], layout['minimap']['map'])
+        assert verify_anchor(Frame.from_image(scene), templates['map'], layout['minimap']['map'])
+        assert verify_layout(scene, layout, templates.__getitem__)
+
+    def test_moved_anchor_is_rejected(self, scene, anchors):
+        templates, layout = anchors
+        shifted = Image.new('RGB', scene.size)
+        shifted.paste(scene, (3, 0))
+        assert not verify_anchor(shifted, templates['inventory'], layout['toolplane']['inventory'])
+        assert not verify_layout(shifted, layout, templates.__getitem__)
+
+    def test_anchor_outside_smaller_window(self, scene, anchors):
+        templates, layout = anchors
+        small = scene.crop((0, 0, 210, 150))
+        assert not verify_anchor(small, templates['inventory'], layout['toolplane']['inventory'])
+
+
+class TestLayoutCache:
+    def test_round_trip_through_file(self, tmp_path, anchors):
+        _, layout = anchors
+        path = tmp_path / 'layout.json'
+        LayoutCache(str(path)).put((320, 240), 'modern', 'fp', layout)
+
+        cache = LayoutCache(str(path))
+        restored = cache.get((320, 240), 'modern', 'fp')
+        assert restored['minimap']['map'].bounding_box == layout['minimap']['map'].bounding_box
+        assert restored['toolplane']['inventory'].confidence == pytest.approx(
+            layout['toolplane']['inventory'].confidence)
+        assert cache.get((320, 241), 'modern', 'fp') is None
+        assert cache.get((320, 240), 'classic', 'fp') is None
+        assert cache.get((320, 240), 'modern', 'other') is None
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    def test_forget_and_eviction(self, tmp_path):
+        path = tmp_path / 'layout.json'
+        cache = LayoutCache(str(path), max_entries=2)
+        layout = {'minimap': {'map': MatchResult(1, 2, 3, 4, confidence=0.9)}}
+        for width in (100, 200, 300):
+            cache.put((width, 100), 'modern', 'fp', layout)
+        assert cache.get((100, 100), 'modern', 'fp') is None
+        cache.forget((200, 100), 'modern', 'fp')
+        assert list(json.loads(path.read_text())) == [LayoutCache.key((300, 100), 'modern', 'fp')]
+
+    def test_unreadable_file_is_ignored(self, tmp_path):
+        path = tmp_path / 'layout.json'
+        path.write_text('{not json')
+        cache = LayoutCache(str(path))
+        assert cache.get((1, 1), 'modern', 'fp') is None
+        assert len(cache) == 0
+
+
+def test_fingerprint_follows_template_content(scene):
+    a = scene.crop((0, 0, 10, 10))
+    b = scene.crop((10, 0, 20, 10))
+    assert layout_fingerprint([a, b]) == layout_fingerprint([a.copy(), b.copy()])
+    assert layout_fingerprint([a, b]) != layout_fingerprint([b, a])
+    assert layout_fingerprint([a]) != layout_fingerprint([a, b])
+
+
+# ---- RuneLiteClient.restore_layout / calibrate on a synthetic window ------
+
+TABS = ('combat', 'stats', 'inventory', 'equipment', 'prayer', 'spellbook',
+        'account', 'logout', 'settings', 'emotes', 'music')
+
+
+def _window(chat_top_left=(5, 480), tab_tint=None) -> Frame:
+    from core.assets import assets
+
+    def paste(img, name, xy):
+        tpl = assets().image(name).convert('RGBA')
+        img.paste(tpl.convert('RGB'), xy, tpl)
+
+    rng = np.random.default_rng(3)
+    img = Image.fromarray(rng.integers(0, 255, (700, 1000, 3), dtype=np.uint8))
+    for i, name in enumerate(TABS):
+        paste(img, name, (560 + (i % 6) * 40, 300 + (i // 6) * 40))
+    paste(img, 'map', (900, 30))
+    paste(img, 'toolplane-modern', (780, 400))
+    paste(img, 'chat-top-left', chat_top_left)
+    paste(img, 'chat-bottom-right', (440, 650))
+    if tab_tint:
+        # a selected tab: the icon gets a red backdrop
+        arr = np.array(img)
+        x, y = tab_tint
+        arr[y:y + 27, x:x + 25, 0] = 200
+        img = Image.fromarray(arr)
+    return Frame.from_image(img)
+
+
+def _client(cache):
+    from core import osrs_client
+    from core.assets import assets
+    from core.logger import get_logger
+
+    client = object.__new__(osrs_client.RuneLiteClient)
+    client.log = get_logger('RLClient')
+    client.minimap = osrs_client.MinimapContext()
+    client.toolplane = osrs_client.ToolplaneContext()
+    client.sectors = osrs_client.UISectors()
+    client.layout_cache = cache
+    client._layout_fingerprint = layout_fingerprint(
+        assets().image(name) for name in client._layout_anchor_names())
+    client.ui_type = None
+    return client
+
+
+@pytest.fixture(scope='module')
+def calibrated():
+    from core import osrs_client
+
+    cache = LayoutCache(None)
+    client = _client(cache)
+    client.ui_type = osrs_client.UIType.MODERN
+    client.calibrate(_window())
+    return client, cache
+
+
+class TestClientLayout:
+    def test_calibrate_stores_layout(self, calibrated):
+        client, cache = calibrated
+        assert len(cache) == 1
+        assert client.toolplane.inventory.bounding_box[:2] == (640, 300)
+        assert client.sectors.chat.bounding_box == (5, 480, 519, 695)
+
+    def test_restore_skips_full_search(self, calibrated, monkeypatch):
+        from core import osrs_client
+
+        calibrated_client, cache = calibrated
+        monkeypatch.setattr(osrs_client, 'find_subimage', None)  # any full search would fail
+        client = _client(cache)
+        # inventory tab selected since calibration: not an anchor we verify
+        assert client.restore_layout(_window(tab_tint=(640, 300)))
+        assert client.ui_type == osrs_client.UIType.MODERN
+        assert client.toolplane.inventory.bounding_box == calibrated_client.toolplane.inventory.bounding_box
+        assert client.minimap.map.bounding_box == calibrated_client.minimap.map.bounding_box
+        assert client.sectors.chat.bounding_box == calibrated_client.sectors.chat.bounding_box
+        assert len(cache) == 1
+
+    def test_moved_chat_is_recalibrated(self, calibrated):
+        _, cache = calibrated
+        moved = LayoutCache(None)
+        moved.put((1000, 700), 'modern', _client(cache)._layout_fingerprint,
+                  cache.get((1000, 700), 'modern', _client(cache)._layout_fingerprint))
+        client = _client(moved)
+        assert not client.restore_layout(_window(chat_top_left=(5, 470)))
+        assert len(moved) == 0
@@ -0,0 +1,61 @@
+"""
+Tests for the position-overlay digit reader.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.ocr.custom import digit_reader, read_location_numbers, read_location_strips
+from core.region_match import MatchResult
+
+
+def _compose(text: str, height: int = 15) -> np.ndarray:
+    """Gray strip with the digit templates laid out like the overlay draws them."""
+    reader = digit_reader()
+    shapes = {c: t for c, t in zip(reader.chars, _templates(reader))}
+    canvas = np.zeros((height, 8 * len(text) + 6), dtype=np.uint8)
+    x = 2
+    for c in text:
+        tpl = shapes[c]
+        h, w = tpl.shape
+        y = 2 if c != ',' else 9
+        canvas[y:y + h, x:x + w] = tpl
+        x += w + 1
+    return canvas
+
+
+def _templates(reader):
+    out = [None] * len(reader.chars)
+    for (h, w), chars, tpls, _ in reader.groups:
+        for j, i in enumerate(chars):
+            out[i] = tpls[:, j].reshape(h, w).astype(np.uint8)
+    return out
+
+
+@pytest.mark.parametrize('text', ['3222,3218,0', '12850', '7', '10,9,45', ''])
+def test_reads_composed_digits(text):
+    assert digit_reader().read(_compose(text)) == text
+
+
+def test_accepts_pil_and_colour():
+    gray = _compose('4096,51')
+    assert read_location_numbers(Image.fromarray(gray).convert('RGB')) == '4096,51'
+    assert read_location_numbers(np.dstack([gray] * 3)) == '4096,51'
+
+
+def test_strips_batch():
+    strips = [_compose('3222,3218,0'), _compose('12850'), _compose('12850')]
+    width = max(s.shape[1] for s in strips)
+    sheet = np.zeros((16 * len(strips), width), dtype=np.uint8)
+    boxes = {}
+    for i, (name, s) in enumerate(zip(['tile', 'chunk', 'region'], strips)):
+        sheet[16 * i:16 * i + s.shape[0], :s.shape[1]] = s
+        boxes[name] = MatchResult(0, 16 * i, width, 16 * i + s.shape[0])
+    assert read_location_strips(sheet, boxes) == {'tile': '3222,3218,0', 'chunk': '12850', 'region': '12850'}
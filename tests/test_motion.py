@@ -0,0 +1,85 @@
+"""
+Tests for the frame-differencing movement detector.
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.motion import MotionDetector
+
+
+@pytest.fixture
+def terrain():
+    """Smooth minimap-like texture, larger than the sampled region."""
+    rng = np.random.default_rng(3)
+    noise = rng.integers(0, 255, (60, 60, 3), dtype=np.uint8)
+    return cv2.resize(noise, (400, 400), interpolation=cv2.INTER_CUBIC)
+
+
+def _view(terrain, x, y, size=150):
+    return terrain[y:y + size, x:x + size].copy()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestMoved:
+    def test_still_region(self, terrain):
+        det = MotionDetector()
+        assert not det.moved(_view(terrain, 100, 100), _view(terrain, 100, 100))
+
+    def test_moving_dots_are_ignored(self, terrain):
+        det = MotionDetector()
+        a = _view(terrain, 100, 100)
+        b = a.copy()
+        b[40:42, 50:52] = (0, 255, 255)  # an NPC dot wandering
+        assert not det.moved(a, b)
+
+    @pytest.mark.parametrize('dx,dy', [(1, 0), (0, 2), (-3, 4)])
+    def test_scroll_is_motion(self, terrain, dx, dy):
+        det = MotionDetector()
+        assert det.moved(_view(terrain, 100, 100), _view(terrain, 100 + dx, 100 + dy))
+
+    def test_shift_direction(self, terrain):
+        dx, dy = MotionDetector().shift(_view(terrain, 100, 100), _view(terrain, 97, 100))
+        assert abs(dx - 3) < 0.5 and abs(dy) < 0.5
+
+
+class TestPoll:
+    def test_stopped_after_settle_window(self, terrain):
+        clock = FakeClock()
+        det = MotionDetector(settle_ms=600, interval_ms=50, clock=clock, sleep=clock.sleep)
+        samples = []
+        assert not det.poll(lambda: samples.append(1) or _view(terrain, 100, 100))
+        assert 0.6 <= clock.now < 0.7
+        assert len(samples) == 13
+
+    def test_moving_returns_early(self, terrain):
+        clock = FakeClock()
+        det = MotionDetector(settle_ms=600, interval_ms=50, clock=clock, sleep=clock.sleep)
+        # walking: the terrain scrolls a pixel every 100 ms
+        assert det.poll(lambda: _view(terrain, 100 + int(clock.now * 10), 100))
+        assert clock.now <= 0.15
+
+    def test_wait_until_stopped(self, terrain):
+        clock = FakeClock()
+        det = MotionDetector(settle_ms=600, interval_ms=50, clock=clock, sleep=clock.sleep)
+        # walks for two seconds, then stands still
+        sample = lambda: _view(terrain, 100 + int(min(clock.now, 2.0) * 10), 100)
+        assert det.wait_until_stopped(sample, timeout=10)
+        assert 2.0 <= clock.now < 3.0
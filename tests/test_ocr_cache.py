@@ -0,0 +1,78 @@
+"""
+Tests for the content-addressed OCR result cache.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core import ocr
+from core.ocr import OcrBackend, OcrCache, glyph
+
+
+@pytest.fixture
+def text_img():
+    path = str(glyph.FONT_DIR / f'{ocr.FontChoice.RUNESCAPE_PLAIN_12.value}.ttf')
+    img = Image.new('RGB', (120, 20), (40, 30, 20))
+    draw = ImageDraw.Draw(img)
+    draw.fontmode = '1'
+    draw.text((3, 3), 'Mine Rocks', font=ImageFont.truetype(path, glyph.pixel_size(path)), fill=(255, 255, 0))
+    return img
+
+
+class TestOcrCache:
+    def test_hits_skip_the_reader(self):
+        cache = OcrCache()
+        calls = []
+        img = np.zeros((8, 8), dtype=np.uint8)
+        read = lambda: calls.append(1) or 'x'
+        assert cache.get_or_read(img, 'a', read) == 'x'
+        assert cache.get_or_read(img.copy(), 'a', read) == 'x'
+        assert len(calls) == 1
+        assert cache.stats()['hit_rate'] == 0.5
+
+    def test_keyed_by_content_and_settings(self):
+        cache = OcrCache()
+        img = np.zeros((8, 8), dtype=np.uint8)
+        other = img.copy()
+        other[3, 3] = 255
+        cache.get_or_read(img, 'a', lambda: '1')
+        assert cache.get_or_read(other, 'a', lambda: '2') == '2'
+        assert cache.get_or_read(img, 'b', lambda: '3') == '3'
+        assert cache.get_or_read(Image.fromarray(img), 'a', lambda: '4') == '4'
+        assert cache.hits == 0
+
+    def test_bounded_lru(self):
+        cache = OcrCache(max_entries=2)
+        imgs = [np.full((2, 2), i, dtype=np.uint8) for i in range(3)]
+        for i, img in enumerate(imgs):
+            cache.get_or_read(img, None, lambda i=i: str(i))
+        assert len(cache) == 2
+        assert cache.get_or_read(imgs[0], None, lambda: 'reread') == 'reread'
+
+    def test_errors_are_not_cached(self):
+        cache = OcrCache()
+        img = np.zeros((2, 2), dtype=np.uint8)
+
+        def fail():
+            raise ValueError('timeout')
+
+        with pytest.raises(ValueError):
+            cache.get_or_read(img, None, fail)
+        assert len(cache) == 0
+
+
+def test_execute_uses_shared_cache(text_img):
+    ocr.ocr_cache().clear()
+    first = ocr.execute(text_img, ocr.FontChoice.RUNESCAPE_PLAIN_12, backend=OcrBackend.GLYPH)
+    again = ocr.execute(text_img.copy(), ocr.FontChoice.RUNESCAPE_PLAIN_12, backend=OcrBackend.GLYPH)
+    assert first == again == 'Mine Rocks'
+    assert ocr.ocr_cache().hits == 1
+    ocr.execute(text_img, ocr.FontChoice.RUNESCAPE_PLAIN_12, backend=OcrBackend.GLYPH, cache=False)
+    assert ocr.ocr_cache().hits == 1
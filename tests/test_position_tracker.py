@@ -0,0 +1,164 @@
+"""
+Tests for the background position tracker.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.position_tracker import PositionTracker
+
+
+class Overlay:
+    """Stand-in overlay whose pixels encode a tile number."""
+
+    def __init__(self):
+        self.tile = 100
+        self.visible = True
+        self.decoded = 0
+
+    def sample(self):
+        return np.full((4, 4), self.tile % 256, dtype=np.uint8) if self.visible else None
+
+    def decode(self, pixels):
+        self.decoded += 1
+        return int(pixels[0, 0])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_unchanged_pixels_skip_decode():
+    overlay, clock = Overlay(), Clock()
+    tracker = PositionTracker(overlay.sample, overlay.decode, clock=clock)
+    assert tracker.step() == 100
+    clock.now += 0.3
+    assert tracker.step() == 100
+    assert overlay.decoded == 1
+    assert tracker.skipped == 1
+    assert tracker.latest.first_seen == 10.0 and tracker.latest.last_seen == 10.3
+
+
+def test_history_and_change_events():
+    overlay, clock = Overlay(), Clock()
+    tracker = PositionTracker(overlay.sample, overlay.decode, history=2, clock=clock)
+    events = []
+    unsubscribe = tracker.subscribe(lambda old, new: events.append((old, new)))
+    for tile in (100, 101, 101, 102):
+        overlay.tile = tile
+        tracker.step()
+        clock.now += 0.3
+    assert events == [(None, 100), (100, 101), (101, 102)]
+    assert [s.position for s in tracker.history] == [101, 102]
+    unsubscribe()
+    overlay.tile = 103
+    tracker.step()
+    assert len(events) == 3
+
+
+def test_position_max_age_and_hidden_overlay():
+    overlay, clock = Overlay(), Clock()
+    tracker = PositionTracker(overlay.sample, overlay.decode, clock=clock)
+    assert tracker.position() is None
+    tracker.step()
+    overlay.visible = False
+    clock.now += 1.0
+    assert tracker.step() is None
+    assert tracker.position() == 100
+    assert tracker.position(max_age=0.7) is None
+
+
+def test_decode_errors_keep_last_position():
+    overlay, clock = Overlay(), Clock()
+    tracker = PositionTracker(overlay.sample, overlay.decode, clock=clock)
+    tracker.step()
+    overlay.tile = 7
+    overlay.decode = lambda pixels: int('')
+    tracker._decode = overlay.decode
+    assert tracker.step() is None
+    assert tracker.errors == 1
+    assert tracker.position() == 100
+
+
+def test_sampling_grid_locks_to_position_changes():
+    overlay, clock = Overlay(), Clock()
+    tracker = PositionTracker(overlay.sample, overlay.decode, samples_per_tick=2, clock=clock)
+    assert tracker.next_sample_time(10.0) == 10.3
+    tracker.step()  # first position: anchors the grid at 10.0
+    assert abs(tracker.next_sample_time(10.41) - 10.6) < 1e-9
+    assert abs(tracker.next_sample_time(10.6) - 10.9) < 1e-9
+
+
+def test_wait_for_change():
+    overlay, clock = Overlay(), Clock()
+    tracker = PositionTracker(overlay.sample, overlay.decode, clock=clock)
+    tracker.step()
+    got = []
+    since = tracker.changes
+    waiter = threading.Thread(target=lambda: got.append(tracker.wait_for_change(timeout=2, since=since)))
+    waiter.start()
+    tracker.step()  # same position: no event
+    overlay.tile = 101
+    tracker.step()
+    waiter.join()
+    assert got == [101]
+    assert tracker.changes == since + 1
+    assert tracker.wait_for_change(timeout=0.01) is None
+    # a change made before waiting is not missed
+    assert tracker.wait_for_change(timeout=0, since=since) == 101
+
+
+def test_background_thread():
+    overlay = Overlay()
+    seen = threading.Event()
+    tracker = PositionTracker(overlay.sample, overlay.decode, samples_per_tick=30)
+    tracker.subscribe(lambda old, new: new == 101 and seen.set())
+    tracker.start()
+    try:
+        overlay.tile = 101
+        assert seen.wait(timeout=2)
+    finally:
+        tracker.stop()
+    assert not tracker.running
+
+
+def test_orchestrator_starts_tracker_on_first_read():
+    from core.movement import MovementOrchestrator
+
+    overlay = Overlay()
+
+    class Client:
+        position_tracker = None
+
+        def start_position_tracker(self):
+            if self.position_tracker is None:
+                self.position_tracker = PositionTracker(overlay.sample, overlay.decode, samples_per_tick=30)
+            return self.position_tracker.start()
+
+        def stop_position_tracker(self):
+            if self.position_tracker is not None:
+                self.position_tracker.stop()
+
+        def get_position(self):
+            return overlay.decode(overlay.sample())
+
+    client = Client()
+    mover = object.__new__(MovementOrchestrator)
+    mover.client = client
+    assert client.position_tracker is None
+    try:
+        assert mover.get_position() == 100
+        assert client.position_tracker.running
+    finally:
+        mover.close()
+    assert not client.position_tracker.running
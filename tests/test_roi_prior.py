@@ -0,0 +1,98 @@
+"""
+Tests for the template location priors used by find_in_window.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.roi_prior import LocationPriors
+from core.region_match import MatchResult
+from core import tools
+
+
+@pytest.fixture
+def scene():
+    rng = np.random.default_rng(9)
+    return Image.fromarray(rng.integers(0, 255, (200, 300, 3), dtype=np.uint8))
+
+
+class TestLocationPriors:
+    def test_keyed_by_template_content_and_parent_size(self, scene):
+        priors = LocationPriors()
+        template = scene.crop((100, 50, 130, 80))
+        priors.record(template, scene.size, MatchResult(100, 50, 130, 80, confidence=1.0))
+        assert priors.get(scene.crop((100, 50, 130, 80)), scene.size).bounding_box == (100, 50, 130, 80)
+        assert priors.get(template, (640, 480)) is None
+        priors.clear()
+        assert priors.get(template, scene.size) is None
+
+    def test_roi_is_padded_and_clamped(self):
+        priors = LocationPriors(pad=8)
+        roi = priors.roi(MatchResult(2, 5, 32, 35), (300, 40), max_scale=1.1)
+        assert roi.bounding_box == (0, 0, 32 + 11, 40)
+
+    def test_accepts_only_comparable_matches(self):
+        priors = LocationPriors(tolerance=0.02)
+        prior = MatchResult(0, 0, 10, 10, confidence=0.99)
+        assert priors.accepts(prior, MatchResult(0, 0, 10, 10, confidence=0.975), 0.7)
+        assert not priors.accepts(prior, MatchResult(0, 0, 10, 10, confidence=0.95), 0.7)
+        assert not priors.accepts(MatchResult(0, 0, 10, 10, confidence=0.75),
+                                  MatchResult(0, 0, 10, 10, confidence=0.74), 0.745)
+
+    def test_roi_search_finds_same_location(self, scene):
+        priors = LocationPriors()
+        template = scene.crop((100, 50, 130, 80))
+        full = tools.find_subimage(scene, template)
+        priors.record(template, scene.size, full)
+
+        roi = priors.roi(priors.get(template, scene.size), scene.size)
+        near = tools.find_subimage(roi.crop_in(scene), template).transform(roi.start_x, roi.start_y)
+        assert near.bounding_box == full.bounding_box
+        assert priors.accepts(full, near, 0.7)
+
+
+class TestFindInWindow:
+    """The prior is opt-in: moving templates must always get the best match."""
+
+    @staticmethod
+    def _client():
+        from core import osrs_client
+
+        client = object.__new__(osrs_client.RuneLiteClient)
+        client.priors = LocationPriors()
+        return client
+
+    @staticmethod
+    def _scenes(scene):
+        rng = np.random.default_rng(2)
+        icon = Image.fromarray(rng.integers(0, 255, (30, 30, 3), dtype=np.uint8))
+        look_alike = np.array(icon)
+        look_alike[12:15, 12:15] = 0  # e.g. another dose of the same potion
+        first = scene.copy()
+        first.paste(icon, (100, 50))
+        second = scene.copy()
+        second.paste(Image.fromarray(look_alike), (100, 50))
+        second.paste(icon, (200, 120))
+        return icon, first, second
+
+    def test_default_skips_prior(self, scene):
+        icon, first, second = self._scenes(scene)
+        client = self._client()
+        assert client.find_in_window(icon, first, min_scale=1, max_scale=1).bounding_box[:2] == (100, 50)
+        assert client.priors.get(icon, first.size) is None
+        assert client.find_in_window(icon, second, min_scale=1, max_scale=1).bounding_box[:2] == (200, 120)
+
+    def test_prior_keeps_fixed_anchor_spot(self, scene):
+        icon, first, second = self._scenes(scene)
+        client = self._client()
+        client.find_in_window(icon, first, min_scale=1, max_scale=1, use_prior=True)
+        match = client.find_in_window(icon, second, min_scale=1, max_scale=1, use_prior=True)
+        assert match.bounding_box[:2] == (100, 50)
+        assert client.priors.hits == 1
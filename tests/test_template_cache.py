@@ -0,0 +1,89 @@
+"""
+Tests for the preprocessed template cache used by find_subimage.
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.template_cache import TemplateCache
+from core import tools
+
+
+@pytest.fixture
+def scene():
+    rng = np.random.default_rng(5)
+    return Image.fromarray(rng.integers(0, 255, (90, 120, 3), dtype=np.uint8))
+
+
+def _reference_find(parent: Image.Image, template: Image.Image, min_scale, max_scale, step):
+    """The original, uncached find_subimage loop."""
+    parent_bgr = cv2.cvtColor(np.array(parent.convert("RGB")), cv2.COLOR_RGB2BGR)
+    rgba = np.array(template.convert("RGBA"))
+    tpl_bgr, tpl_mask = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR), rgba[:, :, 3]
+    best = (-1.0, None)
+    scale = min_scale
+    while scale <= max_scale + 1e-6:
+        w, h = int(tpl_bgr.shape[1] * scale), int(tpl_bgr.shape[0] * scale)
+        if 1 < w < parent_bgr.shape[1] and 1 < h < parent_bgr.shape[0]:
+            t = cv2.resize(tpl_bgr, (w, h), interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC)
+            m = cv2.resize(tpl_mask, (w, h), interpolation=cv2.INTER_NEAREST)
+            res = np.nan_to_num(cv2.matchTemplate(parent_bgr, t, cv2.TM_CCORR_NORMED, mask=m), nan=-1.0)
+            _, val, _, loc = cv2.minMaxLoc(res)
+            if val > best[0]:
+                best = (val, (loc[0], loc[1], loc[0] + w, loc[1] + h))
+        scale += step
+    return best
+
+
+class TestTemplateCache:
+    def test_same_pixels_share_an_entry(self, scene):
+        cache = TemplateCache()
+        a = scene.crop((0, 0, 20, 20))
+        b = scene.crop((0, 0, 20, 20))
+        assert cache.get(a) is cache.get(b)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_eviction(self, scene):
+        cache = TemplateCache(max_entries=2)
+        first = scene.crop((0, 0, 10, 10))
+        cache.get(first)
+        cache.get(scene.crop((10, 0, 20, 10)))
+        cache.get(scene.crop((20, 0, 30, 10)))
+        assert len(cache) == 2
+        cache.get(first)
+        assert cache.misses == 4
+
+    def test_scaled_variants_are_memoised(self, scene):
+        prepared = TemplateCache().get(scene.crop((0, 0, 20, 20)))
+        assert prepared.scaled(0.9)[0] is prepared.scaled(0.9000000001)[0]
+        assert prepared.scaled(0.9)[0].shape[:2] == (18, 18)
+
+    def test_opaque_detection(self, scene):
+        cache = TemplateCache()
+        assert cache.get(scene.crop((0, 0, 20, 20))).opaque
+        rgba = scene.crop((0, 0, 20, 20)).convert("RGBA")
+        rgba.putpixel((0, 0), (0, 0, 0, 0))
+        assert not cache.get(rgba).opaque
+
+
+class TestCachedMatching:
+    @pytest.mark.parametrize("transparent", [False, True])
+    def test_matches_uncached_search(self, scene, transparent):
+        template = scene.crop((60, 30, 84, 54)).convert("RGBA")
+        if transparent:
+            arr = np.array(template)
+            arr[:6, :6, 3] = 0
+            template = Image.fromarray(arr)
+        expected_conf, expected_box = _reference_find(scene, template, 0.9, 1.1, 0.1)
+        for _ in range(2):  # cold, then warm cache
+            m = tools.find_subimage(scene, template, min_scale=0.9, max_scale=1.1)
+            assert m.bounding_box == expected_box
+            assert m.confidence == pytest.approx(expected_conf, abs=1e-5)
@@ -0,0 +1,190 @@
+"""
+Tests for the resident Tesseract engine pool.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from PIL import Image
+
+from core.ocr import engine
+from core.ocr.engine import EnginePool, parse_tsv
+
+
+class TestEnginePool:
+    def test_engines_are_reused_per_key(self):
+        made = []
+        pool = EnginePool(lambda key: made.append(key) or object(), max_per_key=2)
+        with pool.acquire(('eng', 7, 3)) as first:
+            pass
+        with pool.acquire(('eng', 7, 3)) as again:
+            assert again is first
+        with pool.acquire(('osrs', 7, 3)):
+            pass
+        assert made == [('eng', 7, 3), ('osrs', 7, 3)]
+
+    def test_bounded_per_key(self):
+        pool = EnginePool(lambda key: object(), max_per_key=2)
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def work():
+            with pool.acquire('k'):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert peak[0] == 2
+        assert pool.created('k') == 2
+
+    def test_failed_start_is_not_counted(self):
+        def factory(key):
+            raise RuntimeError('missing traineddata')
+
+        pool = EnginePool(factory, max_per_key=1)
+        with pytest.raises(RuntimeError):
+            with pool.acquire('k'):
+                pass
+        assert pool.created('k') == 0
+
+    def test_close_ends_idle_engines(self):
+        closed = []
+        pool = EnginePool(lambda key: key, close=closed.append)
+        with pool.acquire('a'):
+            pass
+        pool.close()
+        assert closed == ['a']
+        assert pool.created('a') == 0
+
+    def test_close_while_acquired(self):
+        closed = []
+        pool = EnginePool(lambda key: object(), max_per_key=1, close=closed.append)
+        with pool.acquire('k') as engine:
+            pool.close()
+            assert closed == []
+        # released after shutdown: ended, not put back
+        assert closed == [engine]
+        assert pool.created('k') == 0
+        with pytest.raises(RuntimeError):
+            with pool.acquire('k'):
+                pass
+
+    def test_close_wakes_waiters(self):
+        pool = EnginePool(lambda key: object(), max_per_key=1)
+        errors = []
+        waiting = threading.Event()
+
+        def wait_for_engine():
+            waiting.set()
+            try:
+                with pool.acquire('k'):
+                    pass
+            except RuntimeError as e:
+                errors.append(e)
+
+        with pool.acquire('k'):
+            t = threading.Thread(target=wait_for_engine)
+            t.start()
+            waiting.wait(1)
+            time.sleep(0.05)
+            pool.close()
+        t.join(1)
+        assert not t.is_alive()
+        assert len(errors) == 1
+
+
+class FakeApi:
+    """Stands in for tesserocr.PyTessBaseAPI."""
+
+    def __init__(self, key):
+        self.key = key
+        self.variables = {}
+        self.image = None
+        self.cleared = 0
+        self.timeouts = []
+        self.hung = False
+
+    def SetVariable(self, name, value):
+        self.variables[name] = value
+
+    def SetImage(self, img):
+        self.image = img
+
+    def Recognize(self, timeout=0):
+        self.timeouts.append(timeout)
+        return not self.hung
+
+    def GetUTF8Text(self):
+        return f'{self.key[0]}:{self.image.size[0]}x{self.image.size[1]}'
+
+    def GetTSVText(self, page):
+        return "5\t1\t1\t1\t1\t1\t2\t1\t9\t7\t88\tword\n"
+
+    def Clear(self):
+        self.cleared += 1
+
+
+class TestPooledReads:
+    @pytest.fixture
+    def apis(self, monkeypatch):
+        made = []
+        pool = EnginePool(lambda key: made.append(FakeApi(key)) or made[-1], max_per_key=2)
+        monkeypatch.setattr(engine, 'HAVE_TESSEROCR', True)
+        monkeypatch.setattr(engine, '_pool', pool)
+        return made
+
+    def test_image_to_string_reuses_engine(self, apis):
+        img = Image.new('L', (12, 5))
+        assert engine.image_to_string(img, 'osrs', 7, 1, whitelist='0123') == 'osrs:12x5'
+        assert engine.image_to_string(img, 'osrs', 7, 1) == 'osrs:12x5'
+        assert len(apis) == 1
+        api = apis[0]
+        assert api.key == ('osrs', 7, 1)
+        # the whitelist of one read does not leak into the next
+        assert api.variables['tessedit_char_whitelist'] == ''
+        assert api.cleared == 2
+
+    def test_reads_are_bounded(self, apis):
+        img = Image.new('L', (12, 5))
+        engine.image_to_string(img, 'osrs', 7, 1)
+        assert apis[0].timeouts == [engine.READ_TIMEOUT_S * 1000]
+        apis[0].hung = True
+        with pytest.raises(RuntimeError):
+            engine.image_to_string(img, 'osrs', 7, 1)
+        # the engine went back to the pool for the next read
+        apis[0].hung = False
+        assert engine.image_to_string(img, 'osrs', 7, 1) == 'osrs:12x5'
+        assert len(apis) == 1
+
+    def test_image_to_data_parses_tsv(self, apis):
+        data = engine.image_to_data(Image.new('L', (20, 10)), 'eng', 6)
+        assert data['text'] == ['word']
+        assert data['conf'] == [88.0]
+        assert apis[0].key == ('eng', 6, 3)
+
+
+def test_parse_tsv_matches_pytesseract_layout():
+    tsv = (
+        "1\t1\t0\t0\t0\t0\t0\t0\t120\t20\t-1\t\n"
+        "5\t1\t1\t1\t1\t1\t4\t3\t30\t12\t96.5\tBank\n"
+        "5\t1\t1\t1\t1\t2\t40\t3\t50\t12\t91\tbooth\n"
+    )
+    data = parse_tsv(tsv)
+    assert data['text'] == ['', 'Bank', 'booth']
+    assert data['left'] == [0, 4, 40]
+    assert data['conf'] == [-1.0, 96.5, 91.0]
+    assert data['word_num'] == [0, 1, 2]
@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.input.trajectory import MAX_STEP_PX, Trajectory, plan_trajectory, replay
+
+
+def test_same_seed_same_path():
+    a = plan_trajectory((10, 10), (600, 420), seed=7)
+    b = plan_trajectory((10, 10), (600, 420), seed=7)
+    c = plan_trajectory((10, 10), (600, 420), seed=8)
+    assert np.array_equal(a.points, b.points) and np.array_equal(a.times, b.times)
+    assert not np.array_equal(a.points, c.points) or not np.array_equal(a.times, c.times)
+
+
+def test_path_ends_on_target_with_monotonic_times():
+    for seed in range(50):
+        path = plan_trajectory((50, 900), (700, 120), seed=seed)
+        assert path.end == (700, 120)
+        assert np.all(np.diff(path.times) >= 0)
+        assert path.points.min() >= 1
+        assert path.duration >= 0.1
+
+
+def test_steps_are_bounded_without_wobble():
+    path = plan_trajectory((0, 0), (900, 700), seed=3, wobble_prob=0, curve_prob=0, overshoot_prob=0)
+    steps = np.hypot(*np.diff(path.points, axis=0).T)
+    assert steps.max() <= MAX_STEP_PX + 2
+
+
+def test_tiny_move_is_empty():
+    path = plan_trajectory((5, 5), (5, 5), seed=0)
+    assert len(path) == 0 and path.end is None
+
+
+def test_simulation_path_has_no_pauses():
+    path = plan_trajectory((0, 0), (400, 0), seed=1, pause_prob=1, curve_prob=0, overshoot_prob=0, realtime=False)
+    eased = path.duration
+    assert eased <= 0.5 * 1.03 + 1e-9
+
+
+class FakeClock:
+    def __init__(self, start=0.0):
+        self.now = start
+        self.slept = []
+
+    def __call__(self):
+        self.now += 0.0005  # reading the clock takes a little time
+        return self.now
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.now += s
+
+
+def test_replay_follows_timestamps():
+    path = Trajectory(np.array([[1, 1], [2, 2], [3, 3]]), np.array([0.0, 0.05, 0.1]))
+    clock = FakeClock()
+    moves = []
+    seen = []
+
+    def move(x, y):
+        moves.append((x, y))
+        seen.append(round(clock(), 4))
+
+    assert replay(path, move, clock=clock, sleep=clock.sleep) == 3
+    assert moves == [(1, 1), (2, 2), (3, 3)]
+    assert seen[1] >= 0.05 - 0.002 and seen[2] >= 0.1 - 0.002
+
+
+def test_replay_skips_points_already_overdue():
+    path = Trajectory(np.array([[1, 1], [2, 2], [3, 3], [4, 4]]), np.array([0.0, 0.01, 0.02, 0.5]))
+    clock = FakeClock()
+    moves = []
+
+    def move(x, y):
+        moves.append((x, y))
+        clock.now += 0.05  # a slow OS call
+
+    replay(path, move, clock=clock, sleep=clock.sleep)
+    assert moves == [(1, 1), (3, 3), (4, 4)]
+
+
+def test_replay_stops_and_dedupes():
+    path = Trajectory(np.array([[1, 1], [1, 1], [2, 2]]), np.array([0.0, 0.0, 0.0]))
+    moves = []
+    assert replay(path, lambda x, y: moves.append((x, y)), realtime=False) == 2
+    assert replay(path, lambda x, y: moves.append((x, y)), should_stop=lambda: True) == 0
@@ -397,8 +397,15 @@ class BotManager:
             # Create bot executor instance
             bot_executor = executor_class(bot_config, user=username)
             
+            def run_bot():
+                try:
+                    bot_executor.start()
+                finally:
+                    if hasattr(bot_executor, 'close'):
+                        bot_executor.close()
+
             # Start the bot in a separate thread
-            bot_thread = threading.Thread(target=bot_executor.start, daemon=True)
+            bot_thread = threading.Thread(target=run_bot, daemon=True)
             bot_thread.start()
             
             current_bot = BotInstance(
@@ -779,6 +786,8 @@ def api_items_search():
     
     query = request.args.get('q', '').strip()
     limit = int(request.args.get('limit', 50))
+    # also return near matches (typos) after the substring matches
+    fuzzy = request.args.get('fuzzy') == 'true'
     
     # Parse filters
     filters = {}
@@ -794,7 +803,7 @@ def api_items_search():
     try:
         item_lookup = ItemLookup()
         if filters:
-            items = item_lookup.search_items_advanced(query, filters, limit)
+            items = item_lookup.search_items_advanced(query, filters, limit, fuzzy=fuzzy)
             results = [
                 {
                     'id': item.id,
@@ -813,7 +822,7 @@ def api_items_search():
                 for item in items
             ]
         else:
-            items_dict = item_lookup.search_items(query, limit)
+            items_dict = item_lookup.search_items(query, limit, fuzzy=fuzzy)
             results = [
                 {
                     'id': item.id,